@@ -1,85 +1,305 @@
 import sys
 import os
-from typing import Dict, Any
+import threading
+from typing import Callable, Dict, Any, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.code_loaders import MultiLanguageDocumentLoader
+from modules.repo_scanner import RepositoryScanner
 from modules.code_splitter import MultiLanguageDocumentSplitter
-from modules.rag import DocumentEmbedder
-from modules.repo_manage import clone_repo_url, remove_repository
+from modules.rag import compute_chunk_id
+from modules.repo_manage import clone_repo_url, update_repo, has_commit, get_changed_files, remove_repository
+from modules.ingest_jobs import IngestionCancelled
+from modules.ingest_metrics import IngestionMetrics
+from modules.retrieval_service import RetrievalService, get_retrieval_service
 
-import uuid
+import hashlib
 
-embedder = DocumentEmbedder()
-rag = embedder.get_vectorstore()
+# 증분 인덱싱을 위해 클론한 저장소를 유지하는 디렉토리
+REPO_CACHE_DIR = os.getenv("REPO_CACHE_DIR", "/tmp/repo_data")
+# 청크 분할 방식 ("character": 문자 수 기준, "syntax": 함수/클래스/메서드 단위)
+CHUNKING_MODE = os.getenv("CHUNKING_MODE", "character").lower()
+# 청크 크기 단위 ("characters": 언어별 문자 수, "tokens": 임베딩 모델 토큰 수)
+CHUNK_LENGTH_UNIT = os.getenv("CHUNK_LENGTH_UNIT", "characters").lower()
+CHUNK_TARGET_TOKENS = int(os.getenv("CHUNK_TARGET_TOKENS", "512"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "2048"))
+# 확장자를 여러 언어가 공유할 때(.h: CPP/C) 우선할 언어 순서 (예: "C,CPP")
+LANGUAGE_PRIORITY = [lang.strip() for lang in os.getenv("LANGUAGE_PRIORITY", "").split(",") if lang.strip()]
+# 청크 분할 프로세스 수 (1: 단일 프로세스, 0: CPU 코어 수)
+SPLIT_WORKERS = int(os.getenv("SPLIT_WORKERS", "1")) or None
+# 최신 커밋만, 로더가 지원하는 확장자 파일만 받아오는 얕은/부분 클론 사용 여부 (기본값: 전체 클론)
+# 켜면 클론 시간과 디스크 사용량이 줄지만 구조 분석(structure)에는 지원하는 확장자 파일만 포함됨
+SPARSE_CHECKOUT = os.getenv("SPARSE_CHECKOUT", "false").lower() in ("1", "true", "yes")
 
-def repository_clone(repo_url: str) -> Dict[str, Any]:
-    """GitHub 레포지토리를 RAG에 저장하고 분석 결과를 반환합니다."""
-    # 1. 리포지토리 클론
-    repo_path = f"/tmp/repo_data/{uuid.uuid4()}"
-    repo = clone_repo_url(repo_url, repo_path)
+
+def _open_repository(repo_url: str, repo_path: str, sparse: bool = False):
+    """
+    기존 클론이 있으면 새 커밋만 가져오고, 없으면 새로 클론합니다.
+    sparse가 True면 최신 커밋만, 로더가 지원하는 확장자 파일만 받아옵니다. (기존 클론은 클론할 때의 방식을 유지)
+    """
+    if os.path.isdir(os.path.join(repo_path, '.git')):
+        try:
+            return update_repo(repo_path)
+        except RuntimeError:
+            # 기존 클론이 손상된 경우 다시 클론
+            remove_repository(repo_path)
+    if not sparse:
+        return clone_repo_url(repo_url, repo_path)
+    # 인덱싱에는 히스토리와 바이너리 파일이 필요 없으므로
+    # 최신 커밋만, 로더가 지원하는 확장자 파일만 받아옴
+    supported_extensions = [
+        ext
+        for extensions in MultiLanguageDocumentLoader(repo_path).get_supported_languages().values()
+        for ext in extensions
+    ]
+    return clone_repo_url(
+        repo_url,
+        repo_path,
+        depth=1,
+        single_branch=True,
+        filter_blobs=True,
+        sparse_extensions=supported_extensions
+    )
+
+def _tag_repository(
+    documents,
+    repo_url: str,
+    commit: str,
+    on_document: Optional[Callable[[], None]] = None
+):
+    """
+    (언어, 문서) 스트림의 각 문서에 저장소 URL과 인덱싱 커밋 메타데이터를 추가합니다.
+    청크의 commit은 해당 파일을 마지막으로 인덱싱한 커밋입니다. 다시 처리한 파일은 내용이 같은 청크도
+    이번 커밋으로 갱신되고, 증분 인덱싱에서 변경되지 않은 파일은 이전 커밋(같은 파일 내용)을 유지합니다.
+    저장소 전체의 마지막 인덱싱 커밋은 인덱싱 상태(index_state)의 commit입니다.
+    """
+    for lang, doc in documents:
+        if on_document:
+            on_document()
+        doc.metadata["repository_url"] = repo_url
+        doc.metadata["commit"] = commit
+        yield lang, doc
+
+def _assign_chunk_ids(chunks, produced_ids: set, token_totals: Optional[Dict[str, int]] = None):
+    """청크 스트림의 각 청크에 내용 기반 ID를 부여하고 생성된 ID와 토큰 수를 기록합니다."""
+    for chunk in chunks:
+        chunk.id = compute_chunk_id(chunk)
+        produced_ids.add(chunk.id)
+        if token_totals is not None:
+            token_count = chunk.metadata.get("token_count", 0)
+            token_totals["tokens"] += token_count
+            token_totals["max_tokens"] = max(token_totals["max_tokens"], token_count)
+        yield chunk
+
+def repository_clone(
+    repo_url: str,
+    progress_callback: Optional[Callable[..., None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    service: Optional[RetrievalService] = None
+) -> Dict[str, Any]:
+    """
+    GitHub 레포지토리를 RAG에 저장하고 분석 결과를 반환합니다.
+    이미 인덱싱한 저장소는 마지막으로 인덱싱한 커밋 이후 추가/변경/삭제된 파일만 반영합니다.
+
+    Args:
+        repo_url: 저장소 URL
+        progress_callback: (단계, **진행 항목)으로 진행 상황을 받을 함수
+        cancel_event: 설정되면 다음 파일/청크 처리 시점에 IngestionCancelled를 발생시킴
+        service: 청크를 저장할 검색 서비스 (None인 경우 프로세스 공유 서비스)
+
+    Returns:
+        분석 결과. metrics 항목에 단계별(clone, scan, load, split, embed, cleanup)
+        실행 시간/CPU 시간/파일·바이트·청크·토큰·오류 수와 단계 이벤트가 포함됩니다.
+    """
+    service = service or get_retrieval_service()
+    embedder = service.embedder
+    index_state = service.index_state
+    metrics = IngestionMetrics()
+
+    def _report(stage: str, **progress) -> None:
+        if progress_callback:
+            progress_callback(stage, **progress)
+
+    def _check_cancelled() -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise IngestionCancelled(f"인덱싱이 취소되었습니다: {repo_url}")
+
+    _report("cloning")
+    # 1. 리포지토리 클론 (증분 인덱싱을 위해 저장소 URL별 고정 경로에 유지)
+    repo_path = os.path.join(REPO_CACHE_DIR, hashlib.sha1(repo_url.encode('utf-8')).hexdigest())
+    state = index_state.get(repo_url)
+    try:
+        with metrics.stage("clone", incremental=state is not None):
+            repo = _open_repository(repo_url, repo_path, sparse=SPARSE_CHECKOUT)
+    except Exception:
+        remove_repository(repo_path)
+        raise
     if repo is None:
         raise RuntimeError(f"Failed to clone repository: returned None :: ❌ 클론 실패: {repo_url}")
     
-    try:
-        # 2. 리포지토리 분석
+    # 저장소별 컬렉션을 사용하는 경우 해당 저장소 컬렉션에 저장
+    target = embedder.for_repository(repo_url)
+    head_sha = repo.head.commit.hexsha
+    # 다른 컬렉션에 인덱싱된 상태(저장 방식 변경 등)는 이어서 사용할 수 없으므로 전체 인덱싱
+    previous_sha = state.get("commit") if state and state.get("collection", embedder.collection_name) == target.collection_name else None
+    _check_cancelled()
+    _report("scanning")
+    
+    # 2. 리포지토리 분석 (디렉토리 탐색 결과는 로더와 공유)
+    with metrics.stage("scan"):
+        loader = MultiLanguageDocumentLoader(
+            repo.working_dir,
+            max_workers=None,
+            language_priority=LANGUAGE_PRIORITY or None,
+            # 구문 단위 분할은 파일 전체의 구문 트리에서 청크를 만들므로 파일 단위 문서로 로드
+            parse_mode="whole_file" if CHUNKING_MODE == "syntax" else "segments"
+        )
         analysis = {
             "repository_url": repo_url,
-            "structure": analyze_repository(repo.working_dir),
+            "structure": analyze_repository(repo.working_dir, loader.scanner),
             "readme": get_readme_content(repo.working_dir),
             "summary": {
                 "total_files": 0,
                 "languages": set(),
-                "main_directories": []
+                "main_directories": [],
+                "indexed_commit": head_sha,
+                "previous_commit": previous_sha
             }
         }
-        
-        # 3. 리포지토리 내 모든 파일 로드
-        loader = MultiLanguageDocumentLoader(repo.working_dir)
-        documents = loader.load_documents()
-        
-        # 4. 파일 분할
-        splitter = MultiLanguageDocumentSplitter()
-        chunks = splitter.split_documents(documents)
-        
-        # 5. 분할된 파일 임베딩
-        embedder.add_documents(chunks)
-        
-        # 6. 통계 정보 업데이트
-        analysis["summary"]["total_files"] = len(documents)
-        analysis["summary"]["document_chunks"] = len(chunks)
-        
+    metrics.add("scan", files=loader.scanner.file_count)
+    
+    # 3. 인덱싱 범위 결정
+    if previous_sha == head_sha:
+        # 변경 사항 없음
+        analysis["summary"]["index_mode"] = "up_to_date"
+        analysis["summary"]["document_chunks"] = 0
+        analysis["metrics"] = metrics.summary()
         return analysis
-        
-    finally:
-        # 7. 레포지토리 클론 데이터 삭제
-        remove_repository(repo_path)
+    
+    if previous_sha and has_commit(repo, previous_sha):
+        # 증분 인덱싱: 삭제된 파일의 청크를 지우고 추가/변경된 파일만 다시 처리
+        changed_paths, removed_paths = get_changed_files(repo, previous_sha, head_sha)
+        # 변경/삭제된 파일과 내용이 같아 파싱을 건너뛰었던 별칭 파일은 다시 인덱싱
+        alias_paths = target.get_alias_paths(repo_url, list(changed_paths) + list(removed_paths))
+        changed_paths = sorted(set(changed_paths) | {
+            path for path in alias_paths if os.path.isfile(os.path.join(repo.working_dir, path))
+        })
+        # 다시 처리/삭제할 파일 중 이전에 인덱싱된 파일 수 (저장소 파일 통계에서 뺀 뒤 이번 결과를 더함)
+        previous_files = target.count_indexed_files(repo_url, sorted(set(changed_paths) | set(removed_paths)))
+        if removed_paths:
+            with metrics.stage("cleanup", removed_files=len(removed_paths)):
+                target.delete_documents(repo_url, removed_paths)
+        load_paths = changed_paths
+        analysis["summary"]["index_mode"] = "incremental"
+        analysis["summary"]["changed_files"] = len(changed_paths)
+        analysis["summary"]["removed_files"] = len(removed_paths)
+    else:
+        # 전체 인덱싱 (이전 커밋을 찾을 수 없는 경우 포함)
+        load_paths = None
+        previous_files = None
+        analysis["summary"]["index_mode"] = "full"
+    
+    # 4~6. 파일 로드 → 분할 → 임베딩을 스트리밍으로 연결
+    # (전체 문서/청크 목록을 메모리에 모으지 않고 단계별로 겹쳐서 처리)
+    _report("indexing", files_parsed=0, chunks_processed=0)
+
+    def _on_document() -> None:
+        _check_cancelled()
+        _report("indexing", files_parsed=loader.loaded_file_count)
 
-def analyze_repository(repo_path: str) -> Dict[str, Any]:
-    """레포지토리의 구조를 분석합니다."""
-    structure = {
-        "directories": [],
-        "languages": set(),
-        "file_count": 0
-    }
+    # 로드(읽기/디코딩/파싱)와 분할은 같은 스트림에서 번갈아 실행되므로 각 단계 자체의 시간만 따로 누적
+    documents = _tag_repository(
+        metrics.iterate(loader.iter_documents(paths=load_paths), "load"),
+        repo_url,
+        head_sha,
+        _on_document
+    )
     
-    for root, dirs, files in os.walk(repo_path):
-        if '.git' in dirs:
-            dirs.remove('.git')
-        
-        rel_path = os.path.relpath(root, repo_path)
-        if rel_path != '.':
-            structure["directories"].append(rel_path)
-        
-        for file in files:
-            structure["file_count"] += 1
-            ext = os.path.splitext(file)[1].lower()
-            if ext:
-                structure["languages"].add(ext[1:])  # 점(.) 제거
+    splitter = MultiLanguageDocumentSplitter(
+        mode=CHUNKING_MODE,
+        length_unit=CHUNK_LENGTH_UNIT,
+        target_tokens=CHUNK_TARGET_TOKENS,
+        max_tokens=CHUNK_MAX_TOKENS,
+        max_workers=SPLIT_WORKERS
+    )
+    produced_ids = set()
+    token_totals = {"tokens": 0, "max_tokens": 0}
+    chunks = _assign_chunk_ids(
+        metrics.iterate(
+            splitter.iter_chunks(documents),
+            "split",
+            on_item=lambda chunk: metrics.add("split", chunks=1, tokens=chunk.metadata.get("token_count", 0))
+        ),
+        produced_ids,
+        token_totals
+    )
     
-    structure["languages"] = list(structure["languages"])
-    return structure
+    # 내용 기반 ID를 사용하므로 이미 저장된 동일 청크는 다시 임베딩하지 않음
+    retries_before = target.scheduler.progress["retries"]
+    chunk_count = target.add_documents_stream(
+        chunks,
+        progress_callback=lambda total: _report("indexing", chunks_processed=total),
+        metrics=metrics
+    )
+    metrics.add(
+        "load",
+        files=loader.loaded_file_count,
+        bytes=loader.loaded_byte_count,
+        errors=loader.skipped_files.get("unreadable", 0) + loader.skipped_files.get("parse_error", 0)
+    )
+    # 재시도한 임베딩 요청 수 (429/5xx/연결 오류)
+    metrics.add("embed", errors=target.scheduler.progress["retries"] - retries_before)
+    # 취소된 경우 이미 저장된 청크는 내용 기반 ID로 다음 실행에서 재사용되며, 인덱싱 커밋은 갱신하지 않음
+    _check_cancelled()
+    
+    # 이전 인덱싱에서 남은 청크 중 이번에 생성되지 않은 청크(변경 전 내용) 정리
+    _report("cleanup", files_parsed=loader.loaded_file_count, chunks_processed=chunk_count)
+    if previous_sha:
+        with metrics.stage("cleanup"):
+            target.delete_stale_documents(repo_url, produced_ids, load_paths)
+    
+    # 7. 통계 정보 및 마지막 인덱싱 커밋 갱신
+    analysis["summary"]["total_files"] = loader.loaded_file_count
+    analysis["summary"]["duplicate_files"] = loader.duplicate_file_count
+    # 크기/바이너리/줄 길이/생성·압축 파일 규칙별로 건너뛴 파일 수
+    analysis["summary"]["skipped_files"] = dict(loader.skipped_files)
+    analysis["summary"]["document_chunks"] = chunk_count
+    # 청크당 토큰 수 (임베딩 배치 크기/요청 수 산정용)
+    analysis["summary"]["document_tokens"] = token_totals["tokens"]
+    analysis["summary"]["avg_tokens_per_chunk"] = round(token_totals["tokens"] / chunk_count, 1) if chunk_count else 0
+    analysis["summary"]["max_tokens_per_chunk"] = token_totals["max_tokens"]
+    # 로더가 실제로 문서를 만든 파일만 집계 (건너뛴 파일/중복 파일 제외, 증분 인덱싱은 변경분만 반영)
+    loaded_files = {lang.lower(): count for lang, count in loader.loaded_files_by_language.items()}
+    if previous_files is None:
+        target.stats.set_repository_files(repo_url, loaded_files)
+    else:
+        target.stats.add_repository_files(repo_url, {
+            lang: loaded_files.get(lang, 0) - previous_files.get(lang, 0)
+            for lang in set(loaded_files) | set(previous_files)
+        })
+    target.stats.flush()
+    index_state.update(repo_url, commit=head_sha, local_path=repo_path, collection=target.collection_name)
+    
+    # 단계별 실행 시간/처리량 (느린 단계 파악용)
+    analysis["metrics"] = metrics.summary()
+    return analysis
+
+def drop_repository(repo_url: str, service: Optional[RetrievalService] = None) -> None:
+    """
+    저장소의 청크, 인덱싱 상태, 클론 디렉토리를 모두 삭제합니다.
+    저장소별 컬렉션을 사용하면 컬렉션을 통째로 삭제하므로 청크 수와 관계없이 빠르게 끝납니다.
+    """
+    service = service or get_retrieval_service()
+    service.embedder.drop_repository(repo_url)
+    service.index_state.remove(repo_url)
+    remove_repository(os.path.join(REPO_CACHE_DIR, hashlib.sha1(repo_url.encode('utf-8')).hexdigest()))
+
+def analyze_repository(repo_path: str, scanner: Optional[RepositoryScanner] = None) -> Dict[str, Any]:
+    """레포지토리의 구조를 분석합니다. scanner가 주어지면 기존 탐색 결과를 재사용합니다."""
+    if scanner is None:
+        scanner = MultiLanguageDocumentLoader(repo_path).scanner
+    return scanner.get_structure()
 
 def get_readme_content(repo_path: str) -> str:
     """README 파일의 내용을 반환합니다."""
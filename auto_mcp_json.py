@@ -18,6 +18,8 @@ def get_env_variables():
 
     required_vars = [
         "OPENAI_API_KEY",
+        "EMBEDDING_BACKEND",
+        "EMBEDDING_MODEL",
     ]
 
     config_vars = {"DEFAULT_TOP_K": "5"}
@@ -0,0 +1,475 @@
+"""
+합성 다중 언어 저장소로 인덱싱/검색 성능을 측정하고 결과를 JSON으로 저장하는 벤치마크입니다.
+
+측정 항목:
+    load    로더 처리량 (files/s, bytes/s)
+    split   분할기 처리량 (chunks/s)
+    embed   로컬 스텁 임베딩 서버(또는 hashing 백엔드) 대상 임베딩 처리량 (embeddings/s)
+    index   임베딩 + 벡터 저장소/BM25 색인 저장 처리량 (chunks/s)
+    search  rag_to_context(벡터 검색)와 hybrid_search 지연 시간 (p50/p95/p99, ms)
+
+사용 예:
+    python -m benchmarks.run_benchmarks --files 500 --output benchmarks/results/base.json
+    python -m benchmarks.run_benchmarks --files 500 --baseline benchmarks/results/base.json
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import logging
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_repo import LANGUAGE_GENERATORS, generate_queries, generate_repository
+from modules.code_loaders import MultiLanguageDocumentLoader
+from modules.code_splitter import MultiLanguageDocumentSplitter
+from modules.embedding_backends import create_embeddings
+from modules.hybrid_search import HybridSearcher
+from modules.query_cache import QueryResultCache
+from modules.rag import DocumentEmbedder, compute_chunk_id
+from modules.stub_embedding_server import start_stub_server
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 결과 JSON 형식 버전 (항목이 바뀌면 올려서 비교 시 구분)
+RESULT_FORMAT_VERSION = 1
+BENCHMARK_REPOSITORY_URL = "benchmark://synthetic"
+
+# MCP 도구와 같은 검색 조건 (mcp_server.rag_to_context / hybrid_search 기본값)
+SEARCH_SCENARIOS = {
+    "rag_to_context": {"top_k": 5, "lexical_weight": 0.0, "dense_weight": 1.0},
+    "hybrid_search": {"top_k": 5, "lexical_weight": 0.5, "dense_weight": 0.5},
+}
+
+# 비교 시 클수록 좋은 처리량 항목과 작을수록 좋은 지연 시간 항목
+THROUGHPUT_KEYS = ("items_per_second",)
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _git_commit(path: str) -> Optional[str]:
+    """벤치마크한 코드의 커밋 해시를 반환합니다. (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _throughput(runs: List[Dict[str, float]], unit: str) -> Dict[str, Any]:
+    """
+    반복 실행 결과에서 처리량을 계산합니다. (실행 시간의 중앙값 기준)
+
+    Args:
+        runs: 실행별 {"seconds", "items", ...} 목록
+        unit: 처리 단위 이름 (files, chunks, embeddings)
+
+    Returns:
+        Dict: 단계 결과
+    """
+    seconds = statistics.median(run["seconds"] for run in runs)
+    items = runs[-1]["items"]
+    result = {
+        "unit": unit,
+        "items": items,
+        "median_seconds": round(seconds, 6),
+        "items_per_second": round(items / seconds, 2) if seconds > 0 else None,
+        "runs": [{key: round(value, 6) if isinstance(value, float) else value for key, value in run.items()} for run in runs]
+    }
+    if "bytes" in runs[-1]:
+        result["bytes_per_second"] = round(runs[-1]["bytes"] / seconds, 2) if seconds > 0 else None
+    return result
+
+
+def _latency(samples: List[float]) -> Dict[str, Any]:
+    """
+    지연 시간 표본(초)의 분위수를 밀리초 단위로 계산합니다.
+
+    Args:
+        samples: 요청별 지연 시간 (초)
+
+    Returns:
+        Dict: count, mean/min/max, p50/p95/p99 (ms)
+    """
+    ms = [sample * 1000 for sample in samples]
+    if len(ms) >= 2:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "min_ms": round(min(ms), 3) if ms else 0.0,
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3)
+    }
+
+
+def bench_load(repo_path: str, repeat: int, parse_mode: str, max_workers: Optional[int]) -> Tuple[Dict, List]:
+    """
+    로더의 파일 처리량을 측정합니다. 실행마다 새 로더를 만들어 디렉토리 탐색부터 다시 수행합니다.
+
+    Returns:
+        Tuple: (단계 결과, 마지막 실행의 (언어, 문서) 목록)
+    """
+    runs, documents, loader = [], [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        loader = MultiLanguageDocumentLoader(repo_path, max_workers=max_workers, parse_mode=parse_mode)
+        documents = list(loader.iter_documents())
+        runs.append({
+            "seconds": time.perf_counter() - started,
+            "items": loader.loaded_file_count,
+            "bytes": loader.loaded_byte_count,
+            "documents": len(documents)
+        })
+    result = _throughput(runs, "files")
+    result["duplicate_files"] = loader.duplicate_file_count
+    result["skipped_files"] = dict(loader.skipped_files)
+    return result, documents
+
+
+def bench_split(documents: List, repeat: int, splitter_options: Dict[str, Any]) -> Tuple[Dict, List]:
+    """
+    분할기의 청크 처리량을 측정합니다. 실행마다 새 분할기를 만들어 언어별 분할기 생성 비용을 포함합니다.
+
+    Returns:
+        Tuple: (단계 결과, 마지막 실행의 청크 목록)
+    """
+    runs, chunks = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        splitter = MultiLanguageDocumentSplitter(**splitter_options)
+        chunks = list(splitter.iter_chunks(documents))
+        runs.append({
+            "seconds": time.perf_counter() - started,
+            "items": len(chunks),
+            "tokens": sum(chunk.metadata.get("token_count", 0) for chunk in chunks)
+        })
+    return _throughput(runs, "chunks"), chunks
+
+
+def _resolve_embedder(embedder: str, stub_latency: float) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    임베딩 백엔드 설정을 결정합니다. 스텁 서버를 사용할 수 없는 환경(오프라인에서 tiktoken 인코딩 다운로드 실패 등)에서는
+    hashing 백엔드로 대체하고 그 이유를 반환합니다.
+
+    Returns:
+        Tuple: (DocumentEmbedder 백엔드 옵션, 대체 사유)
+    """
+    if embedder == "hashing":
+        return {"embedding_backend": "hashing"}, None
+
+    server = start_stub_server(latency=stub_latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    try:
+        # 캐시 없이 한 번 호출하여 요청 경로(토큰화 → HTTP)가 동작하는지 확인
+        create_embeddings("openai", base_url=base_url).embed_documents(["def probe(): pass"])
+    except Exception as e:
+        reason = f"{type(e).__name__}: {str(e)[:200]}"
+        logger.warning(f"스텁 임베딩 서버를 사용할 수 없어 hashing 백엔드로 측정합니다: {reason}")
+        server.shutdown()
+        return {"embedding_backend": "hashing"}, reason
+    return {"embedding_backend": "openai", "embedding_base_url": base_url}, None
+
+
+def _create_embedder(persist_directory: str, backend_options: Dict[str, Any], batch_size: int, max_concurrency: int):
+    # 실행마다 빈 저장소/임베딩 캐시를 사용하여 캐시 적중 없이 측정
+    return DocumentEmbedder(
+        persist_directory=persist_directory,
+        collection_name="benchmark",
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+        collection_per_repository=False,
+        **backend_options
+    )
+
+
+def bench_embed_and_index(
+    chunks: List,
+    work_dir: str,
+    repeat: int,
+    backend_options: Dict[str, Any],
+    batch_size: int,
+    max_concurrency: int
+) -> Tuple[Dict, Dict, DocumentEmbedder]:
+    """
+    임베딩 처리량(스케줄러만)과 인덱싱 처리량(임베딩 + 벡터 저장소/BM25 저장)을 측정합니다.
+
+    Returns:
+        Tuple: (embed 결과, index 결과, 마지막 실행의 청크가 저장된 DocumentEmbedder)
+    """
+    texts = [chunk.page_content for chunk in chunks]
+    token_counts = [chunk.metadata.get("token_count", 0) for chunk in chunks]
+    embed_runs, index_runs, embedder = [], [], None
+    for run in range(repeat):
+        embedder = _create_embedder(
+            os.path.join(work_dir, f"embed_{run}"), backend_options, batch_size, max_concurrency
+        )
+        started = time.perf_counter()
+        embedder.scheduler.embed(texts, token_counts=token_counts if any(token_counts) else None)
+        embed_runs.append({
+            "seconds": time.perf_counter() - started,
+            "items": len(texts),
+            "batches": embedder.scheduler.progress["batches_completed"],
+            "retries": embedder.scheduler.progress["retries"]
+        })
+
+        embedder = _create_embedder(
+            os.path.join(work_dir, f"index_{run}"), backend_options, batch_size, max_concurrency
+        )
+        started = time.perf_counter()
+        stored = embedder.add_documents_stream(chunks)
+        index_runs.append({"seconds": time.perf_counter() - started, "items": stored})
+    return _throughput(embed_runs, "embeddings"), _throughput(index_runs, "chunks"), embedder
+
+
+def bench_search(embedder: DocumentEmbedder, queries: List[str], warmup: int) -> Dict[str, Dict]:
+    """
+    MCP 검색 도구와 같은 조건으로 검색 지연 시간을 측정합니다.
+    결과 캐시 없이 측정한 값과, 같은 질의를 반복하여 결과 캐시가 적중할 때의 값(hybrid_search_cached)을 함께 기록합니다.
+
+    Returns:
+        Dict: 시나리오 이름 → 지연 시간 분위수
+    """
+    uncached = HybridSearcher(embedder)
+    cached = HybridSearcher(embedder, result_cache=QueryResultCache(max_entries=len(queries) + 1))
+    scenarios = [(name, uncached, params) for name, params in SEARCH_SCENARIOS.items()]
+    scenarios.append(("hybrid_search_cached", cached, SEARCH_SCENARIOS["hybrid_search"]))
+
+    results = {}
+    for name, searcher, params in scenarios:
+        # 첫 요청의 초기화 비용(색인 로드 등)은 제외하고, 캐시 시나리오는 여기서 결과를 채움
+        for query in (queries if searcher is cached else queries[:warmup]):
+            searcher.search(query, repository_url=BENCHMARK_REPOSITORY_URL, **params)
+        samples = []
+        for query in queries:
+            started = time.perf_counter()
+            searcher.search(query, repository_url=BENCHMARK_REPOSITORY_URL, **params)
+            samples.append(time.perf_counter() - started)
+        results[name] = {"params": params, **_latency(samples)}
+    return results
+
+
+def _flatten_metrics(results: Dict[str, Any]) -> Dict[str, Tuple[str, float]]:
+    """비교할 지표를 {경로: (종류, 값)} 형태로 펼칩니다."""
+    metrics = {}
+    for stage in ("load", "split", "embed", "index"):
+        for key in THROUGHPUT_KEYS:
+            value = results.get(stage, {}).get(key)
+            if value:
+                metrics[f"{stage}.{key}"] = ("throughput", value)
+    for scenario, stats in results.get("search", {}).items():
+        for key in LATENCY_KEYS:
+            if stats.get(key):
+                metrics[f"search.{scenario}.{key}"] = ("latency", stats[key])
+    return metrics
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> Dict[str, Any]:
+    """
+    기준 결과와 비교하여 허용 범위보다 나빠진 지표를 찾습니다.
+
+    Args:
+        current: 이번 벤치마크 결과
+        baseline: 기준 벤치마크 결과 (다른 커밋에서 저장한 JSON)
+        max_regression: 허용하는 최대 성능 저하 비율 (0.2 = 처리량 20% 감소 / 지연 시간 20% 증가)
+
+    Returns:
+        Dict: baseline_commit, changes(지표별 변화율), regressions(허용 범위를 넘은 지표 목록)
+    """
+    current_metrics = _flatten_metrics(current["results"])
+    baseline_metrics = _flatten_metrics(baseline.get("results", {}))
+    changes, regressions = {}, []
+    for name, (kind, value) in current_metrics.items():
+        if name not in baseline_metrics:
+            continue
+        base_value = baseline_metrics[name][1]
+        change = (value - base_value) / base_value
+        changes[name] = round(change, 4)
+        # 처리량은 감소, 지연 시간은 증가가 성능 저하
+        worse = -change if kind == "throughput" else change
+        if worse > max_regression:
+            regressions.append(name)
+    if baseline.get("config") != current["config"]:
+        logger.warning("기준 결과와 벤치마크 설정이 달라 비교 결과가 정확하지 않을 수 있습니다.")
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "max_regression": max_regression,
+        "changes": changes,
+        "regressions": regressions
+    }
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    설정에 따라 합성 저장소를 생성하고 전체 벤치마크를 실행합니다.
+
+    Returns:
+        Dict: 결과 JSON으로 저장할 벤치마크 결과
+    """
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="code-rag-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        if args.repo_path:
+            repo_path = args.repo_path
+            repository = {"root_path": repo_path, "synthetic": False}
+        else:
+            repo_path = os.path.join(work_dir, "repo")
+            repository = generate_repository(
+                repo_path,
+                files=args.files,
+                languages=args.languages,
+                definitions_per_file=(args.min_definitions, args.max_definitions),
+                duplicate_ratio=args.duplicate_ratio,
+                seed=args.seed
+            )
+            repository["synthetic"] = True
+
+        splitter_options = {
+            "mode": args.chunking_mode,
+            "length_unit": args.length_unit,
+            "max_workers": args.split_workers
+        }
+        config = {
+            "files": args.files if not args.repo_path else None,
+            "languages": args.languages or list(LANGUAGE_GENERATORS),
+            "definitions_per_file": [args.min_definitions, args.max_definitions],
+            "duplicate_ratio": args.duplicate_ratio,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "parse_mode": "whole_file" if args.chunking_mode == "syntax" else "segments",
+            "load_workers": args.load_workers,
+            "splitter": splitter_options,
+            "embedder": args.embedder,
+            "stub_latency": args.stub_latency,
+            "embedding_batch_size": args.batch_size,
+            "embedding_concurrency": args.concurrency,
+            "queries": args.queries,
+            "warmup_queries": args.warmup
+        }
+
+        results: Dict[str, Any] = {}
+        logger.info("로더 벤치마크 실행 중...")
+        results["load"], documents = bench_load(repo_path, args.repeat, config["parse_mode"], args.load_workers)
+
+        logger.info("분할기 벤치마크 실행 중...")
+        results["split"], chunks = bench_split(documents, args.repeat, splitter_options)
+        for chunk in chunks:
+            chunk.metadata["repository_url"] = BENCHMARK_REPOSITORY_URL
+            chunk.metadata["commit"] = "benchmark"
+            chunk.id = compute_chunk_id(chunk)
+
+        logger.info("임베딩/인덱싱 벤치마크 실행 중...")
+        backend_options, fallback_reason = _resolve_embedder(args.embedder, args.stub_latency)
+        results["embed"], results["index"], embedder = bench_embed_and_index(
+            chunks, work_dir, args.repeat, backend_options, args.batch_size, args.concurrency
+        )
+        results["embed"]["backend"] = backend_options["embedding_backend"]
+        if fallback_reason:
+            results["embed"]["fallback_reason"] = fallback_reason
+
+        logger.info("검색 벤치마크 실행 중...")
+        queries = generate_queries(args.queries, seed=args.seed)
+        results["search"] = bench_search(embedder, queries, args.warmup)
+
+        return {
+            "format_version": RESULT_FORMAT_VERSION,
+            "commit": _git_commit(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count()
+            },
+            "config": config,
+            "repository": repository,
+            "results": results
+        }
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="인덱싱/검색 성능 벤치마크")
+    parser.add_argument("--files", type=int, default=200, help="합성 저장소의 소스 파일 수")
+    parser.add_argument("--languages", nargs="+", choices=list(LANGUAGE_GENERATORS), help="생성할 언어 (기본값: 전체)")
+    parser.add_argument("--min-definitions", type=int, default=4, help="파일당 최소 함수/클래스 수")
+    parser.add_argument("--max-definitions", type=int, default=16, help="파일당 최대 함수/클래스 수")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="내용이 같은 파일의 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repo-path", help="합성 저장소 대신 측정할 로컬 저장소 경로")
+    parser.add_argument("--repeat", type=int, default=3, help="처리량 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--load-workers", type=int, default=None, help="로더 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--chunking-mode", choices=["character", "syntax"], default="character")
+    parser.add_argument("--length-unit", choices=["characters", "tokens"], default="characters")
+    parser.add_argument("--split-workers", type=int, default=1, help="분할기 프로세스 수")
+    parser.add_argument("--embedder", choices=["stub", "hashing"], default="stub",
+                        help="stub: 로컬 OpenAI 호환 스텁 서버, hashing: 로컬 해싱 임베딩")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="스텁 서버의 요청당 지연 시간 (초)")
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩 요청당 청크 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="최대 동시 임베딩 요청 수")
+    parser.add_argument("--queries", type=int, default=200, help="검색 시나리오별 질의 수")
+    parser.add_argument("--warmup", type=int, default=10, help="측정 전 실행할 질의 수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/<커밋>.json, '-'는 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 최대 성능 저하 비율")
+    parser.add_argument("--work-dir", help="합성 저장소/벡터 저장소를 만들 디렉토리 (지정하면 삭제하지 않음)")
+    parser.add_argument("--keep", action="store_true", help="임시 작업 디렉토리를 삭제하지 않음")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    result = run_benchmarks(args)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            result["comparison"] = compare_results(result, json.load(f), args.max_regression)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        output_path = args.output or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "results", f"{(result['commit'] or 'unknown')[:12]}.json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        logger.info(f"벤치마크 결과 저장: {output_path}")
+
+    for stage in ("load", "split", "embed", "index"):
+        stats = result["results"][stage]
+        logger.info(f"{stage:>6}: {stats['items_per_second']} {stats['unit']}/s ({stats['items']}개, {stats['median_seconds']}초)")
+    for scenario, stats in result["results"]["search"].items():
+        logger.info(f"{scenario}: p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, p99 {stats['p99_ms']}ms")
+
+    comparison = result.get("comparison")
+    if comparison and comparison["regressions"]:
+        for name in comparison["regressions"]:
+            logger.error(f"성능 저하: {name} ({comparison['changes'][name]:+.1%}, 기준 커밋 {comparison['baseline_commit']})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
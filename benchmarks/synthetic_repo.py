@@ -0,0 +1,312 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import os
+import random
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 식별자/주석/질의를 만들 때 사용하는 단어 (검색 벤치마크 질의도 같은 단어에서 생성)
+VOCABULARY = (
+    "user", "account", "order", "invoice", "payment", "cache", "session", "token", "request", "response",
+    "queue", "worker", "schedule", "report", "metric", "index", "search", "document", "chunk", "embedding",
+    "repository", "commit", "branch", "config", "loader", "parser", "splitter", "vector", "store", "client",
+    "server", "handler", "router", "event", "stream", "buffer", "record", "batch", "retry", "limit"
+)
+VERBS = ("get", "load", "parse", "build", "update", "create", "delete", "validate", "render", "merge", "fetch", "sync")
+
+
+class _Names:
+    """시드가 같으면 같은 식별자를 만드는 이름 생성기"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def words(self, count: int) -> List[str]:
+        return [self.rng.choice(VOCABULARY) for _ in range(count)]
+
+    def snake(self) -> str:
+        return "_".join([self.rng.choice(VERBS)] + self.words(self.rng.randint(1, 2)))
+
+    def camel(self) -> str:
+        first, *rest = self.snake().split("_")
+        return first + "".join(word.title() for word in rest)
+
+    def pascal(self) -> str:
+        return "".join(word.title() for word in self.words(self.rng.randint(1, 3)))
+
+    def sentence(self) -> str:
+        verb, *words = [self.rng.choice(VERBS)] + self.words(self.rng.randint(3, 8))
+        return f"{verb.title()} the {' '.join(words)}."
+
+
+def _python_file(names: _Names, definitions: int) -> str:
+    lines = ["import os", "import logging", "from typing import Any, Dict, List, Optional", "", ""]
+    for _ in range(definitions):
+        if names.rng.random() < 0.4:
+            class_name = names.pascal()
+            lines += [f"class {class_name}:", f'    """{names.sentence()}"""', ""]
+            lines += ["    def __init__(self, options: Optional[Dict[str, Any]] = None):",
+                      "        self.options = options or {}", "        self.items: List[Any] = []", ""]
+            for _ in range(names.rng.randint(1, 4)):
+                lines += [f"    def {names.snake()}(self, value: Any) -> Any:",
+                          f'        """{names.sentence()}"""',
+                          "        if value is None:",
+                          "            return self.options.get('default')",
+                          "        self.items.append(value)",
+                          f"        return len(self.items) * {names.rng.randint(2, 97)}", ""]
+            lines.append("")
+        else:
+            lines += [f"def {names.snake()}(items: List[Any], limit: int = {names.rng.randint(1, 100)}) -> List[Any]:",
+                      f'    """{names.sentence()}"""',
+                      "    result = []",
+                      "    for index, item in enumerate(items):",
+                      "        if index >= limit:",
+                      "            break",
+                      f"        # {names.sentence()}",
+                      "        result.append(item)",
+                      "    return result", "", ""]
+    return "\n".join(lines)
+
+
+def _js_file(names: _Names, definitions: int, typed: bool = False) -> str:
+    annotation = ": any[]" if typed else ""
+    lines = ["'use strict';", ""]
+    for _ in range(definitions):
+        if names.rng.random() < 0.4:
+            lines += [f"/** {names.sentence()} */", f"export class {names.pascal()} {{",
+                      f"  constructor(options{': Record<string, any>' if typed else ''} = {{}}) {{",
+                      "    this.options = options;", "    this.items = [];", "  }", ""]
+            for _ in range(names.rng.randint(1, 4)):
+                lines += [f"  {names.camel()}(value{': any' if typed else ''}) {{",
+                          "    if (value === undefined) {",
+                          "      return this.options.fallback;",
+                          "    }",
+                          "    this.items.push(value);",
+                          f"    return this.items.length * {names.rng.randint(2, 97)};",
+                          "  }", ""]
+            lines += ["}", ""]
+        else:
+            lines += [f"// {names.sentence()}",
+                      f"export function {names.camel()}(items{annotation}, limit = {names.rng.randint(1, 100)}) {{",
+                      "  const result = [];",
+                      "  for (let i = 0; i < items.length && i < limit; i++) {",
+                      "    result.push(items[i]);",
+                      "  }",
+                      "  return result;",
+                      "}", ""]
+    return "\n".join(lines)
+
+
+def _ts_file(names: _Names, definitions: int) -> str:
+    return _js_file(names, definitions, typed=True)
+
+
+def _java_file(names: _Names, definitions: int) -> str:
+    lines = ["package com.example.synthetic;", "", "import java.util.ArrayList;", "import java.util.List;", "",
+             f"/** {names.sentence()} */", f"public class {names.pascal()} {{",
+             "    private final List<Object> items = new ArrayList<>();", ""]
+    for _ in range(definitions):
+        lines += [f"    /** {names.sentence()} */",
+                  f"    public int {names.camel()}(Object value) {{",
+                  "        if (value == null) {",
+                  "            return -1;",
+                  "        }",
+                  "        items.add(value);",
+                  f"        return items.size() * {names.rng.randint(2, 97)};",
+                  "    }", ""]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _go_file(names: _Names, definitions: int) -> str:
+    struct_name = names.pascal()
+    lines = ["package synthetic", "", "import \"fmt\"", "", f"// {struct_name} {names.sentence()}",
+             f"type {struct_name} struct {{", "\titems []interface{}", "}", ""]
+    for _ in range(definitions):
+        method = names.pascal()
+        lines += [f"// {method} {names.sentence()}",
+                  f"func (s *{struct_name}) {method}(value interface{{}}) int {{",
+                  "\tif value == nil {",
+                  "\t\treturn -1",
+                  "\t}",
+                  "\ts.items = append(s.items, value)",
+                  f"\tfmt.Println(\"{names.snake()}\", len(s.items))",
+                  f"\treturn len(s.items) * {names.rng.randint(2, 97)}",
+                  "}", ""]
+    return "\n".join(lines)
+
+
+def _cpp_file(names: _Names, definitions: int) -> str:
+    class_name = names.pascal()
+    lines = ["#include <vector>", "#include <string>", "", "namespace synthetic {", "",
+             f"// {names.sentence()}", f"class {class_name} {{", " public:"]
+    for _ in range(definitions):
+        lines += [f"  // {names.sentence()}",
+                  f"  int {names.camel()}(const std::string& value) {{",
+                  "    if (value.empty()) {",
+                  "      return -1;",
+                  "    }",
+                  "    items_.push_back(value);",
+                  f"    return static_cast<int>(items_.size()) * {names.rng.randint(2, 97)};",
+                  "  }", ""]
+    lines += [" private:", "  std::vector<std::string> items_;", "};", "", "}  // namespace synthetic", ""]
+    return "\n".join(lines)
+
+
+def _ruby_file(names: _Names, definitions: int) -> str:
+    lines = [f"# {names.sentence()}", f"class {names.pascal()}", "  def initialize", "    @items = []", "  end", ""]
+    for _ in range(definitions):
+        lines += [f"  # {names.sentence()}",
+                  f"  def {names.snake()}(value)",
+                  "    return -1 if value.nil?",
+                  "",
+                  "    @items << value",
+                  f"    @items.size * {names.rng.randint(2, 97)}",
+                  "  end", ""]
+    lines.append("end")
+    return "\n".join(lines)
+
+
+def _rust_file(names: _Names, definitions: int) -> str:
+    struct_name = names.pascal()
+    lines = [f"/// {names.sentence()}", f"pub struct {struct_name} {{", "    items: Vec<String>,", "}", "",
+             f"impl {struct_name} {{"]
+    for _ in range(definitions):
+        lines += [f"    /// {names.sentence()}",
+                  f"    pub fn {names.snake()}(&mut self, value: &str) -> usize {{",
+                  "        if value.is_empty() {",
+                  "            return 0;",
+                  "        }",
+                  "        self.items.push(value.to_string());",
+                  f"        self.items.len() * {names.rng.randint(2, 97)}",
+                  "    }", ""]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _markdown_file(names: _Names, definitions: int) -> str:
+    lines = [f"# {names.pascal()}", "", names.sentence(), ""]
+    for _ in range(definitions):
+        lines += [f"## {names.snake().replace('_', ' ').title()}", "",
+                  " ".join(names.sentence() for _ in range(names.rng.randint(2, 5))), "",
+                  "```python", f"{names.snake()}(items, limit={names.rng.randint(1, 100)})", "```", ""]
+    return "\n".join(lines)
+
+
+# 언어 이름 → (확장자, 파일 생성 함수)
+LANGUAGE_GENERATORS: Dict[str, tuple] = {
+    "python": (".py", _python_file),
+    "javascript": (".js", _js_file),
+    "typescript": (".ts", _ts_file),
+    "java": (".java", _java_file),
+    "go": (".go", _go_file),
+    "cpp": (".cpp", _cpp_file),
+    "ruby": (".rb", _ruby_file),
+    "rust": (".rs", _rust_file),
+    "markdown": (".md", _markdown_file),
+}
+
+
+def generate_repository(
+    root_path: str,
+    files: int = 200,
+    languages: Optional[Sequence[str]] = None,
+    definitions_per_file: tuple = (4, 16),
+    duplicate_ratio: float = 0.0,
+    seed: int = 42
+) -> Dict:
+    """
+    벤치마크용 다중 언어 저장소를 생성합니다. 시드와 설정이 같으면 항상 같은 파일 내용을 생성합니다.
+
+    Args:
+        root_path: 파일을 생성할 디렉토리 (없으면 생성)
+        files: 생성할 소스 파일 수 (README 제외)
+        languages: 생성할 언어 목록 (None인 경우 LANGUAGE_GENERATORS 전체, 파일은 언어별로 번갈아 생성)
+        definitions_per_file: 파일당 함수/클래스/메서드 수 범위 (최소, 최대)
+        duplicate_ratio: 다른 파일과 내용이 같은 파일의 비율 (로더의 중복 파일 처리 측정용)
+        seed: 난수 시드
+
+    Returns:
+        Dict: 생성 결과 (root_path, files, bytes, files_by_language, duplicate_files)
+    """
+    languages = list(languages or LANGUAGE_GENERATORS)
+    unknown = [lang for lang in languages if lang not in LANGUAGE_GENERATORS]
+    if unknown:
+        raise ValueError(
+            f"지원하지 않는 벤치마크 언어입니다: {', '.join(unknown)} (지원: {', '.join(LANGUAGE_GENERATORS)})"
+        )
+
+    rng = random.Random(seed)
+    names = _Names(rng)
+    os.makedirs(root_path, exist_ok=True)
+
+    files_by_language: Dict[str, int] = {lang: 0 for lang in languages}
+    generated: List[tuple] = []
+    total_bytes = 0
+    duplicate_files = 0
+
+    def _write(relative_path: str, content: str) -> None:
+        nonlocal total_bytes
+        full_path = os.path.join(root_path, relative_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        data = content.encode('utf-8')
+        with open(full_path, 'wb') as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    _write("README.md", f"# Synthetic benchmark repository\n\n{names.sentence()}\n")
+
+    for index in range(files):
+        lang = languages[index % len(languages)]
+        extension, generate = LANGUAGE_GENERATORS[lang]
+        # 패키지 디렉토리 구조 (언어/모듈 그룹/파일)
+        relative_path = os.path.join("src", lang, f"pkg_{index // 25:03d}", f"{names.snake()}_{index}{extension}")
+
+        same_language = [content for other_lang, content in generated if other_lang == lang]
+        if same_language and rng.random() < duplicate_ratio:
+            content = rng.choice(same_language)
+            duplicate_files += 1
+        else:
+            content = generate(names, rng.randint(*definitions_per_file))
+            generated.append((lang, content))
+
+        _write(relative_path, content)
+        files_by_language[lang] += 1
+
+    logger.info(f"벤치마크 저장소 생성 완료: {root_path} (파일 {files}개, {total_bytes / 1024:.1f}KB)")
+    return {
+        "root_path": root_path,
+        "files": files,
+        "bytes": total_bytes,
+        "files_by_language": files_by_language,
+        "duplicate_files": duplicate_files
+    }
+
+
+def generate_queries(count: int, seed: int = 7) -> List[str]:
+    """
+    생성한 저장소의 단어로 검색 벤치마크 질의를 생성합니다.
+
+    Args:
+        count: 질의 수
+        seed: 난수 시드
+
+    Returns:
+        List[str]: 질의 목록
+    """
+    rng = random.Random(seed)
+    names = _Names(rng)
+    templates: List[Callable[[], str]] = [
+        lambda: f"how does {names.snake()} work",
+        lambda: f"where is the {names.pascal()} class defined",
+        lambda: f"{rng.choice(VERBS)} {' '.join(names.words(2))} with retry limit",
+        lambda: names.sentence(),
+    ]
+    return [rng.choice(templates)() for _ in range(count)]
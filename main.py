@@ -1,5 +1,5 @@
-from langchain.retrievers.ensemble import EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
+import asyncio
+
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP(
@@ -9,6 +9,12 @@ mcp = FastMCP(
 )
 
 
+def _search(query: str, top_k: int):
+    # 벡터 저장소와 BM25 색인은 첫 검색 때 한 번만 열어 재사용 (시작 시간 단축)
+    from modules.retrieval_service import get_retrieval_service
+    return get_retrieval_service().search(query, top_k=top_k)
+
+
 @mcp.tool()
 async def search(query: str, top_k: int = 5) -> str:
     """
@@ -22,14 +28,8 @@ async def search(query: str, top_k: int = 5) -> str:
     """
 
     try:
-        bm25_retriever = BM25Retriever.from_documents(split_docs, k=top_k)
-        dense_retriever = db.as_retriever(search_kwargs={"k": top_k})
-        retriever = EnsembleRetriever(
-            retrievers=[bm25_retriever, dense_retriever],
-            weights=[0.5, 0.5]
-        )
-        result = retriever.get_relevant_documents(query)
-        return result
+        results = await asyncio.to_thread(_search, query, top_k)
+        return [doc for doc, _ in results]
     except Exception as e:
         return f"An error occurred during search: {str(e)}"
 
@@ -1,11 +1,25 @@
 # MCP Server 시작 지점
+import time
+
+# 시작 시간 측정 기준 (--profile-startup)
+_STARTED_AT = time.perf_counter()
+
+import argparse
+import asyncio
+import json
 import sys
 import os
-from langchain_core.documents import Document
-from typing import List, Dict, Any 
+import threading
+import logging
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+
+# LangChain/Chroma/tree-sitter/GitPython 등 무거운 모듈은 도구를 처음 사용할 때 import
+# (도구 등록까지의 시작 시간을 줄이기 위해 여기서는 표준 라이브러리와 MCP만 import)
+from modules.ingest_jobs import IngestionJob, IngestionJobManager
 
-from agent.agent1 import repository_clone
-from modules.rag import DocumentEmbedder
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from modules.retrieval_service import RetrievalService
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
@@ -27,10 +41,51 @@ GitHub 저장소를 검색하고 싶으시다면 (agent1):
 "이 코드에서 ~부분은 어떻게 작동하나요?"
 """
 
-embedder = DocumentEmbedder()
-rag = embedder.get_vectorstore()
+logger = logging.getLogger(__name__)
+
 top_k = 5
 
+
+def get_service() -> "RetrievalService":
+    """
+    임베딩/벡터 저장소/BM25 색인/검색기를 소유하는 공유 서비스를 반환합니다.
+    처음 호출될 때 무거운 모듈을 import 하고 초기화하므로 이벤트 루프 밖(스레드)에서 호출합니다.
+    """
+    from modules.retrieval_service import get_retrieval_service
+    return get_retrieval_service()
+
+
+def _ingest_repository(repo_url: str, **kwargs) -> Dict[str, Any]:
+    """공유 서비스로 저장소를 인덱싱합니다. (인덱싱 모듈은 첫 작업 실행 시 import)"""
+    from agent.agent1 import repository_clone
+    return repository_clone(repo_url, service=get_service(), **kwargs)
+
+
+def _drop_repository(repo_url: str) -> None:
+    from agent.agent1 import drop_repository
+    drop_repository(repo_url, get_service())
+
+
+def _search(query: str, **kwargs):
+    return get_service().search(query, **kwargs)
+
+
+def warm_up() -> None:
+    """검색 서비스와 인덱싱 모듈을 미리 초기화합니다. (첫 요청의 지연을 줄이기 위해 백그라운드에서 실행)"""
+    try:
+        get_service()
+        import agent.agent1  # noqa: F401
+    except Exception as e:
+        # 설정 오류 등은 도구를 호출할 때 다시 발생하여 응답으로 전달됨
+        logger.error(f"검색 서비스 초기화 실패: {str(e)}")
+
+
+# 저장소 인덱싱은 이벤트 루프 밖의 작업 풀에서 실행 (검색 요청이 막히지 않도록)
+ingestion_jobs = IngestionJobManager(
+    _ingest_repository,
+    max_workers=int(os.getenv("INGESTION_WORKERS", "1"))
+)
+
 mcp = FastMCP(
     name="tema1-leanathon-lst",
     version="0.0.1",
@@ -63,7 +118,7 @@ def format_repo_context(repo_info: Dict[str, Any]) -> str:
     return markdown_result
 
 
-def format_search_results(docs: List[Document]) -> str:
+def format_search_results(docs: List["Document"]) -> str:
     """
     Format search results as markdown.
 
@@ -93,25 +148,118 @@ def format_search_results(docs: List[Document]) -> str:
     return markdown_results
 
 
+def format_job_status(job: IngestionJob) -> str:
+    """
+    Format an ingestion job status as markdown.
+
+    Args:
+        job: Ingestion job to format
+    """
+    info = job.to_dict()
+    progress = info["progress"]
+    markdown_result = f"""
+    ## 인덱싱 작업 상태
+
+    - **작업 ID**: {info['job_id']}
+    - **저장소 URL**: {info['repo_url']}
+    - **상태**: {info['status']} ({info['stage']})
+    - **파싱한 파일 수**: {progress.get('files_parsed', 0)}
+    - **처리한 청크 수**: {progress.get('chunks_processed', 0)}
+    """
+    if info["error"]:
+        markdown_result += f"- **오류**: {info['error']}\n"
+    if job.status == "succeeded" and job.result:
+        markdown_result += format_repo_context(job.result)
+    return markdown_result
+
+
 @mcp.tool()
 async def repo_to_rag(repo_url: str) -> str:
     """
     GITHUB Repository Clone ⇒ Embedding and Store in VectorDB
-    Clones the given GitHub repository, embeds the source code, and stores it in a VectorDB.
-    This process is used for enabling vector-based code search and retrieval-based question answering.
+    Starts a background job that clones the given GitHub repository, embeds the source code,
+    and stores it in a VectorDB. Returns a job ID immediately; use ingestion_status to follow
+    progress and get the repository analysis when the job finishes.
 
     Parameters:
         repo_url: URL of the GitHub repository
     """
 
     try:
-        repo_info = await repository_clone(repo_url)
-        return format_repo_context(repo_info)
+        job = ingestion_jobs.submit(repo_url)
+        return (
+            f"저장소 인덱싱 작업이 시작되었습니다.\n\n"
+            f"- **작업 ID**: {job.job_id}\n"
+            f"- **저장소 URL**: {repo_url}\n\n"
+            f"ingestion_status 도구로 진행 상황을 확인하세요."
+        )
     except Exception as e:
         return f"An error occurred while processing the repository: {str(e)}"
 
 @mcp.tool()
-async def rag_to_context(query: str) -> str:
+async def ingestion_status(job_id: str = "") -> str:
+    """
+    Ingestion Job Status
+    Reports the status and progress (files parsed, chunks processed) of a repository ingestion job.
+    When the job has finished successfully, the repository analysis is included.
+    If job_id is empty, lists all known jobs.
+
+    Parameters:
+        job_id: Job ID returned by repo_to_rag
+    """
+
+    if not job_id:
+        jobs = ingestion_jobs.list_jobs()
+        if not jobs:
+            return "No ingestion jobs."
+        return "\n".join(
+            f"- {job.job_id}: {job.repo_url} [{job.status}]" for job in jobs
+        )
+
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        return f"Unknown job ID: {job_id}"
+    return format_job_status(job)
+
+@mcp.tool()
+async def cancel_ingestion(job_id: str) -> str:
+    """
+    Cancel Ingestion Job
+    Cancels a queued or running repository ingestion job. Chunks already stored are kept and
+    reused the next time the repository is ingested.
+
+    Parameters:
+        job_id: Job ID returned by repo_to_rag
+    """
+
+    if ingestion_jobs.cancel(job_id):
+        return f"작업 취소를 요청했습니다: {job_id}"
+    return f"취소할 수 있는 작업이 없습니다: {job_id}"
+
+@mcp.tool()
+async def drop_repository_index(repo_url: str) -> str:
+    """
+    Drop Repository
+    Removes every stored chunk, the indexing state and the local clone of a repository.
+
+    Parameters:
+        repo_url: URL of the GitHub repository to remove
+    """
+
+    if any(job.repo_url == repo_url and job.status in ("queued", "running") for job in ingestion_jobs.list_jobs()):
+        return f"인덱싱 중인 저장소는 삭제할 수 없습니다. 먼저 작업을 취소하세요: {repo_url}"
+    try:
+        await asyncio.to_thread(_drop_repository, repo_url)
+        return f"저장소를 삭제했습니다: {repo_url}"
+    except Exception as e:
+        return f"An error occurred while dropping the repository: {str(e)}"
+
+@mcp.tool()
+async def rag_to_context(
+    query: str,
+    repository_url: str = "",
+    languages: Optional[List[str]] = None
+) -> str:
     """
     Embedding Search ⇒ Generate Answer
     Receives a question, performs embedding-based similarity search, and generates a response
@@ -119,14 +267,112 @@ async def rag_to_context(query: str) -> str:
 
     Parameters:
         query: The user's input question
+        repository_url: Only search chunks of this repository (empty searches all repositories)
+        languages: Only search chunks of these languages (e.g. ["python", "markdown"])
     """
 
     try:
-        retriever = rag.as_retriever(search_kwargs={"k": top_k})
-        results = retriever.get_relevant_documents(query)
-        return format_search_results(results)
+        # 임베딩/검색은 동기 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        results = await asyncio.to_thread(
+            _search,
+            query,
+            top_k=top_k,
+            lexical_weight=0.0,
+            dense_weight=1.0,
+            repository_url=repository_url or None,
+            languages=languages
+        )
+        return format_search_results([doc for doc, _ in results])
     except Exception as e:
         return f"An error occurred while generating the response: {str(e)}"
 
+@mcp.tool()
+async def hybrid_search(
+    query: str,
+    top_k: int = 5,
+    lexical_weight: float = 0.5,
+    dense_weight: float = 0.5,
+    repository_url: str = "",
+    languages: Optional[List[str]] = None
+) -> str:
+    """
+    Hybrid Search (Keyword + Semantic)
+    Runs BM25 keyword search and embedding similarity search concurrently and merges them with
+    reciprocal-rank fusion. The most versatile search option for questions about indexed code.
+
+    Parameters:
+        query: Search query
+        top_k: Number of results to return
+        lexical_weight: Weight of keyword (BM25) results (0 disables keyword search)
+        dense_weight: Weight of semantic results (0 disables semantic search)
+        repository_url: Only search chunks of this repository (empty searches all repositories)
+        languages: Only search chunks of these languages (e.g. ["python", "markdown"])
+    """
+
+    try:
+        results = await asyncio.to_thread(
+            _search,
+            query,
+            top_k=top_k,
+            lexical_weight=lexical_weight,
+            dense_weight=dense_weight,
+            repository_url=repository_url or None,
+            languages=languages
+        )
+        return format_search_results([doc for doc, _ in results])
+    except Exception as e:
+        return f"An error occurred during search: {str(e)}"
+
+@mcp.tool()
+async def index_stats() -> str:
+    """
+    Index Statistics
+    Returns chunk counts per collection, files/chunks/bytes per repository and language, and
+    embedding tokens used, as JSON. Cheap enough to poll: counts come from count queries and
+    incrementally maintained counters, not from reading the stored chunks.
+    """
+
+    try:
+        stats = await asyncio.to_thread(lambda: get_service().get_stats())
+        return json.dumps(stats, ensure_ascii=False, indent=2)
+    except Exception as e:
+        return f"An error occurred while reading index statistics: {str(e)}"
+
+# 도구 등록 완료 시점 (--profile-startup)
+_TOOLS_REGISTERED_AT = time.perf_counter()
+
+
+def profile_startup() -> None:
+    """
+    시작 단계별 소요 시간을 stderr로 출력합니다.
+    (모듈별 상세 import 시간은 python -X importtime mcp_server.py --profile-startup 으로 확인)
+    """
+    stages = [("도구 등록 (MCP + 표준 라이브러리)", _TOOLS_REGISTERED_AT - _STARTED_AT)]
+    for name, step in [
+        ("검색 모듈 import (LangChain, Chroma, 임베딩)", lambda: __import__("modules.retrieval_service")),
+        ("인덱싱 모듈 import (tree-sitter, GitPython)", lambda: __import__("agent.agent1")),
+        ("검색 서비스 초기화 (벡터 저장소, BM25 색인)", get_service),
+    ]:
+        started = time.perf_counter()
+        step()
+        stages.append((name, time.perf_counter() - started))
+
+    print("시작 시간 프로파일", file=sys.stderr)
+    for name, seconds in stages:
+        print(f"  {seconds * 1000:9.1f} ms  {name}", file=sys.stderr)
+    print(f"  {sum(seconds for _, seconds in stages) * 1000:9.1f} ms  합계", file=sys.stderr)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP 서버")
+    parser.add_argument("--profile-startup", action="store_true", help="시작 단계별 소요 시간을 출력하고 종료")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+        sys.exit(0)
+
+    if os.getenv("MCP_WARMUP", "1") != "0":
+        # 도구는 바로 응답할 수 있도록 하고, 무거운 초기화는 백그라운드에서 진행
+        threading.Thread(target=warm_up, name="mcp-warmup", daemon=True).start()
     mcp.run(transport="sse")
\ No newline at end of file
@@ -0,0 +1,564 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from contextlib import contextmanager
+import json
+import math
+import mmap
+import os
+import shutil
+import threading
+import logging
+import sys
+
+import numpy as np
+from langchain_core.documents import Document
+
+from modules.embedding_backends import tokenize_code
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+# 색인을 갱신하는 프로세스 간 매니페스트 읽기-수정-쓰기를 직렬화하는 잠금 파일
+LOCK_FILE = ".lock"
+# 검색 필터로 사용할 문서 메타데이터 (세그먼트에 문서별 코드로 저장)
+TAG_FIELDS = ("repository_url", "language")
+
+
+def _map_uint32(path: str) -> np.ndarray:
+    """uint32 배열 파일을 메모리 매핑하여 NumPy 배열로 반환합니다."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint32)
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(mapped, dtype=np.uint32)
+
+
+class _Segment:
+    def __init__(self, path: str):
+        """
+        변경되지 않는 BM25 세그먼트를 엽니다. 포스팅과 문서 길이는 메모리 매핑으로 읽습니다.
+
+        Args:
+            path: 세그먼트 디렉토리 경로
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "terms.json"), 'r', encoding='utf-8') as f:
+            # term -> [포스팅 시작 위치, 포스팅 수]
+            self.terms: Dict[str, List[int]] = json.load(f)
+        with open(os.path.join(path, "doc_ids.txt"), 'r', encoding='utf-8') as f:
+            self.doc_ids: List[str] = f.read().split('\n') if os.path.getsize(f.name) else []
+        # (문서 번호, 출현 횟수) 쌍이 term 순서대로 저장된 배열
+        self.postings = _map_uint32(os.path.join(path, "postings.bin")).reshape(-1, 2)
+        self.doc_lengths = _map_uint32(os.path.join(path, "doc_lengths.bin"))
+        self.total_length = int(self.doc_lengths.sum())
+        # 문서별 (저장소 코드, 언어 코드) 배열과 코드 → 값 목록
+        tags_path = os.path.join(path, "tags.json")
+        if os.path.exists(tags_path):
+            with open(tags_path, 'r', encoding='utf-8') as f:
+                self.tag_values: List[str] = json.load(f)
+            self.doc_tags = _map_uint32(os.path.join(path, "doc_tags.bin")).reshape(-1, len(TAG_FIELDS))
+        else:
+            self.tag_values = [""]
+            self.doc_tags = np.zeros((len(self.doc_ids), len(TAG_FIELDS)), dtype=np.uint32)
+        self.tag_codes = {value: code for code, value in enumerate(self.tag_values)}
+        # 삭제(tombstone)되지 않은 문서 표시와 살아있는 문서 수/토큰 수 (BM25 통계는 살아있는 문서로만 계산)
+        self.live = np.ones(len(self.doc_ids), dtype=bool)
+        self.live_count = len(self.doc_ids)
+        self.live_length = self.total_length
+        self._positions: Optional[Dict[str, List[int]]] = None
+
+    def positions_of(self, doc_id: str) -> List[int]:
+        """세그먼트에서 문서 ID가 저장된 위치(문서 번호) 목록을 반환합니다."""
+        if self._positions is None:
+            positions: Dict[str, List[int]] = {}
+            for doc_index, segment_doc_id in enumerate(self.doc_ids):
+                positions.setdefault(segment_doc_id, []).append(doc_index)
+            self._positions = positions
+        return self._positions.get(doc_id, [])
+
+    def deleted_indices(self) -> List[int]:
+        """삭제된 문서 번호 목록을 반환합니다."""
+        return np.flatnonzero(~self.live).tolist()
+
+    def set_deleted(self, indices: Iterable[int]) -> None:
+        """
+        삭제된 문서 번호를 설정합니다. 검색 중인 스레드가 이전 값을 계속 사용할 수 있도록 배열을 새로 만듭니다.
+
+        Args:
+            indices: 삭제된 문서 번호 목록
+        """
+        live = np.ones(len(self.doc_ids), dtype=bool)
+        live[np.fromiter(indices, dtype=np.int64)] = False
+        self.live = live
+        self.live_count = int(live.sum())
+        self.live_length = int(self.doc_lengths[live].sum()) if self.live_count < len(live) else self.total_length
+
+    def get_tags(self, doc_index: int) -> Tuple[str, ...]:
+        """문서의 필터 메타데이터 값을 반환합니다."""
+        return tuple(self.tag_values[code] for code in self.doc_tags[doc_index].tolist())
+
+    def get_postings(self, term: str) -> Optional[np.ndarray]:
+        """term의 포스팅 (문서 번호, 출현 횟수) 배열을 반환합니다."""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, count = entry
+        return self.postings[offset:offset + count]
+
+
+def _write_segment(
+    path: str,
+    doc_ids: List[str],
+    doc_terms: List[Dict[str, int]],
+    doc_lengths: List[int],
+    doc_tags: List[Tuple[str, ...]]
+) -> None:
+    """
+    문서별 term 빈도로 세그먼트 파일을 작성합니다.
+
+    Args:
+        path: 세그먼트 디렉토리 경로
+        doc_ids: 문서 ID 목록
+        doc_terms: 문서별 term 빈도
+        doc_lengths: 문서별 토큰 수
+        doc_tags: 문서별 필터 메타데이터 값 (TAG_FIELDS 순서)
+    """
+    inverted: Dict[str, List[Tuple[int, int]]] = {}
+    for doc_index, term_counts in enumerate(doc_terms):
+        for term, count in term_counts.items():
+            inverted.setdefault(term, []).append((doc_index, count))
+
+    terms: Dict[str, List[int]] = {}
+    postings = []
+    offset = 0
+    for term in sorted(inverted):
+        entries = inverted[term]
+        terms[term] = [offset, len(entries)]
+        postings.extend(entries)
+        offset += len(entries)
+
+    tag_codes: Dict[str, int] = {"": 0}
+    encoded_tags = [
+        [tag_codes.setdefault(value, len(tag_codes)) for value in tags]
+        for tags in doc_tags
+    ]
+
+    tmp_path = f"{path}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    np.asarray(encoded_tags, dtype=np.uint32).reshape(-1, len(TAG_FIELDS)).tofile(
+        os.path.join(tmp_path, "doc_tags.bin")
+    )
+    with open(os.path.join(tmp_path, "tags.json"), 'w', encoding='utf-8') as f:
+        json.dump(list(tag_codes), f, ensure_ascii=False)
+    np.asarray(postings, dtype=np.uint32).reshape(-1, 2).tofile(os.path.join(tmp_path, "postings.bin"))
+    np.asarray(doc_lengths, dtype=np.uint32).tofile(os.path.join(tmp_path, "doc_lengths.bin"))
+    with open(os.path.join(tmp_path, "terms.json"), 'w', encoding='utf-8') as f:
+        json.dump(terms, f, ensure_ascii=False, separators=(',', ':'))
+    with open(os.path.join(tmp_path, "doc_ids.txt"), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(doc_ids))
+    os.replace(tmp_path, path)
+
+
+class BM25Index:
+    def __init__(
+        self,
+        index_directory: str,
+        k1: float = 1.5,
+        b: float = 0.75,
+        flush_threshold: int = 10000,
+        max_segments: int = 8,
+        max_deleted_ratio: float = 0.3
+    ):
+        """
+        디스크에 저장되는 BM25 역색인을 초기화합니다.
+        추가된 문서는 불변 세그먼트(포스팅 배열)로 저장되고, 검색 시 세그먼트를 메모리 매핑하여
+        질의 term의 포스팅만 읽으므로 검색 비용이 전체 문서 수가 아닌 읽은 포스팅 수에 비례합니다.
+
+        Args:
+            index_directory: 색인을 저장할 디렉토리
+            k1: BM25 term 빈도 포화 계수
+            b: BM25 문서 길이 정규화 계수
+            flush_threshold: 메모리 버퍼의 문서가 이 수를 넘으면 세그먼트로 저장
+            max_segments: 세그먼트 수가 이를 넘으면 하나로 병합
+            max_deleted_ratio: 전체 세그먼트 문서 중 삭제된 문서 비율이 이를 넘으면 병합하여 정리
+        """
+        self.index_directory = index_directory
+        self.k1 = k1
+        self.b = b
+        self.flush_threshold = flush_threshold
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._next_segment = 1
+        self._manifest_mtime = None
+
+        # 아직 세그먼트로 저장되지 않은 문서
+        self._pending_ids: List[str] = []
+        self._pending_terms: List[Dict[str, int]] = []
+        self._pending_lengths: List[int] = []
+        self._pending_tags: List[Tuple[str, ...]] = []
+
+        os.makedirs(index_directory, exist_ok=True)
+        self._load_manifest()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.index_directory, MANIFEST_FILE)
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        색인 변경(매니페스트 읽기-수정-쓰기)을 스레드와 프로세스 간에 직렬화합니다.
+        잠금을 얻은 뒤 매니페스트를 다시 읽으므로 다른 프로세스가 저장한 세그먼트/삭제 표시를 덮어쓰지 않습니다.
+        """
+        with self._lock:
+            if fcntl is None:
+                self._load_manifest(force=True)
+                yield
+                return
+            with open(os.path.join(self.index_directory, LOCK_FILE), 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._load_manifest(force=True)
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load_manifest(self, force: bool = False) -> None:
+        """
+        매니페스트를 읽어 세그먼트를 엽니다. 다른 프로세스가 색인을 갱신한 경우 다시 엽니다.
+
+        Args:
+            force: 수정 시각이 같아도 다시 읽을지 여부 (색인을 변경하기 전에 사용)
+        """
+        path = self._manifest_path
+        if not os.path.exists(path):
+            return
+        mtime = os.path.getmtime(path)
+        if mtime == self._manifest_mtime and not force:
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        opened = {segment.name: segment for segment in self._segments}
+        self._segments = [
+            opened.get(name) or _Segment(os.path.join(self.index_directory, name))
+            for name in manifest.get("segments", [])
+        ]
+        deleted = manifest.get("deleted", {})
+        if isinstance(deleted, list):
+            # 이전 형식 (삭제된 문서 ID 목록): 해당 ID의 모든 세그먼트 사본을 삭제된 것으로 처리
+            deleted_ids = set(deleted)
+            deleted = {
+                segment.name: [i for i, doc_id in enumerate(segment.doc_ids) if doc_id in deleted_ids]
+                for segment in self._segments
+            }
+        for segment in self._segments:
+            indices = sorted(deleted.get(segment.name, []))
+            if indices != segment.deleted_indices():
+                segment.set_deleted(indices)
+        self._next_segment = manifest.get("next_segment", len(self._segments) + 1)
+        self._manifest_mtime = mtime
+
+    def _save_manifest(self) -> None:
+        """매니페스트를 임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "segments": [segment.name for segment in self._segments],
+                # 세그먼트별 삭제된 문서 번호 (같은 ID를 다시 추가해도 이전 사본은 삭제 상태로 유지)
+                "deleted": {
+                    segment.name: segment.deleted_indices()
+                    for segment in self._segments if segment.live_count < len(segment.live)
+                },
+                "next_segment": self._next_segment
+            }, f)
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest_mtime = os.path.getmtime(self._manifest_path)
+
+    def _tombstone(self, ids: Set[str]) -> bool:
+        """
+        세그먼트에 저장된 문서 ID의 사본을 모두 삭제 상태로 표시합니다.
+
+        Returns:
+            bool: 새로 삭제 표시된 문서가 있는지 여부
+        """
+        changed = False
+        for segment in self._segments:
+            positions = [i for doc_id in ids for i in segment.positions_of(doc_id) if segment.live[i]]
+            if positions:
+                segment.set_deleted(segment.deleted_indices() + positions)
+                changed = True
+        return changed
+
+    def _deleted_ratio(self) -> float:
+        total = sum(len(segment.live) for segment in self._segments)
+        live = sum(segment.live_count for segment in self._segments)
+        return (total - live) / total if total else 0.0
+
+    @staticmethod
+    def _term_counts(text: str) -> Tuple[Dict[str, int], int]:
+        """텍스트의 term 빈도와 토큰 수를 계산합니다."""
+        counts: Dict[str, int] = {}
+        tokens = tokenize_code(text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        return counts, len(tokens)
+
+    def add_documents(self, documents: Iterable[Document]) -> None:
+        """
+        문서를 색인에 추가합니다. 문서에는 벡터 저장소와 같은 ID가 있어야 합니다.
+
+        Args:
+            documents: 추가할 문서 목록
+        """
+        with self._lock:
+            for document in documents:
+                counts, length = self._term_counts(document.page_content)
+                self._pending_ids.append(document.id)
+                self._pending_terms.append(counts)
+                self._pending_lengths.append(length)
+                self._pending_tags.append(tuple(str(document.metadata.get(field) or "") for field in TAG_FIELDS))
+            if len(self._pending_ids) >= self.flush_threshold:
+                self.flush()
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """
+        문서를 색인에서 삭제합니다. 세그먼트에는 삭제 표시만 하고, 삭제된 문서 비율이
+        max_deleted_ratio를 넘으면 세그먼트를 병합하여 정리합니다.
+
+        Args:
+            ids: 삭제할 문서 ID 목록
+        """
+        ids = set(ids)
+        if not ids:
+            return
+        with self._write_lock():
+            if self._pending_ids:
+                keep = [i for i, doc_id in enumerate(self._pending_ids) if doc_id not in ids]
+                self._pending_ids = [self._pending_ids[i] for i in keep]
+                self._pending_terms = [self._pending_terms[i] for i in keep]
+                self._pending_lengths = [self._pending_lengths[i] for i in keep]
+                self._pending_tags = [self._pending_tags[i] for i in keep]
+            if not self._tombstone(ids):
+                return
+            if self._deleted_ratio() > self.max_deleted_ratio:
+                self._merge_segments()
+            self._save_manifest()
+
+    def flush(self) -> None:
+        """
+        메모리 버퍼의 문서를 새 세그먼트로 저장하고 필요하면 세그먼트를 병합합니다.
+        같은 ID의 이전 세그먼트 사본은 삭제 표시하여 가장 최근 사본만 검색/통계에 포함되도록 합니다.
+        """
+        with self._write_lock():
+            if self._pending_ids:
+                # 버퍼 안에서 같은 ID가 여러 번 추가된 경우 마지막 문서만 저장
+                last = {doc_id: i for i, doc_id in enumerate(self._pending_ids)}
+                if len(last) < len(self._pending_ids):
+                    keep = sorted(last.values())
+                    self._pending_ids = [self._pending_ids[i] for i in keep]
+                    self._pending_terms = [self._pending_terms[i] for i in keep]
+                    self._pending_lengths = [self._pending_lengths[i] for i in keep]
+                    self._pending_tags = [self._pending_tags[i] for i in keep]
+                self._tombstone(set(self._pending_ids))
+                name = f"seg_{self._next_segment:06d}"
+                self._next_segment += 1
+                path = os.path.join(self.index_directory, name)
+                _write_segment(path, self._pending_ids, self._pending_terms, self._pending_lengths, self._pending_tags)
+                self._segments.append(_Segment(path))
+                self._pending_ids, self._pending_terms, self._pending_lengths, self._pending_tags = [], [], [], []
+                logger.info(f"BM25 세그먼트 저장 완료: {name} ({len(self._segments[-1].doc_ids)}개 문서)")
+            if len(self._segments) > self.max_segments or self._deleted_ratio() > self.max_deleted_ratio:
+                self._merge_segments()
+            self._save_manifest()
+
+    def _merge_segments(self) -> None:
+        """모든 세그먼트를 하나로 병합하면서 삭제된 문서를 제거합니다."""
+        doc_ids: List[str] = []
+        doc_terms: List[Dict[str, int]] = []
+        doc_lengths: List[int] = []
+        doc_tags: List[Tuple[str, ...]] = []
+        for segment in self._segments:
+            remap = {}
+            for old_index in np.flatnonzero(segment.live).tolist():
+                remap[old_index] = len(doc_ids)
+                doc_ids.append(segment.doc_ids[old_index])
+                doc_terms.append({})
+                doc_lengths.append(int(segment.doc_lengths[old_index]))
+                doc_tags.append(segment.get_tags(old_index))
+            for term, (offset, count) in segment.terms.items():
+                for doc_index, tf in segment.postings[offset:offset + count].tolist():
+                    new_index = remap.get(doc_index)
+                    if new_index is not None:
+                        doc_terms[new_index][term] = tf
+
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        path = os.path.join(self.index_directory, name)
+        _write_segment(path, doc_ids, doc_terms, doc_lengths, doc_tags)
+
+        old_segments = self._segments
+        self._segments = [_Segment(path)]
+        self._save_manifest()
+        for segment in old_segments:
+            # 다른 검색이 아직 메모리 매핑을 사용 중일 수 있으므로 삭제 실패는 무시
+            shutil.rmtree(segment.path, ignore_errors=True)
+        logger.info(f"BM25 세그먼트 {len(old_segments)}개를 {name}로 병합했습니다. ({len(doc_ids)}개 문서)")
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        repository_url: Optional[str] = None,
+        languages: Optional[List[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 점수가 높은 문서 ID를 반환합니다.
+        저장소/언어 필터는 점수 계산 전에 포스팅 단계에서 적용합니다.
+
+        Args:
+            query: 검색 질의
+            k: 반환할 문서 수
+            repository_url: 이 저장소의 문서만 검색 (None인 경우 전체)
+            languages: 이 언어들의 문서만 검색 (None인 경우 전체)
+
+        Returns:
+            List[Tuple[str, float]]: (문서 ID, 점수) 목록
+        """
+        with self._lock:
+            self._load_manifest()
+            # 삭제 표시는 변경 시 새 배열로 교체되므로 여기서 가져온 값으로 일관되게 계산
+            segments = [(segment, segment.live, segment.live_count, segment.live_length) for segment in self._segments]
+
+        terms = list(dict.fromkeys(tokenize_code(query)))
+        doc_count = sum(live_count for _, _, live_count, _ in segments)
+        if not terms or not doc_count or k <= 0:
+            return []
+        avg_length = (sum(live_length for _, _, _, live_length in segments) / doc_count) or 1.0
+
+        # 살아있는 문서만으로 문서 빈도를 계산 (삭제된 문서의 포스팅은 제외)
+        df = dict.fromkeys(terms, 0)
+        segment_postings: List[Dict[str, np.ndarray]] = []
+        for segment, live, live_count, _ in segments:
+            postings_by_term = {}
+            for term in terms:
+                postings = segment.get_postings(term)
+                if postings is None:
+                    continue
+                postings_by_term[term] = postings
+                if live_count == len(live):
+                    df[term] += len(postings)
+                else:
+                    df[term] += int(np.count_nonzero(live[postings[:, 0]]))
+            segment_postings.append(postings_by_term)
+        idf = {
+            term: math.log(1 + (doc_count - count + 0.5) / (count + 0.5))
+            for term, count in df.items() if count
+        }
+
+        candidates: List[Tuple[float, str]] = []
+        for (segment, live, live_count, _), postings_by_term in zip(segments, segment_postings):
+            if not postings_by_term:
+                continue
+            repository_code = None
+            if repository_url is not None:
+                repository_code = segment.tag_codes.get(repository_url)
+                if repository_code is None:
+                    continue
+            language_codes = None
+            if languages:
+                language_codes = [segment.tag_codes[lang] for lang in languages if lang in segment.tag_codes]
+                if not language_codes:
+                    continue
+
+            doc_indices, scores = [], []
+            for term, postings in postings_by_term.items():
+                term_idf = idf[term]
+                if repository_code is not None or language_codes is not None:
+                    tags = segment.doc_tags[postings[:, 0]]
+                    keep = np.ones(len(postings), dtype=bool)
+                    if repository_code is not None:
+                        keep &= tags[:, 0] == repository_code
+                    if language_codes is not None:
+                        keep &= np.isin(tags[:, 1], language_codes)
+                    postings = postings[keep]
+                    if len(postings) == 0:
+                        continue
+                docs = postings[:, 0].astype(np.int64)
+                tf = postings[:, 1].astype(np.float32)
+                lengths = segment.doc_lengths[docs].astype(np.float32)
+                denom = tf + self.k1 * (1 - self.b + self.b * lengths / avg_length)
+                doc_indices.append(docs)
+                scores.append(term_idf * tf * (self.k1 + 1) / denom)
+            if not doc_indices:
+                continue
+
+            # 읽은 포스팅에 대해서만 문서별 점수 합산
+            all_docs = np.concatenate(doc_indices)
+            unique_docs, inverse = np.unique(all_docs, return_inverse=True)
+            totals = np.bincount(inverse, weights=np.concatenate(scores))
+            # 삭제되지 않은 문서 중 상위 k개만 부분 정렬로 선택
+            positions = np.flatnonzero(live[unique_docs]) if live_count < len(live) else np.arange(len(unique_docs))
+            if len(positions) > k:
+                positions = positions[np.argpartition(-totals[positions], k - 1)[:k]]
+            for position in positions.tolist():
+                candidates.append((float(totals[position]), segment.doc_ids[int(unique_docs[position])]))
+
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        results: List[Tuple[str, float]] = []
+        seen = set()
+        for score, doc_id in candidates:
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            results.append((doc_id, score))
+            if len(results) >= k:
+                break
+        return results
+
+    def is_empty(self) -> bool:
+        """색인에 저장된 문서가 없는지 확인합니다."""
+        with self._lock:
+            self._load_manifest()
+            return not self._segments and not self._pending_ids
+
+    def build_from_vectorstore(self, vectorstore, batch_size: int = 1000) -> int:
+        """
+        기존 벡터 저장소의 청크로 색인을 만듭니다. (색인 없이 저장된 컬렉션을 옮길 때 사용)
+
+        Args:
+            vectorstore: Chroma 벡터 저장소
+            batch_size: 한 번에 읽을 청크 수
+
+        Returns:
+            int: 색인한 청크 수
+        """
+        total = 0
+        offset = 0
+        while True:
+            page = vectorstore.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+            if not page["ids"]:
+                break
+            self.add_documents(
+                Document(id=doc_id, page_content=text or "", metadata=metadata or {})
+                for doc_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"])
+            )
+            total += len(page["ids"])
+            offset += batch_size
+        self.flush()
+        logger.info(f"벡터 저장소의 청크 {total}개로 BM25 색인을 만들었습니다.")
+        return total
+
@@ -1,14 +1,20 @@
 from langchain_text_splitters import Language
-from langchain_community.document_loaders.generic import GenericLoader
 from langchain_community.document_loaders.parsers import LanguageParser
-from typing import Dict, List, Optional
+from langchain_core.documents import Document
+from langchain_core.documents.base import Blob
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 import os
+import hashlib
 import chardet
-from glob import glob
 import traceback
 import logging
 import sys
 
+from modules.repo_scanner import RepositoryScanner
+from modules.ingest_metrics import RateLimitFilter
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -19,20 +25,102 @@ logging.basicConfig(
     # ]
 )
 logger = logging.getLogger(__name__)
+# 파일마다 반복되는 경고/오류 로그는 위치별로 10초에 20개까지만 출력 (생략된 수는 다음 로그에 표시)
+logger.addFilter(RateLimitFilter(max_records=20, interval=10.0, max_level=logging.ERROR))
+
+# 생성된 파일로 판단할 파일 앞부분 표식 (소문자 비교)
+GENERATED_MARKERS = (
+    '@generated', 'do not edit', 'code generated by', 'autogenerated', 'auto-generated',
+    'generated by the protocol buffer compiler'
+)
+# 생성된 파일 이름 접미사 (protobuf/gRPC, 디자이너 코드 등)
+GENERATED_FILE_SUFFIXES = (
+    '_pb2.py', '_pb2_grpc.py', '.pb.go', '.pb.cc', '.pb.h', '.g.dart', '.designer.cs', '.generated.cs', '.g.cs'
+)
+# 번들/압축된 파일 이름 접미사
+MINIFIED_FILE_SUFFIXES = ('.min.js', '.min.mjs', '.bundle.js', '-bundle.js')
 
 class MultiLanguageDocumentLoader:
-    def __init__(self, root_path: str):
+    def __init__(
+        self,
+        root_path: str,
+        scanner: Optional[RepositoryScanner] = None,
+        max_workers: Optional[int] = 1,
+        parse_mode: str = "segments",
+        language_priority: Optional[List[str]] = None,
+        deduplicate: bool = True,
+        max_file_size: Optional[int] = 1024 * 1024,
+        max_line_length: Optional[int] = 5000,
+        binary_sniff_size: int = 8 * 1024,
+        skip_generated: bool = True,
+        skip_minified: bool = True
+    ):
         """
         여러 프로그래밍 언어의 문서를 로드하는 클래스를 초기화합니다.
         
         Args:
             root_path: 문서를 검색할 루트 디렉토리 경로
+            scanner: 저장소 탐색 결과를 공유할 RepositoryScanner (None인 경우 새로 생성)
+            max_workers: 파싱에 사용할 프로세스 수 (1: 단일 프로세스, None: CPU 코어 수)
+            parse_mode: 문서 생성 방식 ("segments": LanguageParser로 함수/클래스와 나머지 코드로 분리,
+                        "whole_file": 파일 전체를 문서 하나로 반환하여 구문 단위 분할기에 전달)
+            language_priority: 여러 언어가 같은 확장자를 사용할 때(.h: CPP/C) 우선할 언어 순서
+                               (None인 경우 language_extensions 순서, 즉 .h는 CPP)
+            deduplicate: 내용이 같은 파일(벤더링 사본, 생성 파일 등)은 한 번만 파싱하고
+                         나머지 경로는 청크의 alias_paths 메타데이터로 기록할지 여부
+            max_file_size: 이보다 큰 파일은 읽지 않고 건너뜀 (bytes, None이면 제한 없음)
+            max_line_length: 이보다 긴 줄이 있는 파일은 건너뜀 (문자 수, None이면 제한 없음)
+            binary_sniff_size: 바이너리 파일 판별에 사용할 파일 앞부분 크기 (bytes, 0이면 판별하지 않음)
+            skip_generated: 생성된 파일(@generated 표식, *_pb2.py 등)을 건너뛸지 여부
+            skip_minified: 번들/압축된 파일(*.min.js, 평균 줄 길이가 매우 긴 파일)을 건너뛸지 여부
         """
+        if parse_mode not in ("segments", "whole_file"):
+            raise ValueError(f"지원하지 않는 파싱 방식입니다: {parse_mode}")
         self.root_path = root_path
         self.logger = logger
-        self.logger = logger
+        self.max_workers = max_workers
+        self.parse_mode = parse_mode
+        self.deduplicate = deduplicate
+        self.max_file_size = max_file_size
+        self.max_line_length = max_line_length
+        self.binary_sniff_size = binary_sniff_size
+        self.skip_generated = skip_generated
+        self.skip_minified = skip_minified
+        # 평균 줄 길이가 이보다 길면 압축된 파일로 판단 (짧은 파일은 제외)
+        self.minified_avg_line_length = 300
+        self.minified_min_size = 4 * 1024
+        # 프로세스 풀 작업자가 같은 설정의 로더를 만들 수 있도록 생성 인자 보관
+        self._worker_options = {
+            "parse_mode": parse_mode,
+            "max_file_size": max_file_size,
+            "max_line_length": max_line_length,
+            "binary_sniff_size": binary_sniff_size,
+            "skip_generated": skip_generated,
+            "skip_minified": skip_minified
+        }
+        # 파일 수가 이보다 적으면 프로세스 풀 생성 비용이 더 크므로 단일 프로세스로 처리
+        self.parallel_min_files = 32
+        # 프로세스 풀 작업자에 한 번에 전달할 파일 수 (작업자 수의 2배 묶음까지만 미리 제출)
+        self.parallel_batch_size = 16
+        # 중복 판별을 위해 읽은 파일 내용을 파싱할 때까지 보관할 최대 크기 (bytes, 넘으면 파싱 시 다시 읽음)
+        self.dedupe_buffer_bytes = 64 * 1024 * 1024
+        # 언어별 파서 캐시
+        self._parsers: Dict[str, Optional[LanguageParser]] = {}
+        # 마지막 로드에서 문서가 생성된 파일 수
+        self.loaded_file_count = 0
+        # 마지막 로드에서 문서가 생성된 파일의 전체 크기 (bytes)
+        self.loaded_byte_count = 0
+        # 마지막 로드에서 문서가 생성된 파일 수 (언어별)
+        self.loaded_files_by_language: Dict[str, int] = {}
+        # 마지막 로드에서 다른 파일과 내용이 같아 파싱을 건너뛴 파일 수
+        self.duplicate_file_count = 0
+        # 마지막 로드에서 규칙별로 건너뛴 파일 수
+        # (file_size, binary, line_length, minified, generated, unreadable, parse_error)
+        self.skipped_files: Dict[str, int] = {}
         # 기본 인코딩 후보 목록
         self.encoding_candidates = ['utf-8', 'cp949', 'euc-kr', 'ascii']
+        # UTF-8 디코딩 실패 시 chardet에 넘길 최대 샘플 크기 (bytes)
+        self.encoding_sample_size = 64 * 1024
         
         # 언어별 파일 확장자 매핑
         self.language_extensions = {
@@ -60,64 +148,108 @@ class MultiLanguageDocumentLoader:
             'ELIXIR': ['.ex', '.exs']
         }
 
-    def _detect_file_encoding(self, file_path: str) -> str:
+        # 디렉토리 트리는 한 번만 순회하고 결과를 로더와 구조 분석이 함께 사용
+        self.scanner = scanner or RepositoryScanner(
+            root_path,
+            self.language_extensions,
+            language_priority=language_priority
+        )
+
+    def _detect_encoding(self, raw_data: bytes) -> Optional[str]:
         """
-        파일의 인코딩을 감지합니다.
+        바이트 데이터의 인코딩을 감지합니다. chardet은 앞부분 샘플에만 적용합니다.
         
         Args:
-            file_path: 인코딩을 감지할 파일 경로
+            raw_data: 인코딩을 감지할 파일의 바이트 데이터
             
         Returns:
-            감지된 인코딩 또는 기본값으로 'utf-8'
+            감지된 인코딩 또는 신뢰도가 낮은 경우 None
         """
         try:
-            with open(file_path, 'rb') as file:
-                raw_data = file.read()
-                if raw_data.startswith(b'\xff\xfe') or raw_data.startswith(b'\xfe\xff'):
-                    return 'utf-16'
-                result = chardet.detect(raw_data)
-                if result['confidence'] > 0.7:
-                    return result['encoding']
+            result = chardet.detect(raw_data[:self.encoding_sample_size])
+            if result['encoding'] and result['confidence'] > 0.7:
+                return result['encoding']
         except Exception as e:
             self.logger.warning(
-                f"인코딩 감지 중 오류 발생 ({file_path})\n"
+                f"인코딩 감지 중 오류 발생\n"
                 f"Error: {str(e)}\n"
                 f"Traceback:\n{traceback.format_exc()}"
             )
-        return 'utf-8'
+        return None
 
-    def _load_file_with_encoding(self, file_path: str) -> Optional[str]:
+    def _decode_bytes(self, raw_data: bytes, file_path: str) -> Optional[str]:
         """
-        다양한 인코딩을 시도하여 파일을 로드합니다.
+        바이트 데이터를 문자열로 디코딩합니다.
+        UTF-8을 먼저 시도하고, 실패한 경우에만 chardet 감지 결과와 후보 인코딩을 차례로 시도합니다.
         
         Args:
-            file_path: 로드할 파일 경로
+            raw_data: 디코딩할 바이트 데이터
+            file_path: 로그 출력용 파일 경로
             
         Returns:
-            로드된 파일 내용 또는 None
+            디코딩된 문자열 또는 None
         """
-        # 먼저 감지된 인코딩으로 시도
-        detected_encoding = self._detect_file_encoding(file_path)
-        encodings_to_try = [detected_encoding] + [enc for enc in self.encoding_candidates if enc != detected_encoding]
+        if raw_data.startswith(b'\xff\xfe') or raw_data.startswith(b'\xfe\xff'):
+            encodings_to_try = ['utf-16']
+        else:
+            encodings_to_try = ['utf-8-sig']
         
         for encoding in encodings_to_try:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                self.logger.info(f"성공: {file_path} 파일을 {encoding} 인코딩으로 로드했습니다.")
-                return content
+                return raw_data.decode(encoding)
             except UnicodeDecodeError:
-                self.logger.debug(f"{encoding} 인코딩으로 {file_path} 로드 시도 실패")
-                continue
-            except Exception as e:
-                self.logger.warning(
-                    f"{encoding} 인코딩으로 {file_path} 로드 중 오류 발생\n"
-                    f"Error: {str(e)}\n"
-                    f"Traceback:\n{traceback.format_exc()}"
-                )
+                self.logger.debug(f"{encoding} 인코딩으로 {file_path} 디코딩 시도 실패")
+        
+        # UTF-8 디코딩에 실패한 경우에만 샘플 기반으로 인코딩 감지
+        detected_encoding = self._detect_encoding(raw_data)
+        fallback_encodings = [detected_encoding] if detected_encoding else []
+        fallback_encodings += [enc for enc in self.encoding_candidates if enc not in fallback_encodings and enc != 'utf-8']
+        
+        for encoding in fallback_encodings:
+            try:
+                content = raw_data.decode(encoding)
+                self.logger.debug(f"성공: {file_path} 파일을 {encoding} 인코딩으로 로드했습니다.")
+                return content
+            except (UnicodeDecodeError, LookupError):
+                self.logger.debug(f"{encoding} 인코딩으로 {file_path} 디코딩 시도 실패")
                 continue
         return None
 
+    def _read_file(self, file_path: str) -> Optional[bytes]:
+        """파일을 바이트로 읽습니다. 읽기에 실패하면 None을 반환합니다."""
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except Exception as e:
+            self.logger.warning(
+                f"{file_path} 파일 읽기 중 오류 발생\n"
+                f"Error: {str(e)}\n"
+                f"Traceback:\n{traceback.format_exc()}"
+            )
+            return None
+
+    def _load_file_with_encoding(self, file_path: str, raw_data: Optional[bytes] = None) -> Optional[str]:
+        """
+        파일을 한 번만 읽어 디코딩된 내용을 반환합니다.
+        
+        Args:
+            file_path: 로드할 파일 경로
+            raw_data: 이미 읽은 파일 내용 (None인 경우 파일을 읽음)
+            
+        Returns:
+            로드된 파일 내용 또는 None
+        """
+        if raw_data is None:
+            raw_data = self._read_file(file_path)
+            if raw_data is None:
+                return None
+        
+        content = self._decode_bytes(raw_data, file_path)
+        if content is None:
+            return None
+        # 텍스트 모드로 읽을 때와 동일하게 줄바꿈 문자를 정규화
+        return content.replace('\r\n', '\n').replace('\r', '\n')
+
     def _create_language_parser(self, lang_enum: Language) -> Optional[LanguageParser]:
         """
         언어별 파서를 생성합니다. 파서가 지원되지 않는 경우 None을 반환합니다.
@@ -163,94 +295,325 @@ class MultiLanguageDocumentLoader:
             )
             return None
 
-    def load_documents(self, languages: Optional[List[str]] = None) -> Dict[str, List]:
+    def _get_language_parser(self, lang: str) -> Optional[LanguageParser]:
         """
-        지정된 언어들의 문서를 로드합니다.
+        언어별 파서를 캐시하여 반환합니다. 같은 언어의 파일은 하나의 파서를 재사용합니다.
         
         Args:
-            languages: 로드할 언어 목록. None인 경우 모든 지원 언어를 로드합니다.
+            lang: 프로그래밍 언어
             
         Returns:
-            언어별 문서 목록을 담은 딕셔너리
+            LanguageParser 객체 또는 None
+        """
+        if lang not in self._parsers:
+            self._parsers[lang] = self._create_language_parser(getattr(Language, lang))
+        return self._parsers[lang]
+
+    def _relative_path(self, file_path: str) -> str:
+        """파일 경로를 저장소 루트 기준의 '/' 구분 상대 경로로 변환합니다."""
+        return os.path.relpath(file_path, self.root_path).replace(os.sep, '/')
+
+    def _is_binary(self, raw_data: bytes) -> bool:
+        """파일 앞부분에 NUL 바이트가 있거나 제어 문자 비율이 높으면 바이너리 파일로 판단합니다."""
+        sample = raw_data[:self.binary_sniff_size]
+        if not sample or sample.startswith((b'\xff\xfe', b'\xfe\xff')):
+            # UTF-16 BOM이 있는 텍스트 파일은 NUL 바이트를 포함함
+            return False
+        if b'\x00' in sample:
+            return True
+        control_count = sum(1 for byte in sample if byte < 32 and byte not in (9, 10, 12, 13, 27))
+        return control_count / len(sample) > 0.3
+
+    def _check_raw_file(self, file_path: str, raw_data: bytes) -> Optional[str]:
+        """디코딩 전에 적용하는 규칙(바이너리 판별, 생성/압축 파일 이름)을 확인하고 건너뛸 규칙 이름을 반환합니다."""
+        if self.binary_sniff_size and self._is_binary(raw_data):
+            return "binary"
+        file_name = os.path.basename(file_path).lower()
+        if self.skip_generated and file_name.endswith(GENERATED_FILE_SUFFIXES):
+            return "generated"
+        if self.skip_minified and file_name.endswith(MINIFIED_FILE_SUFFIXES):
+            return "minified"
+        return None
+
+    def _check_content(self, content: str) -> Optional[str]:
+        """디코딩한 내용에 적용하는 규칙(줄 길이, 압축/생성 파일 표식)을 확인하고 건너뛸 규칙 이름을 반환합니다."""
+        if self.skip_generated:
+            head = content[:2048].lower()
+            if any(marker in head for marker in GENERATED_MARKERS):
+                return "generated"
+        lines = content.count('\n') + 1
+        if self.skip_minified and len(content) >= self.minified_min_size and len(content) / lines > self.minified_avg_line_length:
+            return "minified"
+        if self.max_line_length is not None and len(content) > self.max_line_length:
+            if max(len(line) for line in content.split('\n')) > self.max_line_length:
+                return "line_length"
+        return None
+
+    def _load_and_parse_file(
+        self,
+        lang: str,
+        file_path: str,
+        raw_data: Optional[bytes] = None
+    ) -> Tuple[List, Optional[str]]:
+        """
+        파일 하나를 읽고 언어별 파서로 파싱합니다.
+        크기/바이너리/줄 길이/생성·압축 파일 규칙에 걸리는 파일은 파싱하지 않습니다.
+        
+        Args:
+            lang: 프로그래밍 언어
+            file_path: 파싱할 파일 경로
+            raw_data: 이미 읽은 파일 내용 (None인 경우 파일을 읽음)
+            
+        Returns:
+            (파싱된 문서 목록, 건너뛴 경우 규칙 이름) - 실패한 경우 빈 목록
+        """
+        ext = os.path.splitext(file_path)[1]
+        try:
+            # 큰 파일은 읽기 전에 제외 (번들, 데이터 파일 등)
+            size = len(raw_data) if raw_data is not None else os.path.getsize(file_path)
+            if self.max_file_size is not None and size > self.max_file_size:
+                self.logger.debug(f"{file_path} 파일이 최대 크기를 넘어 건너뜁니다.")
+                return [], "file_size"
+            
+            if raw_data is None:
+                raw_data = self._read_file(file_path)
+            if raw_data is None:
+                return [], "unreadable"
+            skip_reason = self._check_raw_file(file_path, raw_data)
+            if skip_reason:
+                self.logger.debug(f"{file_path} 파일을 건너뜁니다. ({skip_reason})")
+                return [], skip_reason
+            
+            # 파일별로 적절한 인코딩 감지 및 로드
+            content = self._load_file_with_encoding(file_path, raw_data)
+            if content is None:
+                self.logger.warning(f"{file_path} 파일을 로드할 수 없습니다.")
+                return [], "unreadable"
+            skip_reason = self._check_content(content)
+            if skip_reason:
+                self.logger.debug(f"{file_path} 파일을 건너뜁니다. ({skip_reason})")
+                return [], skip_reason
+            
+            if self.parse_mode == "whole_file":
+                # 구문 단위 분할기가 파일 전체의 구문 트리를 사용하므로 파싱하지 않고 그대로 전달
+                loaded_docs = [Document(page_content=content, metadata={"source": file_path})]
+            else:
+                # 언어별 파서 (캐시됨)
+                parser = self._get_language_parser(lang)
+                
+                # 이미 디코딩한 내용을 Blob으로 파서에 직접 전달 (파일 재읽기 없음)
+                blob = Blob.from_data(content, path=file_path)
+                loaded_docs = list(parser.lazy_parse(blob))
+            # 저장소 루트 기준 상대 경로 (증분 인덱싱 시 파일 단위 삭제/갱신 키로 사용)
+            relative_path = self._relative_path(file_path)
+            for doc in loaded_docs:
+                doc.metadata["path"] = relative_path
+                # 검색 필터용 언어 이름 (파서가 설정한 값 대신 로더의 언어 키로 통일)
+                doc.metadata["language"] = lang.lower()
+            self.logger.debug(f"{lang} {ext} 파일 로드 완료: {file_path}")
+            return loaded_docs, None
+        except UnicodeDecodeError as e:
+            self.logger.error(
+                f"{file_path} 파일 인코딩 문제 발생\n"
+                f"Error: {str(e)}\n"
+                f"Traceback:\n{traceback.format_exc()}"
+            )
+            return [], "unreadable"
+        except Exception as e:
+            self.logger.error(
+                f"{file_path} 파일 로드 중 오류 발생\n"
+                f"Error: {str(e)}\n"
+                f"Traceback:\n{traceback.format_exc()}"
+            )
+        return [], "parse_error"
+
+    def _deduplicate_tasks(
+        self,
+        tasks: List[Tuple[str, str]]
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, List[str]], Dict[str, bytes]]:
+        """
+        내용이 같은 파일을 찾아 첫 번째 파일(정렬 순서 기준)만 남깁니다.
+        크기가 같은 파일끼리만 내용 해시를 계산하므로 대부분의 파일은 stat 한 번으로 끝나며,
+        해시 계산을 위해 읽은 파일 내용은 파싱에 다시 사용하여 같은 파일을 두 번 읽지 않습니다.
+        
+        Args:
+            tasks: (언어, 파일 경로) 튜플 목록
+            
+        Returns:
+            (중복을 제거한 작업 목록, 남긴 파일 경로 → 같은 내용인 다른 파일의 상대 경로 목록,
+             남긴 파일 경로 → 이미 읽은 파일 내용 (dedupe_buffer_bytes까지))
+        """
+        indices_by_size: Dict[int, List[int]] = {}
+        for index, (_, file_path) in enumerate(tasks):
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                continue
+            # 최대 크기를 넘는 파일은 어차피 건너뛰므로 해시를 계산하지 않음
+            if size > 0 and (self.max_file_size is None or size <= self.max_file_size):
+                indices_by_size.setdefault(size, []).append(index)
+        
+        duplicates = set()
+        aliases: Dict[str, List[str]] = {}
+        raw_data_by_path: Dict[str, bytes] = {}
+        buffered_bytes = 0
+        for size, indices in indices_by_size.items():
+            if len(indices) < 2:
+                continue
+            canonical_by_hash: Dict[str, int] = {}
+            for index in indices:
+                raw_data = self._read_file(tasks[index][1])
+                if raw_data is None:
+                    continue
+                digest = hashlib.sha1(raw_data).hexdigest()
+                if digest not in canonical_by_hash:
+                    canonical_by_hash[digest] = index
+                    if buffered_bytes + size <= self.dedupe_buffer_bytes:
+                        raw_data_by_path[tasks[index][1]] = raw_data
+                        buffered_bytes += size
+                    continue
+                canonical_path = tasks[canonical_by_hash[digest]][1]
+                aliases.setdefault(canonical_path, []).append(self._relative_path(tasks[index][1]))
+                duplicates.add(index)
+        
+        if duplicates:
+            self.logger.info(f"내용이 같은 파일 {len(duplicates)}개는 한 번만 파싱합니다.")
+        return [task for index, task in enumerate(tasks) if index not in duplicates], aliases, raw_data_by_path
+
+    def _parse_files(
+        self,
+        tasks: List[Tuple[str, str]],
+        raw_data_by_path: Optional[Dict[str, bytes]] = None
+    ) -> Iterator[Tuple[str, str, List, Optional[str]]]:
+        """
+        (언어, 파일 경로) 작업 목록을 파싱하여 입력 순서대로 결과를 반환합니다.
+        max_workers가 1보다 크면 파일을 parallel_batch_size개씩 묶어 프로세스 풀에서 병렬로 파싱합니다.
+        작업자 수의 2배까지만 묶음을 미리 제출하므로 파일 수와 관계없이 메모리 사용량이 일정하며,
+        소비자가 중단하면 아직 시작되지 않은 묶음은 취소하고 기다리지 않습니다.
+        
+        Args:
+            tasks: (언어, 파일 경로) 튜플 목록
+            raw_data_by_path: 파일 경로 → 이미 읽은 파일 내용 (파싱에 사용한 항목은 제거됨)
+            
+        Yields:
+            (언어, 파일 경로, 파싱된 문서 목록, 건너뛴 경우 규칙 이름)
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        raw_data_by_path = raw_data_by_path if raw_data_by_path is not None else {}
+        
+        if workers <= 1 or len(tasks) < self.parallel_min_files:
+            for lang, file_path in tasks:
+                raw_data = raw_data_by_path.pop(file_path, None)
+                yield (lang, file_path) + self._load_and_parse_file(lang, file_path, raw_data)
+            return
+        
+        self.logger.info(
+            f"프로세스 {workers}개로 파일 {len(tasks)}개 병렬 파싱 시작 (batch: {self.parallel_batch_size})"
+        )
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(self.root_path, self._worker_options)
+        )
+        pending = deque()
+        try:
+            for start in range(0, len(tasks), self.parallel_batch_size):
+                # 작업자마다 여러 파일을 묶어서 전달하여 프로세스 간 통신 비용을 줄임
+                batch = [
+                    (lang, file_path, raw_data_by_path.pop(file_path, None))
+                    for lang, file_path in tasks[start:start + self.parallel_batch_size]
+                ]
+                pending.append((batch, executor.submit(_parse_files_in_worker, batch)))
+                if len(pending) >= workers * 2:
+                    submitted, future = pending.popleft()
+                    for (lang, file_path, _), result in zip(submitted, future.result()):
+                        yield (lang, file_path) + result
+            while pending:
+                submitted, future = pending.popleft()
+                for (lang, file_path, _), result in zip(submitted, future.result()):
+                    yield (lang, file_path) + result
+        finally:
+            # 소비자가 중단한 경우 남은 묶음을 취소하고 실행 중인 파싱이 끝나기를 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_documents(
+        self,
+        languages: Optional[List[str]] = None,
+        paths: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, Document]]:
+        """
+        지정된 언어들의 문서를 파일 단위로 파싱하면서 하나씩 반환합니다.
+        전체 결과를 메모리에 모으지 않으므로 분할/임베딩 단계와 겹쳐서 처리할 수 있습니다.
+        
+        Args:
+            languages: 로드할 언어 목록. None인 경우 모든 지원 언어를 로드합니다.
+            paths: 로드할 파일의 저장소 기준 상대 경로 목록. None인 경우 모든 파일을 로드합니다.
+            
+        Yields:
+            (언어, 문서) 튜플
         """
         if languages is None:
             languages = list(self.language_extensions.keys())
         
-        documents_by_language = {}
+        path_filter = set(paths) if paths is not None else None
         
+        # 한 번의 탐색으로 수집된 파일 목록으로 (언어, 파일) 작업 목록 구성
+        tasks = []
         for lang in languages:
             lang = lang.upper()
             if lang not in self.language_extensions:
                 self.logger.warning(f"{lang}는 지원되지 않는 언어입니다.")
                 continue
-                
-            try:
-                # 해당 언어의 Language enum 가져오기
-                lang_enum = getattr(Language, lang)
-                extensions = self.language_extensions[lang]
-                
-                documents = []
-                for ext in extensions:
-                    # 해당 확장자를 가진 모든 파일 경로 찾기
-                    file_pattern = os.path.join(self.root_path, f"**/*{ext}")
-                    matching_files = glob(file_pattern, recursive=True)
-                    
-                    for file_path in matching_files:
-                        try:
-                            # 파일별로 적절한 인코딩 감지 및 로드
-                            content = self._load_file_with_encoding(file_path)
-                            if content is None:
-                                self.logger.warning(f"{file_path} 파일을 로드할 수 없습니다.")
-                                continue
-                            
-                            # 언어별 파서 생성
-                            parser = self._create_language_parser(lang_enum)
-                            
-                            loader = GenericLoader.from_filesystem(
-                                path=os.path.dirname(file_path),
-                                glob=os.path.basename(file_path),
-                                suffixes=[ext],
-                                parser=parser
-                            )
-                            
-                            try:
-                                loaded_docs = loader.load()
-                                documents.extend(loaded_docs)
-                                self.logger.info(f"{lang} {ext} 파일 로드 완료: {file_path}")
-                            except UnicodeDecodeError as e:
-                                self.logger.error(
-                                    f"{file_path} 파일 인코딩 문제 발생\n"
-                                    f"Error: {str(e)}\n"
-                                    f"Traceback:\n{traceback.format_exc()}"
-                                )
-                                continue
-                            except Exception as e:
-                                self.logger.error(
-                                    f"{file_path} 파일 로드 중 오류 발생\n"
-                                    f"Error: {str(e)}\n"
-                                    f"Traceback:\n{traceback.format_exc()}"
-                                )
-                                continue
-                                
-                        except Exception as e:
-                            self.logger.error(
-                                f"파일 처리 중 오류 발생 {file_path}\n"
-                                f"Error: {str(e)}\n"
-                                f"Traceback:\n{traceback.format_exc()}"
-                            )
-                            continue
-                    
-                if documents:
-                    documents_by_language[lang] = documents
-                    self.logger.info(f"{lang}: 총 {len(documents)}개 문서 로드 완료")
-                    
-            except Exception as e:
-                self.logger.error(
-                    f"{lang} 처리 중 오류 발생\n"
-                    f"Error: {str(e)}\n"
-                    f"Traceback:\n{traceback.format_exc()}"
-                )
-                continue
+            for file_path in self.scanner.get_files(lang):
+                if path_filter is None or self._relative_path(file_path) in path_filter:
+                    tasks.append((lang, file_path))
+        
+        aliases: Dict[str, List[str]] = {}
+        raw_data_by_path: Dict[str, bytes] = {}
+        if self.deduplicate:
+            tasks, aliases, raw_data_by_path = self._deduplicate_tasks(tasks)
+        self.duplicate_file_count = sum(len(alias_paths) for alias_paths in aliases.values())
+        
+        self.loaded_file_count = 0
+        self.loaded_byte_count = 0
+        self.loaded_files_by_language = {}
+        self.skipped_files = {}
+        for lang, file_path, docs, skip_reason in self._parse_files(tasks, raw_data_by_path):
+            if skip_reason:
+                self.skipped_files[skip_reason] = self.skipped_files.get(skip_reason, 0) + 1
+            if docs:
+                self.loaded_file_count += 1
+                self.loaded_files_by_language[lang] = self.loaded_files_by_language.get(lang, 0) + 1
+                try:
+                    self.loaded_byte_count += os.path.getsize(file_path)
+                except OSError:
+                    pass
+            alias_paths = aliases.get(file_path)
+            for doc in docs:
+                if alias_paths:
+                    # 같은 내용의 다른 경로 (Chroma 메타데이터는 목록을 지원하지 않으므로 줄바꿈으로 연결)
+                    doc.metadata["alias_paths"] = "\n".join(alias_paths)
+                yield lang, doc
+        
+        if self.skipped_files:
+            self.logger.info(f"규칙별로 건너뛴 파일 수: {self.skipped_files}")
+
+    def load_documents(self, languages: Optional[List[str]] = None) -> Dict[str, List]:
+        """
+        지정된 언어들의 문서를 로드합니다.
+        
+        Args:
+            languages: 로드할 언어 목록. None인 경우 모든 지원 언어를 로드합니다.
+            
+        Returns:
+            언어별 문서 목록을 담은 딕셔너리
+        """
+        documents_by_language = {}
+        for lang, doc in self.iter_documents(languages):
+            documents_by_language.setdefault(lang, []).append(doc)
+        
+        for lang, documents in documents_by_language.items():
+            self.logger.info(f"{lang}: 총 {len(documents)}개 문서 로드 완료")
         
         return documents_by_language
 
@@ -263,6 +626,20 @@ class MultiLanguageDocumentLoader:
         """
         return self.language_extensions
 
+# 프로세스 풀 작업자별 로더 (언어별 파서를 작업자 수명 동안 재사용)
+_worker_loader: Optional[MultiLanguageDocumentLoader] = None
+
+
+def _init_parse_worker(root_path: str, options: Dict) -> None:
+    """프로세스 풀 작업자를 초기화합니다."""
+    global _worker_loader
+    _worker_loader = MultiLanguageDocumentLoader(root_path, **options)
+
+
+def _parse_files_in_worker(batch: List[Tuple[str, str, Optional[bytes]]]) -> List[Tuple[List, Optional[str]]]:
+    """프로세스 풀 작업자에서 (언어, 파일 경로, 이미 읽은 파일 내용) 묶음을 파싱합니다."""
+    return [_worker_loader._load_and_parse_file(lang, file_path, raw_data) for lang, file_path, raw_data in batch]
+
 def main():
     # 로깅 레벨 설정
     logger.setLevel(logging.INFO)
@@ -2,10 +2,18 @@ from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
     Language
 )
-from typing import Dict, List
+from langchain_core.documents import Document
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
 import logging
 import sys
 
+from modules.syntax_splitter import SyntaxAwareSplitter
+from modules.token_counter import TokenCounter, get_token_counter
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -18,17 +26,66 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class MultiLanguageDocumentSplitter:
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        mode: str = "character",
+        length_unit: str = "characters",
+        target_tokens: int = 512,
+        overlap_tokens: int = 32,
+        max_tokens: int = 2048,
+        token_counter: Optional[TokenCounter] = None,
+        max_workers: Optional[int] = 1,
+        parallel_batch_size: int = 256
+    ):
         """
         여러 프로그래밍 언어의 문서를 분할하는 클래스를 초기화합니다.
         
         Args:
             chunk_size: 분할할 청크의 크기 (기본값: 1000)
             chunk_overlap: 청크 간 중복 크기 (기본값: 200)
+            mode: 분할 방식 ("character": 문자 수 기준 분할,
+                  "syntax": 구문 트리 기준 함수/클래스/메서드 단위 분할, 로더의 parse_mode="whole_file"과 함께 사용)
+            length_unit: 청크 크기 단위 ("characters": 언어별 문자 수 설정 사용,
+                         "tokens": 모든 언어에 target_tokens/overlap_tokens 토큰 수 사용)
+            target_tokens: 토큰 단위 분할 시 목표 청크 크기 (토큰)
+            overlap_tokens: 토큰 단위 분할 시 청크 간 중복 크기 (토큰)
+            max_tokens: 청크 하나의 최대 토큰 수. 분할 방식과 관계없이 이를 넘는 청크(minified 파일 등)는
+                        토큰 경계에서 다시 나눔 (임베딩 모델 입력 한도 이하로 설정)
+            token_counter: 토큰 수 계산기 (None인 경우 프로세스 공유 카운터)
+            max_workers: 분할에 사용할 프로세스 수 (1: 단일 프로세스, None: CPU 코어 수)
+            parallel_batch_size: 병렬 분할 시 작업자에게 한 번에 전달할 문서 수
         """
+        if mode not in ("character", "syntax"):
+            raise ValueError(f"지원하지 않는 분할 방식입니다: {mode}")
+        if length_unit not in ("characters", "tokens"):
+            raise ValueError(f"지원하지 않는 청크 크기 단위입니다: {length_unit}")
         self.default_chunk_size = chunk_size
         self.default_chunk_overlap = chunk_overlap
+        self.mode = mode
+        self.length_unit = length_unit
+        self.target_tokens = target_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or get_token_counter()
+        self.max_workers = max_workers
+        self.parallel_batch_size = parallel_batch_size
         self.logger = logger
+        # 프로세스 풀 작업자가 같은 설정의 분할기를 만들 수 있도록 생성 인자 보관 (토큰 카운터는 작업자별 공유 카운터 사용)
+        self._worker_config: Dict[str, Any] = {
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "mode": mode,
+            "length_unit": length_unit,
+            "target_tokens": target_tokens,
+            "overlap_tokens": overlap_tokens,
+            "max_tokens": max_tokens
+        }
+        # 언어별 문자 수 기준 분할기 캐시 (분할기와 구분자 정규식을 객체 수명 동안 재사용)
+        self._language_splitters: Dict[str, RecursiveCharacterTextSplitter] = {}
+        # 구문 단위 분할기 (언어별 최대 청크 크기는 분할 시 지정)
+        self._syntax_splitters: Dict[int, SyntaxAwareSplitter] = {}
         
         # 언어별 청크 크기 및 중복 설정
         self.language_specific_chunks = {
@@ -93,11 +150,17 @@ class MultiLanguageDocumentSplitter:
         Returns:
             tuple[int, int]: (chunk_size, chunk_overlap)
         """
+        if self.length_unit == "tokens":
+            return self.target_tokens, self.overlap_tokens
         if language in self.language_specific_chunks:
             params = self.language_specific_chunks[language]
             return params['chunk_size'], params['chunk_overlap']
         return self.default_chunk_size, self.default_chunk_overlap
 
+    def _length_function(self) -> Callable[[str], int]:
+        """청크 크기 측정 함수를 반환합니다. (문자 수 또는 토큰 수)"""
+        return self.token_counter.count if self.length_unit == "tokens" else len
+
     def _create_language_splitter(self, language: str) -> RecursiveCharacterTextSplitter:
         """
         언어별 TextSplitter를 생성합니다.
@@ -112,17 +175,21 @@ class MultiLanguageDocumentSplitter:
             chunk_size, chunk_overlap = self._get_language_specific_params(language)
             
             if language in self.language_parsers:
-                self.logger.info(f"{language} 언어용 분할기 생성 (chunk_size: {chunk_size}, overlap: {chunk_overlap})")
+                self.logger.info(
+                    f"{language} 언어용 분할기 생성 (chunk_size: {chunk_size}, overlap: {chunk_overlap}, 단위: {self.length_unit})"
+                )
                 return RecursiveCharacterTextSplitter.from_language(
                     language=self.language_parsers[language],
                     chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
+                    chunk_overlap=chunk_overlap,
+                    length_function=self._length_function()
                 )
             else:
                 self.logger.warning(f"{language}는 지원되지 않는 언어입니다. 기본 분할기를 사용합니다.")
                 return RecursiveCharacterTextSplitter(
-                    chunk_size=self.default_chunk_size,
-                    chunk_overlap=self.default_chunk_overlap
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    length_function=self._length_function()
                 )
         except Exception as e:
             self.logger.error(f"{language} 분할기 생성 중 오류 발생: {str(e)}")
@@ -131,6 +198,141 @@ class MultiLanguageDocumentSplitter:
                 chunk_overlap=self.default_chunk_overlap
             )
 
+    def _get_language_splitter(self, language: str) -> RecursiveCharacterTextSplitter:
+        """언어별 문자 수 기준 분할기를 캐시하여 반환합니다."""
+        if language not in self._language_splitters:
+            self._language_splitters[language] = self._create_language_splitter(language)
+        return self._language_splitters[language]
+
+    def _get_syntax_splitter(self, language: str) -> SyntaxAwareSplitter:
+        """
+        언어별 최대 청크 크기에 맞는 구문 단위 분할기를 반환합니다.
+        구문 단위 청크는 중복 없이 나뉘므로 청크 크기와 중복 크기의 합을 최대 크기로 사용합니다.
+        """
+        chunk_size, chunk_overlap = self._get_language_specific_params(language)
+        max_chunk_size = chunk_size + chunk_overlap
+        if max_chunk_size not in self._syntax_splitters:
+            self._syntax_splitters[max_chunk_size] = SyntaxAwareSplitter(
+                max_chunk_size,
+                length_function=self._length_function()
+            )
+        return self._syntax_splitters[max_chunk_size]
+
+    def _split_document(self, language: str, document: Document) -> List[Document]:
+        """
+        문서 하나를 현재 분할 방식으로 분할하고 각 청크에 token_count 메타데이터를 추가합니다.
+        구문 단위 분할을 지원하지 않는 언어와 문장 경계로도 최대 크기 안에 들지 않는 청크는
+        문자 수 기준 분할기로 나눕니다. (이때도 구문 메타데이터는 유지됨)
+        
+        Args:
+            language: 프로그래밍 언어
+            document: 분할할 문서
+            
+        Returns:
+            List[Document]: 분할된 청크 목록
+        """
+        splitter = self._get_language_splitter(language)
+        chunks = None
+        if self.mode == "syntax":
+            syntax_splitter = self._get_syntax_splitter(language)
+            if syntax_splitter.supports(language):
+                length_function = self._length_function()
+                chunks = []
+                for chunk in syntax_splitter.split_document(language, document):
+                    if length_function(chunk.page_content) > syntax_splitter.max_chunk_size:
+                        chunks.extend(splitter.split_documents([chunk]))
+                    else:
+                        chunks.append(chunk)
+        if chunks is None:
+            chunks = splitter.split_documents([document])
+        
+        return self._apply_token_limit(chunks)
+
+    def _apply_token_limit(self, chunks: List[Document]) -> List[Document]:
+        """
+        청크별 토큰 수를 한 번에 계산하여 token_count 메타데이터로 기록하고,
+        max_tokens를 넘는 청크는 토큰 경계에서 나눕니다.
+        """
+        result = []
+        for chunk, token_count in zip(chunks, self.token_counter.count_batch(chunk.page_content for chunk in chunks)):
+            if token_count <= self.max_tokens:
+                chunk.metadata["token_count"] = token_count
+                result.append(chunk)
+                continue
+            self.logger.warning(
+                f"{chunk.metadata.get('path', chunk.metadata.get('source', ''))} 청크가 최대 토큰 수를 넘어 다시 분할합니다. "
+                f"({token_count} > {self.max_tokens})"
+            )
+            for piece in self.token_counter.split_text(chunk.page_content, self.max_tokens):
+                metadata = dict(chunk.metadata)
+                metadata["token_count"] = self.token_counter.count(piece)
+                result.append(Document(page_content=piece, metadata=metadata))
+        return result
+
+    def _split_safely(self, language: str, document: Document) -> List[Document]:
+        """문서 하나를 분할합니다. 오류가 발생한 문서는 기록하고 건너뜁니다."""
+        try:
+            return self._split_document(language, document)
+        except Exception as e:
+            self.logger.error(f"{language} 문서 분할 중 오류 발생: {str(e)}")
+            return []
+
+    def _iter_split(self, documents: Iterable[Tuple[str, Document]]) -> Iterator[Tuple[str, List[Document]]]:
+        """
+        (언어, 문서) 스트림을 입력 순서대로 분할하여 (언어, 청크 목록)을 반환합니다.
+        max_workers가 1보다 크고 문서가 parallel_batch_size 이상이면 문서 묶음을 프로세스 풀에 나누어 분할합니다.
+        작업자 수의 2배까지만 묶음을 미리 제출하므로 입력 크기와 관계없이 메모리 사용량이 일정하며,
+        결과는 제출 순서대로 반환하므로 단일 프로세스와 같은 순서의 결과를 얻습니다.
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        iterator = iter(documents)
+
+        if workers <= 1:
+            for language, document in iterator:
+                yield language, self._split_safely(language, document)
+            return
+
+        def _batches() -> Iterator[List[Tuple[str, Document]]]:
+            batch = []
+            for item in iterator:
+                batch.append(item)
+                if len(batch) >= self.parallel_batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        batches = _batches()
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return
+        if len(first_batch) < self.parallel_batch_size:
+            # 문서 수가 적으면 프로세스 풀 생성 비용이 더 크므로 단일 프로세스로 처리
+            for language, document in first_batch:
+                yield language, self._split_safely(language, document)
+            return
+
+        self.logger.info(f"프로세스 {workers}개로 문서 병렬 분할 시작 (batch: {self.parallel_batch_size})")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_split_worker,
+            initargs=(self._worker_config,)
+        ) as executor:
+            pending = deque()
+            try:
+                for batch in itertools.chain([first_batch], batches):
+                    pending.append((batch, executor.submit(_split_batch_in_worker, batch)))
+                    if len(pending) >= workers * 2:
+                        submitted, future = pending.popleft()
+                        yield from zip((language for language, _ in submitted), future.result())
+                while pending:
+                    submitted, future = pending.popleft()
+                    yield from zip((language for language, _ in submitted), future.result())
+            finally:
+                # 소비자가 중단한 경우 아직 시작되지 않은 묶음은 취소
+                for _, future in pending:
+                    future.cancel()
+
     def split_documents(self, documents_by_language: Dict[str, List]) -> List:
         """
         언어별 문서를 분할합니다.
@@ -142,22 +344,51 @@ class MultiLanguageDocumentSplitter:
             List: 분할된 전체 문서 목록
         """
         all_split_documents = []
+        chunk_counts: Dict[str, int] = {}
+        
+        pairs = ((language, document) for language, documents in documents_by_language.items() for document in documents)
+        for language, chunks in self._iter_split(pairs):
+            chunk_counts[language] = chunk_counts.get(language, 0) + len(chunks)
+            all_split_documents.extend(chunks)
         
         for language, documents in documents_by_language.items():
-            try:
-                splitter = self._create_language_splitter(language)
-                split_docs = splitter.split_documents(documents)
-                
-                self.logger.info(f"{language}: {len(documents)}개 문서를 {len(split_docs)}개로 분할 완료")
-                all_split_documents.extend(split_docs)
-                
-            except Exception as e:
-                self.logger.error(f"{language} 문서 분할 중 오류 발생: {str(e)}")
-                continue
+            self.logger.info(f"{language}: {len(documents)}개 문서를 {chunk_counts.get(language, 0)}개로 분할 완료")
         
         self.logger.info(f"총 {len(all_split_documents)}개의 분할된 문서 생성 완료")
         return all_split_documents
 
+    def iter_chunks(self, documents: Iterable[Tuple[str, Document]]) -> Iterator[Document]:
+        """
+        (언어, 문서) 스트림을 받아 분할된 청크를 하나씩 반환합니다.
+        
+        Args:
+            documents: MultiLanguageDocumentLoader.iter_documents()가 반환하는 (언어, 문서) 스트림
+            
+        Yields:
+            Document: 분할된 청크
+        """
+        chunk_count = 0
+        
+        for _, chunks in self._iter_split(documents):
+            chunk_count += len(chunks)
+            yield from chunks
+        
+        self.logger.info(f"총 {chunk_count}개의 분할된 문서 생성 완료")
+
+# 프로세스 풀 작업자별 분할기 (언어별 분할기를 작업자 수명 동안 재사용)
+_worker_splitter: Optional[MultiLanguageDocumentSplitter] = None
+
+
+def _init_split_worker(config: Dict[str, Any]) -> None:
+    """프로세스 풀 작업자를 초기화합니다."""
+    global _worker_splitter
+    _worker_splitter = MultiLanguageDocumentSplitter(**config)
+
+
+def _split_batch_in_worker(batch: List[Tuple[str, Document]]) -> List[List[Document]]:
+    """프로세스 풀 작업자에서 문서 묶음을 분할합니다. (입력 문서별 청크 목록)"""
+    return [_worker_splitter._split_safely(language, document) for language, document in batch]
+
 def main():
     # 예시 사용법
     from code_loaders import MultiLanguageDocumentLoader
@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Tuple
+import math
+import os
+import re
+import zlib
+import logging
+import sys
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 백엔드별 기본 (모델 이름, 차원 수)
+BACKEND_DEFAULTS: Dict[str, Tuple[str, int]] = {
+    'openai': ('text-embedding-3-small', 1536),
+    'hashing': ('hashing-v1', 768),
+    'huggingface': ('sentence-transformers/all-MiniLM-L6-v2', 384)
+}
+
+# 코드 식별자 토큰 (camelCase, snake_case는 하위 토큰으로 추가 분리)
+_TOKEN_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*|\d+')
+_SUBTOKEN_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+
+def tokenize_code(text: str) -> List[str]:
+    """
+    코드/자연어 텍스트를 소문자 토큰 목록으로 분리합니다.
+    식별자는 원래 형태와 함께 camelCase/snake_case 하위 토큰도 포함합니다.
+
+    Args:
+        text: 토큰화할 텍스트
+
+    Returns:
+        List[str]: 토큰 목록
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        lowered = word.lower()
+        tokens.append(lowered)
+        subtokens = _SUBTOKEN_PATTERN.findall(word)
+        if len(subtokens) > 1:
+            tokens.extend(subtoken.lower() for subtoken in subtokens)
+    return tokens
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, dimensions: int = 768):
+        """
+        네트워크 호출 없이 CPU에서 계산하는 해싱 기반 임베딩을 초기화합니다.
+        토큰과 인접 토큰 쌍을 부호 있는 해싱으로 고정 차원에 투영하고 L2 정규화합니다.
+
+        Args:
+            dimensions: 임베딩 차원 수
+        """
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> Dict[int, float]:
+        """텍스트의 해시 특징 (인덱스 → 가중치)을 계산합니다."""
+        tokens = tokenize_code(text)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for first, second in zip(tokens, tokens[1:]):
+            bigram = f"{first} {second}"
+            counts[bigram] = counts.get(bigram, 0) + 1
+
+        features: Dict[int, float] = {}
+        for feature, count in counts.items():
+            hashed = zlib.crc32(feature.encode('utf-8'))
+            index = hashed % self.dimensions
+            sign = 1.0 if (hashed >> 31) & 1 else -1.0
+            # 자주 나오는 토큰이 벡터를 지배하지 않도록 로그 스케일 가중치 사용
+            features[index] = features.get(index, 0.0) + sign * (1.0 + math.log(count))
+        return features
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 목록을 NumPy로 한 번에 임베딩합니다."""
+        if not texts:
+            return []
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for index, value in self._features(text).items():
+                rows.append(row)
+                cols.append(index)
+                values.append(value)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        matrix[np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)] = np.asarray(values, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """질의를 임베딩합니다."""
+        return self.embed_documents([text])[0]
+
+
+def validate_backend_config(backend: str) -> None:
+    """
+    임베딩 백엔드 설정을 확인합니다. 원격 API 백엔드만 API 키를 요구합니다.
+
+    Args:
+        backend: 임베딩 백엔드 이름 ('openai', 'hashing', 'huggingface')
+    """
+    if backend not in BACKEND_DEFAULTS:
+        raise ValueError(
+            f"지원하지 않는 임베딩 백엔드입니다: {backend} (지원: {', '.join(BACKEND_DEFAULTS)})"
+        )
+    if backend == 'openai' and not os.getenv("OPENAI_API_KEY"):
+        raise ValueError(
+            "OPENAI_API_KEY 환경 변수가 설정되지 않았습니다. "
+            "오프라인 환경에서는 EMBEDDING_BACKEND=hashing 또는 huggingface를 사용하세요."
+        )
+
+
+def create_embeddings(
+    backend: str,
+    model: Optional[str] = None,
+    dimensions: Optional[int] = None,
+    base_url: Optional[str] = None
+) -> Embeddings:
+    """
+    설정에 맞는 임베딩 객체를 생성합니다. 무거운 의존성은 해당 백엔드를 사용할 때만 import 합니다.
+
+    Args:
+        backend: 임베딩 백엔드 이름 ('openai', 'hashing', 'huggingface')
+        model: 모델 이름 (None인 경우 백엔드 기본값)
+        dimensions: 임베딩 차원 수 (None인 경우 백엔드 기본값)
+        base_url: OpenAI 호환 임베딩 API 주소 (openai 백엔드 전용)
+
+    Returns:
+        Embeddings: 임베딩 객체
+    """
+    validate_backend_config(backend)
+    default_model, default_dimensions = BACKEND_DEFAULTS[backend]
+    model = model or default_model
+    dimensions = dimensions or default_dimensions
+
+    if backend == 'hashing':
+        return HashingEmbeddings(dimensions=dimensions)
+
+    if backend == 'huggingface':
+        try:
+            from langchain_huggingface import HuggingFaceEmbeddings
+        except ImportError as e:
+            raise ValueError(
+                "huggingface 임베딩 백엔드를 사용하려면 langchain-huggingface와 sentence-transformers를 설치하세요."
+            ) from e
+        return HuggingFaceEmbeddings(
+            model_name=model,
+            model_kwargs={"device": "cpu"},
+            encode_kwargs={"normalize_embeddings": True}
+        )
+
+    from langchain_openai import OpenAIEmbeddings
+    openai_options = {"base_url": base_url} if base_url else {}
+    return OpenAIEmbeddings(model=model, dimensions=dimensions, **openai_options)
@@ -0,0 +1,214 @@
+from typing import Callable, Dict, List, Optional
+from array import array
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import logging
+import sys
+
+from langchain_core.embeddings import Embeddings
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model_name: str,
+        dimensions: int,
+        cache_path: str,
+        max_size_bytes: int = 1024 * 1024 * 1024,
+        on_miss: Optional[Callable[[List[str]], None]] = None,
+        access_flush_interval: float = 30.0
+    ):
+        """
+        임베딩 결과를 로컬 SQLite 파일에 캐시하는 임베딩 래퍼를 초기화합니다.
+        캐시 키는 모델 이름, 차원 수, 텍스트 해시로 구성되며 벡터는 float32 바이트로 저장합니다.
+
+        Args:
+            underlying: 캐시 미스 시 호출할 실제 임베딩 객체
+            model_name: 임베딩 모델 이름
+            dimensions: 임베딩 차원 수
+            cache_path: 캐시 SQLite 파일 경로
+            max_size_bytes: 캐시에 저장할 벡터의 최대 크기 (초과 시 오래 사용되지 않은 항목부터 삭제)
+            on_miss: 캐시 미스로 실제 임베딩한 텍스트 목록을 받을 함수 (사용량 집계용)
+            access_flush_interval: 캐시 적중 항목의 최근 사용 시각을 모아서 기록하는 최소 간격 (초)
+        """
+        self.underlying = underlying
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.cache_path = cache_path
+        self.max_size_bytes = max_size_bytes
+        self.on_miss = on_miss
+        self.access_flush_interval = access_flush_interval
+        self.hits = 0
+        self.misses = 0
+        # 아직 기록하지 않은 캐시 적중 항목의 최근 사용 시각 (키 → 시각)
+        self._pending_access: Dict[str, float] = {}
+        self._access_flushed_at = time.monotonic()
+
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+        self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def _key(self, text: str, namespace: str) -> str:
+        """모델 이름, 차원 수, 텍스트 해시로 캐시 키를 생성합니다."""
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{namespace}:{self.model_name}:{self.dimensions}:{digest}"
+
+    def _write_access_times(self) -> None:
+        """모아 둔 최근 사용 시각을 기록합니다. (잠금을 가진 상태에서 호출, 커밋은 호출자가 처리)"""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+            )
+            self._pending_access = {}
+        self._access_flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """모아 둔 캐시 적중 항목의 최근 사용 시각을 바로 기록합니다."""
+        with self._lock:
+            if self._pending_access:
+                self._write_access_times()
+                self._conn.commit()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        캐시에서 벡터를 조회합니다.
+        조회된 항목의 최근 사용 시각은 적중할 때마다 커밋하지 않고 모아 두었다가
+        access_flush_interval마다 또는 새 벡터를 저장할 때 한 번에 기록합니다.
+        """
+        found: Dict[str, List[float]] = {}
+        if not keys:
+            return found
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+            if found:
+                now = time.time()
+                for key in found:
+                    self._pending_access[key] = now
+                if time.monotonic() - self._access_flushed_at >= self.access_flush_interval:
+                    self._write_access_times()
+                    self._conn.commit()
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        """벡터를 float32 바이트로 캐시에 저장하고 크기 제한을 넘으면 오래된 항목을 삭제합니다."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            blob = array('f', vector).tobytes()
+            rows.append((key, blob, len(blob), now))
+        with self._lock:
+            # 같은 키는 같은 벡터이므로 이미 있는 항목은 그대로 둠
+            changes_before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, size, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+            inserted = self._conn.total_changes - changes_before
+            # 모아 둔 최근 사용 시각도 같은 트랜잭션으로 기록 (삭제 순서가 최근 적중을 반영하도록)
+            self._write_access_times()
+            self._conn.commit()
+            # 한 번에 저장하는 벡터는 모두 같은 차원이므로 크기가 같음
+            self._total_size += inserted * rows[0][2]
+            if self._total_size > self.max_size_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """가장 오래 사용되지 않은 항목부터 삭제하여 캐시 크기를 제한의 90% 이하로 줄입니다."""
+        target = int(self.max_size_bytes * 0.9)
+        removed = 0
+        while self._total_size > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM embeddings ORDER BY last_access LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append((key,))
+                self._total_size -= size
+                if self._total_size <= target:
+                    break
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+            removed += len(evicted)
+        self._conn.commit()
+        logger.info(f"임베딩 캐시 크기 제한으로 {removed}개 항목을 삭제했습니다.")
+
+    def _embed_with_cache(self, texts: List[str], namespace: str) -> List[List[float]]:
+        """캐시에 없는 텍스트만 실제 임베딩 객체로 계산합니다."""
+        keys = [self._key(text, namespace) for text in texts]
+        cached = self._lookup(list(dict.fromkeys(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        with self._lock:
+            self.hits += sum(1 for key in keys if key in cached)
+            self.misses += len(missing)
+
+        if missing:
+            if namespace == "query":
+                vectors = [self.underlying.embed_query(text) for text in missing.values()]
+            else:
+                vectors = self.underlying.embed_documents(list(missing.values()))
+            if self.on_miss:
+                self.on_miss(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 목록을 임베딩합니다. 캐시에 있는 텍스트는 다시 계산하지 않습니다."""
+        return self._embed_with_cache(list(texts), "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        """질의를 임베딩합니다. 캐시에 있는 질의는 다시 계산하지 않습니다."""
+        return self._embed_with_cache([text], "query")[0]
+
+    def get_stats(self) -> dict:
+        """캐시 적중/미스 횟수와 현재 크기를 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size_bytes": self._total_size,
+                "max_size_bytes": self.max_size_bytes
+            }
@@ -0,0 +1,255 @@
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import sys
+
+from langchain_core.documents import Document
+
+from modules.query_cache import ALL_COLLECTIONS, QueryResultCache
+from modules.rag import DocumentEmbedder
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def reciprocal_rank_fusion(
+    rankings: List[Tuple[List[str], float]],
+    rrf_k: int = 60
+) -> List[Tuple[str, float]]:
+    """
+    여러 검색 결과의 순위를 가중 RRF(Reciprocal Rank Fusion)로 합칩니다.
+
+    Args:
+        rankings: (순위대로 정렬된 ID 목록, 가중치) 목록
+        rrf_k: 하위 순위의 영향을 줄이는 RRF 상수
+
+    Returns:
+        List[Tuple[str, float]]: 점수 내림차순 (ID, 점수) 목록
+    """
+    scores: Dict[str, float] = {}
+    for ids, weight in rankings:
+        if weight <= 0:
+            continue
+        for rank, doc_id in enumerate(ids, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def build_where(repository_url: Optional[str] = None, languages: Optional[List[str]] = None) -> Optional[dict]:
+    """
+    저장소/언어 필터를 Chroma where 조건으로 변환합니다.
+
+    Args:
+        repository_url: 저장소 URL 필터
+        languages: 언어 필터
+
+    Returns:
+        Optional[dict]: where 조건 (필터가 없으면 None)
+    """
+    conditions = []
+    if repository_url:
+        conditions.append({"repository_url": repository_url})
+    if languages:
+        conditions.append({"language": {"$in": list(languages)}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+class HybridSearcher:
+    def __init__(
+        self,
+        embedder: DocumentEmbedder,
+        rrf_k: int = 60,
+        candidate_multiplier: int = 4,
+        result_cache: Optional[QueryResultCache] = None
+    ):
+        """
+        BM25 검색과 벡터 검색을 동시에 실행하고 RRF로 결과를 합치는 하이브리드 검색기를 초기화합니다.
+        두 검색은 문서 ID만 반환하며, 최종 top_k 문서의 본문만 벡터 저장소에서 한 번에 가져옵니다.
+        저장소/언어 필터는 BM25 색인과 Chroma 내부에서 적용됩니다.
+
+        Args:
+            embedder: 검색할 컬렉션(저장소별 컬렉션 포함)을 가진 DocumentEmbedder
+            rrf_k: RRF 상수
+            candidate_multiplier: 각 검색에서 top_k의 몇 배까지 후보를 가져올지
+            result_cache: 검색 결과(ID, 점수) 캐시. 컬렉션에 쓰기가 발생하면 자동으로 무효화됩니다.
+        """
+        self.embedder = embedder
+        self.rrf_k = rrf_k
+        self.candidate_multiplier = candidate_multiplier
+        self.result_cache = result_cache
+        if result_cache is not None:
+            embedder.add_write_listener(result_cache.invalidate)
+        # 검색마다 스레드를 만들지 않도록 풀을 재사용
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+
+    def _targets(self, repository_url: Optional[str]) -> List[DocumentEmbedder]:
+        """검색할 컬렉션 목록을 반환합니다. 저장소별 컬렉션이면 해당 저장소의 컬렉션만 검색합니다."""
+        if not self.embedder.collection_per_repository:
+            return [self.embedder]
+        if repository_url:
+            target = self.embedder.for_repository(repository_url, create=False)
+            return [target] if target is not None else []
+        return self.embedder.list_repository_embedders()
+
+    def _lexical_ids(
+        self,
+        targets: List[DocumentEmbedder],
+        query: str,
+        k: int,
+        repository_url: Optional[str],
+        languages: Optional[List[str]]
+    ) -> List[List[str]]:
+        """컬렉션별 BM25 검색 결과 ID를 순위대로 반환합니다."""
+        return [
+            [
+                doc_id for doc_id, _ in target.lexical_index.search(
+                    query, k=k, repository_url=repository_url, languages=languages
+                )
+            ]
+            for target in targets
+        ]
+
+    def _dense_ids(
+        self,
+        targets: List[DocumentEmbedder],
+        query: str,
+        k: int,
+        where: Optional[dict]
+    ) -> List[List[str]]:
+        """컬렉션별 벡터 검색 결과 ID를 순위대로 반환합니다. (문서 본문은 읽지 않음)"""
+        embedding = None
+        rankings = []
+        for target in targets:
+            collection = target.vectorstore._collection
+            count = collection.count()
+            if count == 0:
+                rankings.append([])
+                continue
+            if embedding is None:
+                # 모든 컬렉션이 같은 임베딩을 사용하므로 질의는 한 번만 임베딩
+                embedding = self.embedder.embeddings.embed_query(query)
+            result = collection.query(
+                query_embeddings=[embedding],
+                n_results=min(k, count),
+                where=where,
+                include=["distances"]
+            )
+            rankings.append(result["ids"][0])
+        return rankings
+
+    def _fetch_documents(self, target: DocumentEmbedder, ids: List[str]) -> Dict[str, Document]:
+        """ID 목록의 문서 본문과 메타데이터를 가져옵니다."""
+        if not ids:
+            return {}
+        records = target.vectorstore.get(ids=ids, include=["documents", "metadatas"])
+        return {
+            doc_id: Document(id=doc_id, page_content=text or "", metadata=metadata or {})
+            for doc_id, text, metadata in zip(records["ids"], records["documents"], records["metadatas"])
+        }
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        lexical_weight: float = 0.5,
+        dense_weight: float = 0.5,
+        candidate_k: Optional[int] = None,
+        repository_url: Optional[str] = None,
+        languages: Optional[List[str]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        하이브리드 검색을 수행합니다. 가중치가 0인 검색은 실행하지 않습니다.
+
+        Args:
+            query: 검색 질의
+            top_k: 반환할 문서 수
+            lexical_weight: BM25 결과 가중치
+            dense_weight: 벡터 검색 결과 가중치
+            candidate_k: 각 검색에서 가져올 후보 수 (None인 경우 top_k * candidate_multiplier)
+            repository_url: 이 저장소의 청크만 검색 (None인 경우 전체)
+            languages: 이 언어들의 청크만 검색 (예: ['python', 'markdown'], 대소문자 구분 없음)
+
+        Returns:
+            List[Tuple[Document, float]]: (문서, RRF 점수) 목록
+        """
+        if top_k <= 0:
+            return []
+        if languages:
+            # 청크에는 소문자 언어 키(로더의 lang.lower())로 저장되므로 'PYTHON' 등 표시용 이름도 같은 키로 변환
+            languages = sorted({lang.strip().lower() for lang in languages if lang and lang.strip()}) or None
+        targets = self._targets(repository_url)
+        if not targets:
+            return []
+        candidate_k = candidate_k or top_k * self.candidate_multiplier
+        targets_by_name = {target.collection_name: target for target in targets}
+
+        cache_key = generations = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(
+                query,
+                top_k=top_k,
+                lexical_weight=lexical_weight,
+                dense_weight=dense_weight,
+                candidate_k=candidate_k,
+                repository_url=repository_url,
+                languages=languages
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return self._load_results(cached, targets_by_name)
+            collections = list(targets_by_name)
+            if self.embedder.collection_per_repository and not repository_url:
+                # 새 저장소 컬렉션이 생기면 전체 검색 결과가 달라지므로 모든 컬렉션 변경에 의존
+                collections.append(ALL_COLLECTIONS)
+            generations = self.result_cache.snapshot(collections)
+
+        where = build_where(repository_url, languages)
+
+        futures = []
+        if lexical_weight > 0:
+            futures.append((
+                self._executor.submit(self._lexical_ids, targets, query, candidate_k, repository_url, languages),
+                lexical_weight
+            ))
+        if dense_weight > 0:
+            futures.append((
+                self._executor.submit(self._dense_ids, targets, query, candidate_k, where),
+                dense_weight
+            ))
+
+        rankings = []
+        owners: Dict[str, DocumentEmbedder] = {}
+        for future, weight in futures:
+            for target, ids in zip(targets, future.result()):
+                rankings.append((ids, weight))
+                for doc_id in ids:
+                    owners.setdefault(doc_id, target)
+        fused = reciprocal_rank_fusion(rankings, rrf_k=self.rrf_k)[:top_k]
+        results = [(doc_id, score, owners[doc_id].collection_name) for doc_id, score in fused]
+
+        if cache_key is not None:
+            self.result_cache.put(cache_key, results, generations)
+        return self._load_results(results, targets_by_name)
+
+    def _load_results(
+        self,
+        results: List[Tuple[str, float, str]],
+        targets_by_name: Dict[str, DocumentEmbedder]
+    ) -> List[Tuple[Document, float]]:
+        """(ID, 점수, 컬렉션) 목록의 문서를 컬렉션별로 한 번씩 조회하여 순서대로 반환합니다."""
+        ids_by_collection: Dict[str, List[str]] = {}
+        for doc_id, _, collection_name in results:
+            ids_by_collection.setdefault(collection_name, []).append(doc_id)
+        documents: Dict[str, Document] = {}
+        for collection_name, ids in ids_by_collection.items():
+            target = targets_by_name.get(collection_name)
+            if target is not None:
+                documents.update(self._fetch_documents(target, ids))
+        return [(documents[doc_id], score) for doc_id, score, _ in results if doc_id in documents]
@@ -0,0 +1,88 @@
+from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+import json
+import os
+import threading
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class IndexStateStore:
+    def __init__(self, state_path: str):
+        """
+        저장소 URL별 마지막 인덱싱 상태(커밋 SHA 등)를 JSON 파일로 관리하는 클래스를 초기화합니다.
+
+        Args:
+            state_path: 상태를 저장할 JSON 파일 경로
+        """
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """저장된 상태 파일을 읽어옵니다. 파일이 없거나 손상된 경우 빈 상태를 반환합니다."""
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"인덱스 상태 파일을 읽을 수 없어 초기화합니다 ({self.state_path}): {str(e)}")
+            return {}
+
+    def _save(self) -> None:
+        """임시 파일에 쓴 뒤 교체하여 상태 파일이 깨지지 않도록 저장합니다."""
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def get(self, repo_url: str) -> Optional[Dict[str, Any]]:
+        """
+        저장소의 인덱싱 상태를 반환합니다.
+
+        Args:
+            repo_url: 저장소 URL
+
+        Returns:
+            상태 딕셔너리 또는 인덱싱된 적이 없으면 None
+        """
+        with self._lock:
+            state = self._state.get(repo_url)
+            return dict(state) if state else None
+
+    def update(self, repo_url: str, **fields: Any) -> None:
+        """
+        저장소의 인덱싱 상태를 갱신하고 파일에 저장합니다.
+
+        Args:
+            repo_url: 저장소 URL
+            fields: 갱신할 항목 (예: commit, local_path)
+        """
+        with self._lock:
+            state = self._state.setdefault(repo_url, {})
+            state.update(fields)
+            state["indexed_at"] = datetime.now(timezone.utc).isoformat()
+            self._save()
+
+    def remove(self, repo_url: str) -> None:
+        """
+        저장소의 인덱싱 상태를 삭제합니다.
+
+        Args:
+            repo_url: 저장소 URL
+        """
+        with self._lock:
+            if self._state.pop(repo_url, None) is not None:
+                self._save()
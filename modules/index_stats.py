@@ -0,0 +1,172 @@
+from typing import Any, Dict, Iterable, Optional
+import json
+import os
+import threading
+import time
+import logging
+import sys
+
+from langchain_core.documents import Document
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _empty_counters() -> Dict[str, int]:
+    return {"files": 0, "chunks": 0, "bytes": 0}
+
+
+class IndexStatsStore:
+    def __init__(self, stats_path: str, flush_interval: float = 30.0):
+        """
+        저장소/언어별 파일 수, 청크 수, 청크 크기와 임베딩 토큰 사용량을
+        청크 추가/삭제 시점에 갱신하여 JSON 파일로 관리하는 클래스를 초기화합니다.
+        (통계를 위해 벡터 저장소 전체를 읽지 않음)
+
+        카운터는 메모리에서 갱신하고 파일에는 flush() 호출 시점(스트림/삭제 작업 종료)이나
+        마지막 저장 후 flush_interval초가 지난 뒤의 갱신 시점에만 저장합니다.
+
+        Args:
+            stats_path: 통계를 저장할 JSON 파일 경로
+            flush_interval: 변경된 통계를 자동으로 저장할 최소 간격 (초)
+        """
+        self.stats_path = stats_path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = self._load()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _load(self) -> Dict[str, Any]:
+        """저장된 통계 파일을 읽어옵니다. 파일이 없거나 손상된 경우 빈 통계를 반환합니다."""
+        stats = {"repositories": {}, "embedding_tokens": 0}
+        if not os.path.exists(self.stats_path):
+            return stats
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                stats.update(json.load(f))
+        except Exception as e:
+            logger.warning(f"인덱스 통계 파일을 읽을 수 없어 초기화합니다 ({self.stats_path}): {str(e)}")
+        return stats
+
+    def _save(self) -> None:
+        """임시 파일에 쓴 뒤 교체하여 통계 파일이 깨지지 않도록 저장합니다."""
+        directory = os.path.dirname(self.stats_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.stats_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._stats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.stats_path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _mark_changed(self) -> None:
+        """변경을 기록하고 마지막 저장 후 flush_interval이 지났으면 저장합니다. (잠금을 가진 상태에서 호출)"""
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.flush_interval:
+            self._save()
+
+    def flush(self) -> None:
+        """메모리에서 변경된 통계를 파일에 저장합니다."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _repository(self, repository_url: str) -> Dict[str, Any]:
+        repository = self._stats["repositories"].setdefault(repository_url, _empty_counters())
+        repository.setdefault("languages", {})
+        return repository
+
+    def record_chunks(self, metadatas: Iterable[Optional[Dict[str, Any]]], sign: int = 1) -> None:
+        """
+        추가(sign=1) 또는 삭제(sign=-1)된 청크를 저장소/언어별 청크 수와 크기에 반영합니다.
+
+        Args:
+            metadatas: 청크 메타데이터 목록 (repository_url, language, bytes 사용)
+            sign: 1이면 추가, -1이면 삭제
+        """
+        with self._lock:
+            changed = False
+            for metadata in metadatas:
+                metadata = metadata or {}
+                repository = self._repository(metadata.get("repository_url") or "")
+                language = repository["languages"].setdefault(metadata.get("language") or "unknown", _empty_counters())
+                size = int(metadata.get("bytes") or 0)
+                for counters in (repository, language):
+                    counters["chunks"] = max(0, counters["chunks"] + sign)
+                    counters["bytes"] = max(0, counters["bytes"] + sign * size)
+                changed = True
+            if changed:
+                self._mark_changed()
+
+    def record_documents(self, documents: Iterable[Document], sign: int = 1) -> None:
+        """청크 문서 목록을 통계에 반영합니다. (record_chunks 참고)"""
+        self.record_chunks(
+            ({**doc.metadata, "bytes": len(doc.page_content.encode('utf-8'))} for doc in documents),
+            sign
+        )
+
+    def set_repository_files(self, repository_url: str, files_by_language: Dict[str, int]) -> None:
+        """
+        저장소의 인덱싱된 파일 수를 언어별로 설정합니다.
+
+        Args:
+            repository_url: 저장소 URL
+            files_by_language: 언어 → 파일 수
+        """
+        with self._lock:
+            repository = self._repository(repository_url)
+            for language in repository["languages"].values():
+                language["files"] = 0
+            for language_name, count in files_by_language.items():
+                repository["languages"].setdefault(language_name, _empty_counters())["files"] = count
+            repository["files"] = sum(files_by_language.values())
+            self._mark_changed()
+
+    def add_repository_files(self, repository_url: str, delta_by_language: Dict[str, int]) -> None:
+        """
+        저장소의 언어별 인덱싱된 파일 수를 증감합니다. (증분 인덱싱에서 변경/삭제된 파일만 반영)
+
+        Args:
+            repository_url: 저장소 URL
+            delta_by_language: 언어 → 파일 수 증감
+        """
+        with self._lock:
+            repository = self._repository(repository_url)
+            for language_name, delta in delta_by_language.items():
+                language = repository["languages"].setdefault(language_name, _empty_counters())
+                language["files"] = max(0, language["files"] + delta)
+            repository["files"] = sum(language["files"] for language in repository["languages"].values())
+            self._mark_changed()
+
+    def add_embedding_tokens(self, tokens: int) -> None:
+        """임베딩 모델에 보낸 토큰 수를 누적합니다."""
+        if tokens <= 0:
+            return
+        with self._lock:
+            self._stats["embedding_tokens"] += tokens
+            self._mark_changed()
+
+    def remove_repository(self, repository_url: str) -> None:
+        """저장소의 통계를 삭제합니다."""
+        with self._lock:
+            if self._stats["repositories"].pop(repository_url, None) is not None:
+                self._save()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 통계와 저장소 합계를 반환합니다."""
+        with self._lock:
+            stats = json.loads(json.dumps(self._stats))
+        repositories = stats["repositories"]
+        stats["totals"] = {
+            key: sum(repository.get(key, 0) for repository in repositories.values())
+            for key in ("files", "chunks", "bytes")
+        }
+        stats["totals"]["repositories"] = len(repositories)
+        return stats
@@ -0,0 +1,194 @@
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+import threading
+import traceback
+import uuid
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class IngestionCancelled(Exception):
+    """인덱싱 작업이 취소되었을 때 발생하는 예외입니다."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class IngestionJob:
+    def __init__(self, repo_url: str):
+        """
+        저장소 인덱싱 작업 하나의 상태와 진행 상황을 보관합니다.
+
+        Args:
+            repo_url: 인덱싱할 저장소 URL
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.repo_url = repo_url
+        self.status = "queued"
+        self.stage = "queued"
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def update_progress(self, stage: str, **progress: Any) -> None:
+        """
+        작업 단계와 진행 상황을 갱신합니다. (인덱싱 함수의 progress_callback)
+
+        Args:
+            stage: 현재 단계 (예: cloning, indexing)
+            progress: 갱신할 진행 항목 (예: files_parsed, chunks_processed)
+        """
+        with self._lock:
+            self.stage = stage
+            self.progress.update(progress)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """작업 상태를 딕셔너리로 반환합니다. (분석 결과는 포함하지 않음)"""
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "repo_url": self.repo_url,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": dict(self.progress),
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at
+            }
+
+
+class IngestionJobManager:
+    def __init__(
+        self,
+        ingest_fn: Callable[..., Dict[str, Any]],
+        max_workers: int = 1,
+        max_finished_jobs: int = 100
+    ):
+        """
+        저장소 인덱싱을 이벤트 루프 밖의 작업 풀에서 실행하는 작업 큐를 초기화합니다.
+
+        Args:
+            ingest_fn: 인덱싱 함수. (repo_url, progress_callback=, cancel_event=)를 받아 분석 결과를 반환
+            max_workers: 동시에 실행할 인덱싱 작업 수
+            max_finished_jobs: 조회를 위해 보관할 완료된 작업 수 (초과 시 오래된 작업부터 삭제)
+        """
+        self.ingest_fn = ingest_fn
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion")
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, repo_url: str) -> IngestionJob:
+        """
+        인덱싱 작업을 등록합니다. 같은 저장소의 작업이 이미 대기/실행 중이면 그 작업을 반환합니다.
+
+        Args:
+            repo_url: 인덱싱할 저장소 URL
+
+        Returns:
+            IngestionJob: 등록된 작업
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                # 같은 저장소를 동시에 인덱싱하면 클론 디렉토리를 함께 사용하므로 작업을 합침
+                if job.repo_url == repo_url and job.status in ACTIVE_STATUSES:
+                    return job
+            job = IngestionJob(repo_url)
+            self._jobs[job.job_id] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job)
+        logger.info(f"인덱싱 작업 등록: {job.job_id} ({repo_url})")
+        return job
+
+    def _run(self, job: IngestionJob) -> None:
+        """작업을 실행하고 결과/오류를 기록합니다."""
+        if job.cancel_event.is_set():
+            self._finish(job, "cancelled")
+            return
+        with job._lock:
+            job.status = "running"
+            job.started_at = _now()
+        try:
+            result = self.ingest_fn(
+                job.repo_url,
+                progress_callback=job.update_progress,
+                cancel_event=job.cancel_event
+            )
+            job.result = result
+            self._finish(job, "succeeded")
+        except IngestionCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            logger.error(f"인덱싱 작업 실패: {job.job_id} ({job.repo_url}): {str(e)}")
+            logger.debug(traceback.format_exc())
+            job.error = str(e)
+            self._finish(job, "failed")
+
+    def _finish(self, job: IngestionJob, status: str) -> None:
+        with job._lock:
+            job.status = status
+            job.stage = status
+            job.finished_at = _now()
+        logger.info(f"인덱싱 작업 종료: {job.job_id} ({status})")
+
+    def _prune(self) -> None:
+        """보관 개수를 넘은 완료된 작업을 오래된 순서로 삭제합니다."""
+        finished = [job for job in self._jobs.values() if job.status not in ACTIVE_STATUSES]
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job.job_id]
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """작업 ID로 작업을 조회합니다."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[IngestionJob]:
+        """보관 중인 작업을 등록 순서대로 반환합니다."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        작업 취소를 요청합니다. 실행 중인 작업은 다음 파일/청크 처리 시점에 중단됩니다.
+
+        Args:
+            job_id: 취소할 작업 ID
+
+        Returns:
+            bool: 취소 요청을 받은 경우 True (없거나 이미 끝난 작업이면 False)
+        """
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return False
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # 아직 시작하지 않은 작업은 바로 취소
+            self._finish(job, "cancelled")
+        return True
+
+    def shutdown(self, cancel_running: bool = True) -> None:
+        """작업 풀을 종료합니다."""
+        if cancel_running:
+            for job in self.list_jobs():
+                if job.status in ACTIVE_STATUSES:
+                    job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
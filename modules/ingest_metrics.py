@@ -0,0 +1,235 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from contextlib import contextmanager
+import threading
+import time
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 단계별로 누적하는 항목
+STAGE_COUNTERS = ("files", "bytes", "chunks", "tokens", "errors")
+
+
+class IngestionMetrics:
+    def __init__(self, max_events: int = 1000, on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        저장소 인덱싱의 단계별(clone, scan, load, split, embed, cleanup) 지표를 수집하는 클래스를 초기화합니다.
+        단계마다 실행 시간(wall), 스레드 CPU 시간과 파일/바이트/청크/토큰/오류 수를 누적하고,
+        단계 실행 구간을 span 형태의 이벤트로 기록합니다.
+
+        스트리밍으로 연결된 단계(load → split)는 중첩된 단계에서 보낸 시간을 빼고 단계 자체의 시간만 누적합니다.
+        (프로세스 풀 작업자의 CPU 시간은 포함되지 않으며 결과를 기다린 시간은 wall 시간에 포함됨)
+
+        Args:
+            max_events: 보관할 최대 이벤트 수 (넘는 이벤트는 개수만 셈)
+            on_event: 이벤트가 기록될 때마다 호출할 함수
+        """
+        self.max_events = max_events
+        self.on_event = on_event
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.dropped_events = 0
+
+    def _get_stage(self, name: str) -> Dict[str, float]:
+        if name not in self.stages:
+            self.stages[name] = {"wall_seconds": 0.0, "cpu_seconds": 0.0, **{key: 0 for key in STAGE_COUNTERS}}
+        return self.stages[name]
+
+    def add(self, stage: str, **counters: float) -> None:
+        """
+        단계의 항목을 누적합니다.
+
+        Args:
+            stage: 단계 이름
+            counters: files, bytes, chunks, tokens, errors 증가량
+        """
+        with self._lock:
+            stats = self._get_stage(stage)
+            for key, value in counters.items():
+                stats[key] = stats.get(key, 0) + value
+
+    def _push(self) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # [중첩 단계의 wall 시간, 중첩 단계의 CPU 시간]
+        stack.append([0.0, 0.0])
+
+    def _pop(self, stage: str, wall: float, cpu: float) -> None:
+        """측정 구간을 닫고 중첩 단계 시간을 뺀 시간을 단계에 누적합니다."""
+        stack = self._local.stack
+        child_wall, child_cpu = stack.pop()
+        if stack:
+            stack[-1][0] += wall
+            stack[-1][1] += cpu
+        with self._lock:
+            stats = self._get_stage(stage)
+            stats["wall_seconds"] += wall - child_wall
+            stats["cpu_seconds"] += cpu - child_cpu
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            else:
+                self.dropped_events += 1
+        logger.debug(f"인덱싱 단계 완료: {event}")
+        if self.on_event:
+            self.on_event(event)
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any):
+        """
+        with 블록을 단계 실행 구간으로 측정합니다. 예외가 발생하면 오류 수를 늘리고 이벤트에 기록합니다.
+
+        Args:
+            name: 단계 이름
+            attributes: 이벤트에 함께 기록할 속성
+        """
+        start_time = time.time()
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        self._push()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self.add(name, errors=1)
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            self._pop(name, wall, cpu)
+            self._emit({
+                "name": name,
+                "start": start_time,
+                "duration_seconds": round(wall, 6),
+                "cpu_seconds": round(cpu, 6),
+                "attributes": attributes,
+                "error": error
+            })
+
+    def iterate(
+        self,
+        iterable: Iterable,
+        name: str,
+        on_item: Optional[Callable[[Any], None]] = None
+    ) -> Iterator:
+        """
+        스트림의 다음 항목을 만드는 데 걸린 시간을 단계 시간으로 누적하며 항목을 그대로 전달합니다.
+        스트림이 끝나거나 중단되면 단계 전체를 이벤트 하나로 기록합니다.
+
+        Args:
+            iterable: 측정할 스트림
+            name: 단계 이름
+            on_item: 항목마다 호출할 함수 (청크/토큰 수 누적 등)
+        """
+        iterator = iter(iterable)
+        start_time = time.time()
+        total_wall = total_cpu = 0.0
+        items = 0
+        try:
+            while True:
+                wall_start, cpu_start = time.perf_counter(), time.thread_time()
+                self._push()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                except Exception:
+                    self.add(name, errors=1)
+                    raise
+                finally:
+                    wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+                    self._pop(name, wall, cpu)
+                    total_wall += wall
+                    total_cpu += cpu
+                items += 1
+                if on_item:
+                    on_item(item)
+                yield item
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+            self._emit({
+                "name": name,
+                "start": start_time,
+                "duration_seconds": round(total_wall, 6),
+                "cpu_seconds": round(total_cpu, 6),
+                "attributes": {"items": items},
+                "error": None
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        단계별 누적 지표와 이벤트 목록을 반환합니다.
+
+        Returns:
+            Dict: total_wall_seconds, stages(단계별 지표), events, dropped_events
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    key: round(value, 6) if isinstance(value, float) else value
+                    for key, value in stats.items()
+                }
+                for name, stats in self.stages.items()
+            }
+            return {
+                "started_at": self.started_at,
+                "total_wall_seconds": round(time.perf_counter() - self._started, 6),
+                "stages": stages,
+                "events": list(self.events),
+                "dropped_events": self.dropped_events
+            }
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, max_records: int = 20, interval: float = 10.0, max_level: int = logging.WARNING):
+        """
+        같은 위치(파일, 줄)에서 발생하는 로그를 구간마다 일정 개수로 제한하는 필터를 초기화합니다.
+        파일마다 반복되는 로그가 인덱싱 시간을 차지하지 않도록 로더 등에 사용합니다.
+        생략된 로그 수는 다음 구간의 첫 로그에 덧붙입니다.
+
+        Args:
+            max_records: 구간당 위치별 최대 로그 수
+            interval: 구간 길이 (초)
+            max_level: 이 수준 이하의 로그만 제한 (ERROR 이상은 항상 출력)
+        """
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self.max_level = max_level
+        self._lock = threading.Lock()
+        # (파일, 줄) → [구간 시작 시각, 구간 내 로그 수, 생략된 로그 수]
+        self._windows: Dict[tuple, List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = int(window[2]) if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (이전 구간에서 같은 로그 {suppressed}개 생략)"
+                    record.args = None
+                return True
+            if window[1] < self.max_records:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
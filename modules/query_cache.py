@@ -0,0 +1,203 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 모든 컬렉션의 변경에 의존하는 결과 (예: 저장소 필터 없이 저장소별 컬렉션 전체 검색)
+ALL_COLLECTIONS = "*"
+
+
+def normalize_query(query: str) -> str:
+    """대소문자와 공백 차이가 캐시 키에 영향을 주지 않도록 질의를 정규화합니다."""
+    return " ".join(query.casefold().split())
+
+
+class QueryResultCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        cache_path: Optional[str] = None
+    ):
+        """
+        검색 결과(문서 ID, 점수)를 캐시하는 LRU + TTL 캐시를 초기화합니다.
+        결과는 검색한 컬렉션의 세대(generation)와 함께 저장되며, 컬렉션에 쓰기가 발생하면
+        세대가 올라가 해당 컬렉션을 검색한 결과만 무효화됩니다.
+
+        Args:
+            max_entries: 메모리에 보관할 최대 결과 수
+            ttl_seconds: 결과 유효 시간 (초)
+            cache_path: 디스크 캐시 SQLite 파일 경로 (None인 경우 메모리에만 보관)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, int], Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+        self._conn = None
+        if cache_path:
+            directory = os.path.dirname(cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, generations TEXT NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations (collection TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, **params: Any) -> str:
+        """
+        정규화된 질의와 검색 조건(필터, top_k, 가중치 등)으로 캐시 키를 생성합니다.
+
+        Args:
+            query: 검색 질의
+            params: 결과에 영향을 주는 검색 조건
+
+        Returns:
+            str: 캐시 키
+        """
+        payload = json.dumps([normalize_query(query), params], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _generation(self, collection: str) -> int:
+        if self._conn is None:
+            return self._generations.get(collection, 0)
+        row = self._conn.execute(
+            "SELECT generation FROM generations WHERE collection = ?", (collection,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _is_valid(self, created: float, generations: Dict[str, int]) -> bool:
+        if time.time() - created > self.ttl_seconds:
+            return False
+        return all(self._generation(collection) == generation for collection, generation in generations.items())
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        유효한 캐시 결과를 반환합니다. 만료되었거나 무효화된 결과는 삭제합니다.
+
+        Args:
+            key: make_key로 생성한 캐시 키
+
+        Returns:
+            캐시된 결과 또는 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT created, generations, value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], json.loads(row[1]), json.loads(row[2]))
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            created, generations, value = entry
+            if not self._is_valid(created, generations):
+                self._entries.pop(key, None)
+                if self._conn is not None:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _remember(self, key: str, entry: Tuple[float, Dict[str, int], Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self, collections: Iterable[str]) -> Dict[str, int]:
+        """
+        컬렉션들의 현재 세대를 반환합니다. 검색 시작 전에 호출하여 put에 전달합니다.
+        (검색 도중 쓰기가 발생한 결과가 최신 결과로 저장되지 않도록 함)
+
+        Args:
+            collections: 검색할 컬렉션 이름 목록
+        """
+        with self._lock:
+            return {collection: self._generation(collection) for collection in collections}
+
+    def put(self, key: str, value: Any, generations: Dict[str, int]) -> None:
+        """
+        결과를 캐시에 저장합니다.
+
+        Args:
+            key: make_key로 생성한 캐시 키
+            value: JSON으로 저장 가능한 결과 (예: [(문서 ID, 점수, 컬렉션)] 목록)
+            generations: 검색 시작 전에 snapshot으로 얻은 컬렉션 세대
+        """
+        with self._lock:
+            entry = (time.time(), generations, value)
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, created, generations, value) VALUES (?, ?, ?, ?)",
+                    (key, entry[0], json.dumps(generations), json.dumps(value))
+                )
+                # 만료된 결과 정리
+                self._conn.execute("DELETE FROM results WHERE created < ?", (entry[0] - self.ttl_seconds,))
+                self._conn.commit()
+
+    def invalidate(self, collection: str) -> None:
+        """
+        컬렉션의 세대를 올려 해당 컬렉션을 검색한 결과를 모두 무효화합니다.
+        (DocumentEmbedder 쓰기 리스너로 등록하여 사용)
+
+        Args:
+            collection: 변경된 컬렉션 이름
+        """
+        with self._lock:
+            for name in (collection, ALL_COLLECTIONS):
+                if self._conn is None:
+                    self._generations[name] = self._generations.get(name, 0) + 1
+                else:
+                    self._conn.execute(
+                        "INSERT INTO generations (collection, generation) VALUES (?, 1) "
+                        "ON CONFLICT(collection) DO UPDATE SET generation = generation + 1",
+                        (name,)
+                    )
+            if self._conn is not None:
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 횟수와 현재 크기를 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds
+            }
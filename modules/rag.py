@@ -1,12 +1,27 @@
-from typing import List
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+import hashlib
 import os
-from langchain_openai import OpenAIEmbeddings
+import queue
+import random
+import threading
+import shutil
+import time
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 import logging
 from dotenv import load_dotenv
 import sys
 
+from modules.bm25_index import BM25Index
+from modules.embedding_cache import CachedEmbeddings
+from modules.index_stats import IndexStatsStore
+from modules.ingest_metrics import IngestionMetrics
+from modules.embedding_backends import BACKEND_DEFAULTS, create_embeddings, validate_backend_config
+from modules.token_counter import get_token_counter
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -15,56 +30,834 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _normalize_content(content: str) -> str:
+    """줄바꿈과 줄 끝 공백 차이가 ID에 영향을 주지 않도록 청크 내용을 정규화합니다."""
+    lines = content.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+def estimate_tokens(texts: Iterable[str]) -> int:
+    """텍스트의 토큰 수 합계를 임베딩 모델과 같은 인코딩으로 계산합니다. (tiktoken이 없으면 근사치)"""
+    return sum(get_token_counter().count_batch(texts))
+
+def compute_chunk_id(document: Document) -> str:
+    """
+    정규화된 청크 내용과 출처 경로로 결정적인 청크 ID를 계산합니다.
+
+    Args:
+        document: ID를 계산할 청크
+
+    Returns:
+        str: SHA-256 기반 청크 ID
+    """
+    metadata = document.metadata
+    if "path" in metadata:
+        source = f"{metadata.get('repository_url', '')}\0{metadata['path']}"
+    else:
+        source = str(metadata.get("source", ""))
+    digest = hashlib.sha256()
+    digest.update(source.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(_normalize_content(document.page_content).encode('utf-8'))
+    return digest.hexdigest()
+
+class _AdaptiveConcurrencyLimiter:
+    def __init__(self, max_limit: int):
+        """
+        동시 요청 수를 제한하고 429 응답에 따라 한도를 조절하는 리미터를 초기화합니다.
+        429 발생 시 한도를 절반으로 줄이고 모든 요청을 잠시 멈추며, 성공이 이어지면 한도를 1씩 늘립니다.
+
+        Args:
+            max_limit: 최대 동시 요청 수
+        """
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """요청 슬롯을 얻을 때까지 대기합니다."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait()
+
+    def release(self, success: bool, rate_limited: bool = False, backoff: float = 0.0) -> None:
+        """
+        요청 슬롯을 반환하고 결과에 따라 동시 요청 한도를 조절합니다.
+
+        Args:
+            success: 요청 성공 여부
+            rate_limited: 429 응답 여부
+            backoff: 429 응답 시 모든 요청을 멈출 시간 (초)
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if rate_limited:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+            elif success:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def _get_status_code(error: Exception) -> Optional[int]:
+    """임베딩 API 예외에서 HTTP 상태 코드를 추출합니다."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and getattr(error, "response", None) is not None:
+        status_code = getattr(error.response, "status_code", None)
+    return status_code
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    """429 응답의 Retry-After 헤더 값을 초 단위로 반환합니다."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingScheduler:
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_batch_tokens: Optional[int] = None
+    ):
+        """
+        텍스트를 배치로 나누어 여러 임베딩 요청을 동시에 보내는 스케줄러를 초기화합니다.
+        429 응답 시 동시 요청 수를 줄이고 지수 백오프로 배치 단위 재시도합니다.
+
+        Args:
+            embeddings: 배치 임베딩에 사용할 임베딩 객체
+            batch_size: 요청 한 번에 보낼 최대 텍스트 수
+            max_batch_tokens: 요청 한 번에 보낼 최대 토큰 수 (None인 경우 텍스트 수로만 배치 구성)
+            max_concurrency: 최대 동시 요청 수
+            max_retries: 배치별 최대 재시도 횟수
+            initial_backoff: 첫 재시도 대기 시간 (초)
+            max_backoff: 최대 재시도 대기 시간 (초)
+        """
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self._limiter = _AdaptiveConcurrencyLimiter(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embedding")
+        self._progress_lock = threading.Lock()
+        self.progress = {
+            "batches_completed": 0,
+            "texts_embedded": 0,
+            "tokens_embedded": 0,
+            "retries": 0,
+            "rate_limited": 0
+        }
+
+    def _update_progress(self, **deltas: int) -> None:
+        with self._progress_lock:
+            for key, delta in deltas.items():
+                self.progress[key] += delta
+
+    def _backoff(self, attempt: int) -> float:
+        """지터가 포함된 지수 백오프 대기 시간을 계산합니다."""
+        delay = min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _embed_batch(self, texts: List[str], cancelled: threading.Event) -> List[List[float]]:
+        """배치 하나를 임베딩합니다. 429/5xx/연결 오류는 배치 단위로 재시도합니다."""
+        attempt = 0
+        while True:
+            if cancelled.is_set():
+                raise RuntimeError("다른 배치가 실패하여 임베딩 요청을 취소했습니다.")
+            self._limiter.acquire()
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                status_code = _get_status_code(e)
+                rate_limited = status_code == 429 or type(e).__name__ == "RateLimitError"
+                retryable = (
+                    rate_limited
+                    or (status_code is not None and status_code >= 500)
+                    or type(e).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError")
+                )
+                delay = (_get_retry_after(e) if rate_limited else None) or self._backoff(attempt)
+                self._limiter.release(success=False, rate_limited=rate_limited, backoff=delay)
+
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._update_progress(retries=1, rate_limited=int(rate_limited))
+                logger.warning(
+                    f"임베딩 배치 요청 실패 (status: {status_code}), {delay:.1f}초 후 재시도 "
+                    f"({attempt}/{self.max_retries}, 동시 요청 한도: {self._limiter.limit})"
+                )
+                if not rate_limited:
+                    # 429는 리미터가 모든 요청을 멈추므로 여기서는 다른 오류만 대기
+                    cancelled.wait(delay)
+                continue
+
+            self._limiter.release(success=True)
+            return vectors
+
+    def _plan_batches(self, texts: List[str], token_counts: Optional[List[int]]) -> List[Tuple[int, int, int]]:
+        """
+        텍스트 수 한도와 토큰 수 한도를 모두 지키는 배치 구간을 만듭니다.
+        토큰 한도를 넘는 텍스트 하나는 단독 배치로 보냅니다.
+
+        Returns:
+            List[Tuple[int, int, int]]: (시작 인덱스, 끝 인덱스, 배치 토큰 수) 목록
+        """
+        if self.max_batch_tokens is None and token_counts is None:
+            return [
+                (start, min(start + self.batch_size, len(texts)), 0)
+                for start in range(0, len(texts), self.batch_size)
+            ]
+        if token_counts is None:
+            token_counts = get_token_counter().count_batch(texts)
+
+        batches = []
+        start, batch_tokens = 0, 0
+        for index, token_count in enumerate(token_counts):
+            if index > start and (
+                index - start >= self.batch_size
+                or (self.max_batch_tokens is not None and batch_tokens + token_count > self.max_batch_tokens)
+            ):
+                batches.append((start, index, batch_tokens))
+                start, batch_tokens = index, 0
+            batch_tokens += token_count
+        if start < len(texts):
+            batches.append((start, len(texts), batch_tokens))
+        return batches
+
+    def embed(
+        self,
+        texts: List[str],
+        on_batch_done: Optional[Callable[[int, List[List[float]]], None]] = None,
+        token_counts: Optional[List[int]] = None
+    ) -> List[List[float]]:
+        """
+        텍스트 목록을 배치로 나누어 동시에 임베딩합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+            on_batch_done: 배치가 끝날 때마다 (시작 인덱스, 벡터 목록)으로 호출되는 콜백.
+                완료된 배치를 즉시 저장하면 중간에 실패해도 완료된 배치는 보존됩니다.
+            token_counts: 텍스트별 토큰 수 (청크의 token_count 메타데이터 등).
+                max_batch_tokens가 설정되어 있고 None인 경우 직접 계산합니다.
+
+        Returns:
+            List[List[float]]: 입력 순서와 같은 임베딩 벡터 목록
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        cancelled = threading.Event()
+        batches = self._plan_batches(texts, token_counts)
+        futures = {
+            self._executor.submit(self._embed_batch, texts[start:end], cancelled): (start, batch_tokens)
+            for start, end, batch_tokens in batches
+        }
+        try:
+            for future in as_completed(futures):
+                start, batch_tokens = futures[future]
+                vectors = future.result()
+                results[start:start + len(vectors)] = vectors
+                if on_batch_done:
+                    on_batch_done(start, vectors)
+                self._update_progress(batches_completed=1, texts_embedded=len(vectors), tokens_embedded=batch_tokens)
+        except Exception:
+            # 남은 배치는 취소하고 재시도 대기 중인 배치도 중단
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+
+
 class DocumentEmbedder:
     def __init__(
         self,
         persist_directory: str = "chroma_db",
         collection_name: str = "code_documents",
-        embedding_model: str = "text-embedding-3-small"
+        embedding_model: Optional[str] = None,
+        embedding_dimensions: Optional[int] = None,
+        embedding_backend: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        cache_max_bytes: int = 1024 * 1024 * 1024,
+        embedding_base_url: Optional[str] = None,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        collection_per_repository: Optional[bool] = None,
+        max_batch_tokens: Optional[int] = None
     ):
         """
         문서 임베딩 및 벡터 저장을 처리하는 클래스를 초기화합니다.
+
+        Args:
+            persist_directory: 벡터 저장소 디렉토리
+            collection_name: 컬렉션 이름
+            embedding_model: 임베딩 모델 이름 (None인 경우 EMBEDDING_MODEL 또는 백엔드 기본값)
+            embedding_dimensions: 임베딩 차원 수 (None인 경우 백엔드 기본값)
+            embedding_backend: 임베딩 백엔드 ('openai', 'hashing', 'huggingface').
+                None인 경우 EMBEDDING_BACKEND 환경 변수, 없으면 'openai'
+            cache_path: 임베딩 캐시 SQLite 파일 경로 (None인 경우 persist_directory 아래에 생성)
+            cache_max_bytes: 임베딩 캐시 최대 크기 (bytes)
+            embedding_base_url: OpenAI 호환 임베딩 API 주소 (openai 백엔드 전용, None인 경우 OPENAI_BASE_URL 또는 기본 주소)
+            batch_size: 임베딩 요청 한 번에 보낼 청크 수
+            max_concurrency: 최대 동시 임베딩 요청 수
+            max_retries: 배치별 최대 재시도 횟수
+            collection_per_repository: 저장소마다 별도 컬렉션에 저장할지 여부.
+                None인 경우 COLLECTION_PER_REPOSITORY 환경 변수 (기본값: False)
+            max_batch_tokens: 임베딩 요청 한 번에 보낼 최대 토큰 수.
+                None인 경우 EMBEDDING_BATCH_TOKENS 환경 변수 (없으면 청크 수로만 배치 구성)
         """
         load_dotenv()
         
-        if not os.getenv("OPENAI_API_KEY"):
-            raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+        # 설정 확인 (API 키는 원격 백엔드를 사용할 때만 필요)
+        embedding_backend = (embedding_backend or os.getenv("EMBEDDING_BACKEND") or "openai").lower()
+        validate_backend_config(embedding_backend)
+        default_model, default_dimensions = BACKEND_DEFAULTS[embedding_backend]
+        embedding_model = embedding_model or os.getenv("EMBEDDING_MODEL") or default_model
+        embedding_dimensions = embedding_dimensions or default_dimensions
         
-        self.embeddings = OpenAIEmbeddings(
+        base_embeddings = create_embeddings(
+            embedding_backend,
             model=embedding_model,
-            dimensions=1536
+            dimensions=embedding_dimensions,
+            base_url=embedding_base_url
         )
         
+        # 저장소/언어별 청크 수, 크기, 임베딩 토큰 사용량 (컬렉션 전체를 읽지 않고 증분 갱신)
+        self.stats = IndexStatsStore(os.path.join(persist_directory, "index_stats.json"))
+        
+        if embedding_backend == "hashing":
+            # 해싱 임베딩은 캐시 조회보다 계산이 빠르므로 캐시하지 않음
+            self.embeddings = base_embeddings
+        else:
+            # 같은 텍스트는 저장소/재실행에 관계없이 한 번만 임베딩하도록 디스크 캐시 사용
+            self.embeddings = CachedEmbeddings(
+                base_embeddings,
+                model_name=embedding_model,
+                dimensions=embedding_dimensions,
+                cache_path=cache_path or os.path.join(persist_directory, "embedding_cache.sqlite3"),
+                max_size_bytes=cache_max_bytes,
+                on_miss=lambda texts: self.stats.add_embedding_tokens(estimate_tokens(texts))
+            )
+        
         self.vectorstore = Chroma(
             persist_directory=persist_directory,
             embedding_function=self.embeddings,
             collection_name=collection_name
         )
         
+        if max_batch_tokens is None and os.getenv("EMBEDDING_BATCH_TOKENS"):
+            max_batch_tokens = int(os.getenv("EMBEDDING_BATCH_TOKENS"))
+        self.scheduler = EmbeddingScheduler(
+            self.embeddings,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            max_batch_tokens=max_batch_tokens
+        )
+        
+        # 키워드 검색용 BM25 색인 (청크 추가/삭제 시 함께 갱신)
+        self.lexical_index = BM25Index(os.path.join(persist_directory, "bm25", collection_name))
+        if self.lexical_index.is_empty() and self.vectorstore._collection.count() > 0:
+            # 색인 없이 저장된 기존 컬렉션은 한 번만 색인 생성
+            self.lexical_index.build_from_vectorstore(self.vectorstore)
+        
+        self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.embedding_backend = embedding_backend
         self.embedding_model = embedding_model
+        
+        if collection_per_repository is None:
+            collection_per_repository = os.getenv("COLLECTION_PER_REPOSITORY", "").lower() in ("1", "true", "yes")
+        self.collection_per_repository = collection_per_repository
+        # 저장소 URL → 저장소 컬렉션을 사용하는 DocumentEmbedder
+        self._repository_embedders: dict = {}
+        self._repository_lock = threading.Lock()
+        # 컬렉션에 쓰기가 발생하면 컬렉션 이름으로 호출할 함수 (검색 결과 캐시 무효화 등, 저장소 컬렉션과 공유)
+        self._write_listeners: List[Callable[[str], None]] = []
+
+    def add_write_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        컬렉션에 청크가 추가/삭제될 때 호출할 함수를 등록합니다.
+
+        Args:
+            listener: 변경된 컬렉션 이름을 받는 함수
+        """
+        self._write_listeners.append(listener)
+
+    def _notify_write(self) -> None:
+        for listener in self._write_listeners:
+            listener(self.collection_name)
+
+    def _get_existing_metadatas(self, ids: List[str]) -> Dict[str, dict]:
+        """벡터 저장소에 이미 존재하는 ID와 메타데이터를 조회합니다. (임베딩/문서 본문은 읽지 않음)"""
+        if not ids:
+            return {}
+        stored = self.vectorstore.get(ids=ids, include=["metadatas"])
+        return {doc_id: metadata or {} for doc_id, metadata in zip(stored["ids"], stored["metadatas"])}
+
+    @staticmethod
+    def _stored_metadata(document: Document) -> dict:
+        """벡터 저장소에 저장할 청크 메타데이터를 만듭니다."""
+        return {
+            **{key: value for key, value in document.metadata.items() if isinstance(value, (str, int, float, bool))},
+            # 삭제 시 본문을 읽지 않고 통계를 갱신하기 위한 청크 크기
+            "bytes": len(document.page_content.encode('utf-8'))
+        }
+
+    def _upsert(self, documents: List[Document], vectors: List[List[float]]) -> None:
+        """미리 계산한 임베딩과 함께 청크를 벡터 저장소에 upsert 합니다."""
+        self.vectorstore._collection.upsert(
+            ids=[doc.id for doc in documents],
+            embeddings=vectors,
+            documents=[doc.page_content for doc in documents],
+            metadatas=[self._stored_metadata(doc) for doc in documents]
+        )
+        self._notify_write()
+
+    def _refresh_metadata(self, documents: List[Document], existing: Dict[str, dict]) -> int:
+        """
+        이미 저장된 청크 중 메타데이터(인덱싱 커밋, alias_paths 등)가 바뀐 청크의 메타데이터만 갱신합니다. (다시 임베딩하지 않음)
+
+        Returns:
+            int: 메타데이터를 갱신한 청크 수
+        """
+        ids, metadatas = [], []
+        for document in documents:
+            metadata = self._stored_metadata(document)
+            if existing[document.id] != metadata:
+                ids.append(document.id)
+                # update는 기존 메타데이터에 병합되므로 이번에 없는 항목(중복이 해소된 alias_paths 등)은 None으로 삭제
+                metadatas.append({
+                    **{key: None for key in existing[document.id] if key not in metadata},
+                    **metadata
+                })
+        if ids:
+            self.vectorstore._collection.update(ids=ids, metadatas=metadatas)
+            self._notify_write()
+        return len(ids)
+
+    def _flush_embedding_cache(self) -> None:
+        """임베딩 캐시에 모아 둔 최근 사용 시각을 기록합니다."""
+        if isinstance(self.embeddings, CachedEmbeddings):
+            self.embeddings.flush()
 
-    def add_documents(self, documents: List[Document]) -> None:
-        """문서들을 벡터 저장소에 추가합니다."""
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """
+        문서들을 내용 기반 ID로 벡터 저장소에 추가합니다.
+        이미 같은 ID가 저장되어 있는 청크는 임베딩하지 않고 건너뛰며, 새 청크만 upsert 합니다.
+
+        Args:
+            documents: 추가할 문서 목록
+
+        Returns:
+            List[str]: 입력 문서의 청크 ID 목록
+        """
+        ids = self._add_documents(documents)
+        self.lexical_index.flush()
+        self.stats.flush()
+        self._flush_embedding_cache()
+        return ids
+
+    def _add_documents(self, documents: List[Document]) -> List[str]:
+        """청크를 벡터 저장소와 BM25 색인 버퍼에 추가합니다. (BM25 세그먼트 저장은 호출자가 처리)"""
         try:
-            self.vectorstore.add_documents(documents)
-            logger.info(f"총 {len(documents)}개의 문서가 벡터 저장소에 추가되었습니다.")
+            ids = []
+            unique_documents = {}
+            for document in documents:
+                if not document.id:
+                    document.id = compute_chunk_id(document)
+                ids.append(document.id)
+                # 같은 배치 안의 중복 청크는 한 번만 저장
+                unique_documents.setdefault(document.id, document)
+
+            existing = self._get_existing_metadatas(list(unique_documents))
+            new_documents = [doc for doc_id, doc in unique_documents.items() if doc_id not in existing]
+            # 내용이 같아 건너뛰는 청크도 검색 결과에 표시되는 commit 등은 이번 인덱싱 기준으로 갱신
+            refreshed = self._refresh_metadata(
+                [doc for doc_id, doc in unique_documents.items() if doc_id in existing], existing
+            )
+
+            if new_documents:
+                # 배치가 끝나는 즉시 저장하여 진행 상황을 보존 (실패 후 재실행 시 저장된 청크는 건너뜀)
+                def _commit_batch(start: int, vectors: List[List[float]]) -> None:
+                    committed = new_documents[start:start + len(vectors)]
+                    self._upsert(committed, vectors)
+                    self.lexical_index.add_documents(committed)
+                    self.stats.record_documents(committed)
+
+                # 분할기가 기록한 청크별 토큰 수로 토큰 한도에 맞춰 배치 구성 (없으면 스케줄러가 계산)
+                token_counts = [doc.metadata.get("token_count") for doc in new_documents]
+                self.scheduler.embed(
+                    [doc.page_content for doc in new_documents],
+                    on_batch_done=_commit_batch,
+                    token_counts=token_counts if None not in token_counts else None
+                )
+            logger.info(
+                f"총 {len(new_documents)}개의 문서가 벡터 저장소에 추가되었습니다. "
+                f"(중복/기존 청크 {len(documents) - len(new_documents)}개 건너뜀, 메타데이터 갱신 {refreshed}개)"
+            )
+            return ids
         except Exception as e:
             logger.error(f"문서 추가 중 오류 발생: {str(e)}")
             raise
 
+    def add_documents_stream(
+        self,
+        documents: Iterable[Document],
+        batch_size: Optional[int] = None,
+        max_pending_batches: int = 2,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        metrics: Optional[IngestionMetrics] = None
+    ) -> int:
+        """
+        문서 스트림을 일정 크기의 배치로 나누어 벡터 저장소에 추가합니다.
+        생산자 스레드가 로드/분할을 계속 진행하는 동안 현재 배치를 임베딩하며,
+        대기 중인 배치 수를 제한하여 메모리 사용량을 일정하게 유지합니다.
+
+        Args:
+            documents: 추가할 문서 스트림 (예: MultiLanguageDocumentSplitter.iter_chunks())
+            batch_size: 한 번에 임베딩할 문서 수 (None인 경우 모든 동시 요청을 채울 수 있는 크기)
+            max_pending_batches: 임베딩을 기다리며 메모리에 쌓아둘 최대 배치 수
+            progress_callback: 배치가 저장될 때마다 지금까지 처리된 문서 수로 호출할 함수
+            metrics: 배치별 임베딩/저장 시간과 청크/토큰 수를 "embed" 단계로 기록할 지표 수집기
+
+        Returns:
+            int: 처리된 문서 수 (이미 저장되어 건너뛴 청크 포함)
+        """
+        if batch_size is None:
+            batch_size = self.scheduler.batch_size * self.scheduler.max_concurrency
+        batches: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        stop_event = threading.Event()
+        done = object()
+
+        def _put(item) -> bool:
+            while not stop_event.is_set():
+                try:
+                    batches.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _produce() -> None:
+            iterator = iter(documents)
+            try:
+                batch = []
+                for document in iterator:
+                    batch.append(document)
+                    if len(batch) >= batch_size:
+                        if not _put(batch):
+                            return
+                        batch = []
+                if batch:
+                    _put(batch)
+            except Exception as e:
+                _put(e)
+            finally:
+                # 소비자가 중단한 경우에도 생성기(프로세스 풀 등)를 정리
+                if hasattr(iterator, "close"):
+                    iterator.close()
+                _put(done)
+
+        producer = threading.Thread(target=_produce, name="document-producer", daemon=True)
+        producer.start()
+
+        total = 0
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if metrics is None:
+                    self._add_documents(item)
+                else:
+                    with metrics.stage("embed", batch_size=len(item)):
+                        self._add_documents(item)
+                    metrics.add(
+                        "embed",
+                        chunks=len(item),
+                        tokens=sum(doc.metadata.get("token_count", 0) for doc in item)
+                    )
+                total += len(item)
+                if progress_callback:
+                    progress_callback(total)
+        finally:
+            stop_event.set()
+            producer.join()
+            # 중단된 경우에도 이미 저장된 청크는 키워드 검색과 통계 파일에 반영
+            self.lexical_index.flush()
+            self.stats.flush()
+            self._flush_embedding_cache()
+
+        logger.info(f"스트리밍으로 총 {total}개의 문서를 처리했습니다.")
+        return total
+
+    def _delete_ids(self, ids: List[str], metadatas: List[Optional[dict]]) -> None:
+        """청크를 벡터 저장소와 BM25 색인에서 삭제하고 통계에 반영합니다."""
+        for start in range(0, len(ids), 5000):
+            self.vectorstore.delete(ids=ids[start:start + 5000])
+        self.lexical_index.delete(ids)
+        self.stats.record_chunks(metadatas, sign=-1)
+        if ids:
+            self._notify_write()
+
+    def delete_documents(self, repository_url: str, paths: Optional[List[str]] = None) -> None:
+        """
+        저장소의 청크를 벡터 저장소에서 삭제합니다.
+
+        Args:
+            repository_url: 삭제할 청크의 저장소 URL
+            paths: 삭제할 파일의 저장소 기준 상대 경로 목록. None인 경우 저장소 전체를 삭제합니다.
+        """
+        try:
+            if paths is None:
+                stored = self.vectorstore.get(where={"repository_url": repository_url}, include=["metadatas"])
+                self._delete_ids(stored["ids"], stored["metadatas"])
+                self.stats.flush()
+                logger.info(f"{repository_url} 저장소의 모든 청크를 삭제했습니다.")
+                return
+
+            # 필터 크기를 제한하기 위해 경로를 나누어 삭제
+            for start in range(0, len(paths), 500):
+                batch = paths[start:start + 500]
+                where = {
+                    "$and": [
+                        {"repository_url": repository_url},
+                        {"path": {"$in": batch}}
+                    ]
+                }
+                stored = self.vectorstore.get(where=where, include=["metadatas"])
+                self._delete_ids(stored["ids"], stored["metadatas"])
+            self.stats.flush()
+            logger.info(f"{repository_url} 저장소에서 {len(paths)}개 파일의 청크를 삭제했습니다.")
+        except Exception as e:
+            logger.error(f"문서 삭제 중 오류 발생: {str(e)}")
+            raise
+
+    def get_alias_paths(self, repository_url: str, paths: List[str]) -> Set[str]:
+        """
+        지정된 파일의 청크에 기록된 alias_paths(내용이 같아 파싱을 건너뛴 파일 경로)를 반환합니다.
+        원본 파일이 변경/삭제되면 별칭 파일을 다시 인덱싱해야 하므로 증분 인덱싱에서 사용합니다.
+
+        Args:
+            repository_url: 대상 저장소 URL
+            paths: 저장소 기준 상대 경로 목록
+
+        Returns:
+            Set[str]: 별칭 파일 경로 집합
+        """
+        alias_paths = set()
+        for start in range(0, len(paths), 500):
+            where = {"$and": [{"repository_url": repository_url}, {"path": {"$in": paths[start:start + 500]}}]}
+            stored = self.vectorstore.get(where=where, include=["metadatas"])
+            for metadata in stored["metadatas"]:
+                if metadata and metadata.get("alias_paths"):
+                    alias_paths.update(metadata["alias_paths"].split("\n"))
+        return alias_paths
+
+    def count_indexed_files(self, repository_url: str, paths: List[str]) -> Dict[str, int]:
+        """
+        지정된 파일 중 청크가 저장된 파일 수를 언어별로 반환합니다.
+        증분 인덱싱에서 변경/삭제되는 파일을 저장소 파일 통계에서 빼기 위해 사용합니다. (메타데이터만 조회)
+
+        Args:
+            repository_url: 대상 저장소 URL
+            paths: 저장소 기준 상대 경로 목록
+
+        Returns:
+            Dict[str, int]: 언어 → 청크가 저장된 파일 수
+        """
+        indexed_files = {}
+        for start in range(0, len(paths), 500):
+            where = {"$and": [{"repository_url": repository_url}, {"path": {"$in": paths[start:start + 500]}}]}
+            stored = self.vectorstore.get(where=where, include=["metadatas"])
+            for metadata in stored["metadatas"]:
+                if metadata and metadata.get("path"):
+                    indexed_files[metadata["path"]] = metadata.get("language") or "unknown"
+        counts: Dict[str, int] = {}
+        for language in indexed_files.values():
+            counts[language] = counts.get(language, 0) + 1
+        return counts
+
+    def delete_stale_documents(
+        self,
+        repository_url: str,
+        keep_ids: Set[str],
+        paths: Optional[List[str]] = None
+    ) -> int:
+        """
+        저장소(또는 지정된 파일)의 청크 중 이번 인덱싱에서 생성되지 않은 청크를 삭제합니다.
+
+        Args:
+            repository_url: 대상 저장소 URL
+            keep_ids: 유지할 청크 ID 집합 (이번 인덱싱에서 생성된 청크)
+            paths: 대상 파일의 저장소 기준 상대 경로 목록. None인 경우 저장소 전체가 대상입니다.
+
+        Returns:
+            int: 삭제된 청크 수
+        """
+        try:
+            if paths is None:
+                filters = [{"repository_url": repository_url}]
+            else:
+                filters = [
+                    {"$and": [{"repository_url": repository_url}, {"path": {"$in": paths[start:start + 500]}}]}
+                    for start in range(0, len(paths), 500)
+                ]
+
+            stale_ids, stale_metadatas = [], []
+            for where in filters:
+                stored = self.vectorstore.get(where=where, include=["metadatas"])
+                for chunk_id, metadata in zip(stored["ids"], stored["metadatas"]):
+                    if chunk_id not in keep_ids:
+                        stale_ids.append(chunk_id)
+                        stale_metadatas.append(metadata)
+
+            self._delete_ids(stale_ids, stale_metadatas)
+            self.stats.flush()
+            if stale_ids:
+                logger.info(f"{repository_url} 저장소에서 더 이상 사용되지 않는 청크 {len(stale_ids)}개를 삭제했습니다.")
+            return len(stale_ids)
+        except Exception as e:
+            logger.error(f"오래된 청크 삭제 중 오류 발생: {str(e)}")
+            raise
+
+    def repository_collection_name(self, repository_url: str) -> str:
+        """저장소 전용 컬렉션 이름을 반환합니다. (Chroma 컬렉션 이름 규칙에 맞는 해시 사용)"""
+        digest = hashlib.sha1(repository_url.encode('utf-8')).hexdigest()[:16]
+        return f"{self.collection_name}_{digest}"
+
+    def _with_collection(self, collection_name: str, repository_url: str) -> "DocumentEmbedder":
+        """임베딩/스케줄러/클라이언트를 공유하고 컬렉션과 BM25 색인만 다른 DocumentEmbedder를 생성합니다."""
+        view = copy.copy(self)
+        view.collection_name = collection_name
+        view.vectorstore = Chroma(
+            client=self.vectorstore._client,
+            embedding_function=self.embeddings,
+            collection_name=collection_name,
+            collection_metadata={"repository_url": repository_url}
+        )
+        view.lexical_index = BM25Index(os.path.join(self.persist_directory, "bm25", collection_name))
+        view.collection_per_repository = False
+        view._repository_embedders = {}
+        return view
+
+    def for_repository(self, repository_url: str, create: bool = True) -> Optional["DocumentEmbedder"]:
+        """
+        저장소의 청크를 저장/검색할 DocumentEmbedder를 반환합니다.
+        저장소별 컬렉션을 사용하지 않으면 자기 자신을 반환합니다.
+
+        Args:
+            repository_url: 저장소 URL
+            create: 저장소 컬렉션이 없을 때 새로 만들지 여부 (False이고 없으면 None 반환)
+
+        Returns:
+            DocumentEmbedder 또는 None
+        """
+        if not self.collection_per_repository:
+            return self
+        with self._repository_lock:
+            target = self._repository_embedders.get(repository_url)
+            if target is not None:
+                return target
+            collection_name = self.repository_collection_name(repository_url)
+            if not create:
+                existing = {collection.name for collection in self.vectorstore._client.list_collections()}
+                if collection_name not in existing:
+                    return None
+            target = self._with_collection(collection_name, repository_url)
+            self._repository_embedders[repository_url] = target
+            return target
+
+    def list_repository_embedders(self) -> List["DocumentEmbedder"]:
+        """저장된 모든 저장소 컬렉션의 DocumentEmbedder를 반환합니다. (저장소별 컬렉션 사용 시)"""
+        if not self.collection_per_repository:
+            return [self]
+        targets = []
+        for collection in self.vectorstore._client.list_collections():
+            repository_url = (collection.metadata or {}).get("repository_url")
+            if repository_url and collection.name == self.repository_collection_name(repository_url):
+                targets.append(self.for_repository(repository_url))
+        return targets
+
+    def drop_repository(self, repository_url: str) -> None:
+        """
+        저장소의 모든 청크를 삭제합니다.
+        저장소별 컬렉션을 사용하면 컬렉션과 BM25 색인 디렉토리를 통째로 삭제합니다. (청크 수와 무관)
+
+        Args:
+            repository_url: 삭제할 저장소 URL
+        """
+        if not self.collection_per_repository:
+            self.delete_documents(repository_url)
+            self.stats.remove_repository(repository_url)
+            return
+        target = self.for_repository(repository_url, create=False)
+        with self._repository_lock:
+            self._repository_embedders.pop(repository_url, None)
+        if target is None:
+            return
+        target.vectorstore.delete_collection()
+        target._notify_write()
+        self.stats.remove_repository(repository_url)
+        shutil.rmtree(target.lexical_index.index_directory, ignore_errors=True)
+        logger.info(f"{repository_url} 저장소 컬렉션({target.collection_name})을 삭제했습니다.")
+
     def get_vectorstore(self) -> Chroma: 
         """벡터 저장소 인스턴스를 반환합니다."""
         return self.vectorstore
 
+    def get_lexical_index(self) -> BM25Index:
+        """BM25 색인 인스턴스를 반환합니다."""
+        return self.lexical_index
+
     def get_collection_stats(self) -> dict:
-        """현재 컬렉션의 통계 정보를 반환합니다."""
+        """
+        현재 컬렉션의 통계 정보를 반환합니다.
+        청크 수는 컬렉션의 count 질의로, 저장소/언어별 통계는 증분 갱신한 카운터로 계산합니다.
+        """
         try:
-            collection = self.vectorstore.get()
+            targets = self.list_repository_embedders() if self.collection_per_repository else [self]
+            collections = {target.collection_name: target.vectorstore._collection.count() for target in targets}
+            stats = self.stats.snapshot()
             return {
-                "document_count": len(collection['ids']),
+                "document_count": sum(collections.values()),
                 "collection_name": self.collection_name,
-                "embedding_model": self.embedding_model
+                "collections": collections,
+                "embedding_backend": self.embedding_backend,
+                "embedding_model": self.embedding_model,
+                "embedding_tokens": stats["embedding_tokens"],
+                "embedding_cache": self.embeddings.get_stats() if isinstance(self.embeddings, CachedEmbeddings) else None,
+                "totals": stats["totals"],
+                "repositories": stats["repositories"]
             }
         except Exception as e:
             logger.error(f"컬렉션 통계 조회 중 오류 발생: {str(e)}")
@@ -1,12 +1,19 @@
 from git import Repo
 import shutil
 import os
-import subprocess
-import platform
+import stat
 import logging
+from typing import Iterable, List, Optional, Tuple
 
 
-def clone_repo_url(repo_url, local_path):
+def clone_repo_url(
+    repo_url,
+    local_path,
+    depth: Optional[int] = None,
+    single_branch: bool = False,
+    filter_blobs: bool = False,
+    sparse_extensions: Optional[Iterable[str]] = None
+):
     """
     [추가 설치가 필요한 라이브러리]
     - gitpython
@@ -14,10 +21,29 @@ def clone_repo_url(repo_url, local_path):
     [변수]
     - repo_url: clone 받을 repository url 입력
     - local_path: clone 받을 디렉토리
+    - depth: 지정하면 해당 깊이까지만 히스토리를 받음 (예: 1 → 최신 커밋만)
+    - single_branch: True면 기본 브랜치만 받음
+    - filter_blobs: True면 --filter=blob:none 으로 파일 내용은 checkout 시점에 필요한 것만 받음
+    - sparse_extensions: 지정하면 해당 확장자 파일(및 루트 README)만 checkout (sparse-checkout)
     """
 
+    clone_options = {}
+    if depth:
+        clone_options['depth'] = depth
+    if single_branch:
+        clone_options['single_branch'] = True
+    if filter_blobs:
+        clone_options['filter'] = 'blob:none'
+    if sparse_extensions:
+        # sparse-checkout 패턴을 설정한 뒤 checkout 하도록 작업 트리는 비워둔 채로 클론
+        clone_options['no_checkout'] = True
+
     try:
-        repo = Repo.clone_from(repo_url, local_path)
+        repo = Repo.clone_from(repo_url, local_path, **clone_options)
+        if sparse_extensions:
+            patterns = ['/README*'] + [f"*{ext}" for ext in sorted(set(sparse_extensions))]
+            repo.git.sparse_checkout('set', '--no-cone', *patterns)
+            repo.git.checkout(repo.active_branch.name)
         logging.info(f"리포지토리 클론 완료: {repo.working_dir}")
         # print(f"리포지토리 클론 완료: {repo_url}")
         return repo
@@ -26,32 +52,93 @@ def clone_repo_url(repo_url, local_path):
         # logging.error(e)
         raise RuntimeError(f"clone_repo_url :: 에러 발생: {str(e)}")
 
+def update_repo(local_path):
+    """
+    이미 클론된 리포지토리에서 새 커밋만 가져와 원격 브랜치 최신 상태로 맞춥니다.
+
+    [변수]
+    - local_path: 기존에 clone 받은 디렉토리
+    """
+
+    try:
+        repo = Repo(local_path)
+        origin = repo.remotes.origin
+        origin.fetch()
+        # 원격 기본 브랜치(origin/HEAD)가 없으면 현재 브랜치의 추적 브랜치 사용
+        try:
+            target = origin.refs.HEAD.reference
+        except Exception:
+            target = repo.active_branch.tracking_branch()
+        repo.git.reset('--hard', target.name)
+        logging.info(f"리포지토리 업데이트 완료: {repo.working_dir} ({repo.head.commit.hexsha[:12]})")
+        return repo
+    except Exception as e:
+        raise RuntimeError(f"update_repo :: 에러 발생: {str(e)}")
+
+def has_commit(repo, sha: str) -> bool:
+    """
+    리포지토리에 해당 커밋이 존재하는지 확인합니다.
+
+    [변수]
+    - repo: git.Repo 객체
+    - sha: 확인할 커밋 SHA
+    """
+
+    try:
+        repo.commit(sha)
+        return True
+    except Exception:
+        return False
+
+def get_changed_files(repo, old_sha: str, new_sha: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    두 커밋 사이에서 추가/변경된 파일과 삭제된 파일 목록을 반환합니다.
+
+    [변수]
+    - repo: git.Repo 객체
+    - old_sha: 이전에 인덱싱한 커밋 SHA
+    - new_sha: 비교할 커밋 SHA (None이면 HEAD)
+
+    [반환값]
+    - (추가/변경된 파일 경로 목록, 삭제된 파일 경로 목록), 경로는 저장소 루트 기준 상대 경로
+    """
+
+    old_commit = repo.commit(old_sha)
+    new_commit = repo.commit(new_sha) if new_sha else repo.head.commit
+
+    changed, removed = set(), set()
+    for diff in old_commit.diff(new_commit):
+        if diff.change_type == 'D':
+            removed.add(diff.a_path)
+        elif diff.change_type == 'R':
+            removed.add(diff.a_path)
+            changed.add(diff.b_path)
+        else:  # A, M, C, T
+            changed.add(diff.b_path)
+    return sorted(changed), sorted(removed)
+
+def _make_writable_and_retry(func, path, exc_info):
+    """
+    shutil.rmtree 삭제 실패 시 호출되는 핸들러입니다.
+    .git 내부의 pack/object 파일은 읽기 전용이라 Windows에서 삭제되지 않으므로 쓰기 권한을 주고 다시 시도합니다.
+    """
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
 def remove_repository(local_path):
     """
     [변수]
     - local_path: 삭제할 directory
-    [subprocess로 .git을 삭제하는 이유]
-    - shutil로 삭제하려고 하면, .git 폴더는 삭제가 안됨
+    [읽기 전용 파일 처리]
+    - .git 폴더의 읽기 전용 파일은 쓰기 권한을 준 뒤 다시 삭제 (별도 프로세스 실행 없음)
     """
 
     try:
-        # .git 삭제
-        git_path = os.path.join(local_path, '.git')
-        git_path = os.path.normpath(git_path)  # 경로 정규화
-        
-        if os.path.exists(git_path):
-            # 운영체제에 따라 적절한 명령어 사용
-            if platform.system() == 'Windows':
-                subprocess.run(f'rd /s /q "{git_path}"', shell=True, check=True)
-            else:  # macOS, Linux
-                subprocess.run(f'rm -rf "{git_path}"', shell=True, check=True)
-            # print(f"'.git' 디렉토리 삭제 완료")
-        else:
-            # print()
-            logging.error(f"'.git' 디렉토리를 찾을 수 없습니다")
-
-        # 디렉토리 삭제
-        shutil.rmtree(local_path)
+        if not os.path.exists(local_path):
+            logging.error(f"'{local_path}' 디렉토리를 찾을 수 없습니다")
+            return
+
+        shutil.rmtree(local_path, onerror=_make_writable_and_retry)
         # print(f"'{local_path}' 삭제 완료")
     except Exception as e:
         # print(f"에러 발생: {str(e)}")
@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Set
+import os
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 탐색에서 제외할 디렉토리 (VCS, 의존성, 벤더링, 빌드 산출물)
+DEFAULT_EXCLUDED_DIRS = {
+    '.git', '.hg', '.svn',
+    'node_modules', 'bower_components', 'vendor', 'third_party', 'third-party',
+    '.venv', 'venv', '__pycache__', '.mypy_cache', '.pytest_cache', '.tox', '.nox',
+    'build', 'dist', 'target', 'obj', '.gradle', '.idea', '.vscode',
+    '.next', '.nuxt', 'coverage', 'site-packages'
+}
+
+
+class RepositoryScanner:
+    def __init__(
+        self,
+        root_path: str,
+        language_extensions: Dict[str, List[str]],
+        excluded_dirs: Optional[Set[str]] = None,
+        language_priority: Optional[List[str]] = None
+    ):
+        """
+        저장소 디렉토리 트리를 한 번만 순회하여 파일 목록과 구조 정보를 수집하는 클래스를 초기화합니다.
+
+        Args:
+            root_path: 탐색할 루트 디렉토리 경로
+            language_extensions: 언어별 파일 확장자 매핑
+            excluded_dirs: 탐색에서 제외할 디렉토리 이름 집합 (None인 경우 기본값 사용)
+            language_priority: 여러 언어가 같은 확장자를 사용할 때(.h: CPP/C) 우선할 언어 순서.
+                목록에 없는 언어는 language_extensions 순서를 따름
+        """
+        self.root_path = root_path
+        self.excluded_dirs = DEFAULT_EXCLUDED_DIRS if excluded_dirs is None else set(excluded_dirs)
+        self.logger = logger
+
+        # 확장자 -> 언어 인덱스 (파일마다 정확히 하나의 언어로 분류하여 중복 파싱/임베딩 방지)
+        priority = [lang.upper() for lang in (language_priority or [])]
+        ordered_languages = sorted(
+            language_extensions,
+            key=lambda lang: priority.index(lang) if lang in priority else len(priority)
+        )
+        self.extension_index: Dict[str, str] = {}
+        for lang in ordered_languages:
+            for ext in language_extensions[lang]:
+                self.extension_index.setdefault(ext.lower(), lang)
+
+        self._scanned = False
+        self.files_by_language: Dict[str, List[str]] = {}
+        self.directories: List[str] = []
+        self.extensions: Set[str] = set()
+        self.file_count = 0
+
+    def scan(self) -> 'RepositoryScanner':
+        """
+        디렉토리 트리를 한 번 순회합니다. 이미 순회한 경우 저장된 결과를 그대로 사용합니다.
+
+        Returns:
+            RepositoryScanner: 순회 결과가 채워진 자기 자신
+        """
+        if self._scanned:
+            return self
+
+        stack = [self.root_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    sub_dirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.excluded_dirs:
+                                    sub_dirs.append(entry.path)
+                                continue
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+
+                        self.file_count += 1
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        if not ext:
+                            continue
+                        self.extensions.add(ext[1:])  # 점(.) 제거
+                        lang = self.extension_index.get(ext)
+                        if lang is not None:
+                            self.files_by_language.setdefault(lang, []).append(entry.path)
+            except OSError as e:
+                self.logger.warning(f"디렉토리 탐색 중 오류 발생 ({current}): {str(e)}")
+                continue
+
+            if current != self.root_path:
+                self.directories.append(os.path.relpath(current, self.root_path))
+            # 정렬된 순서로 방문하도록 역순으로 push
+            stack.extend(sorted(sub_dirs, reverse=True))
+
+        for files in self.files_by_language.values():
+            files.sort()
+
+        self._scanned = True
+        self.logger.info(
+            f"저장소 탐색 완료: 파일 {self.file_count}개, 디렉토리 {len(self.directories)}개"
+        )
+        return self
+
+    def get_files(self, language: str) -> List[str]:
+        """
+        지정된 언어에 해당하는 파일 경로 목록을 반환합니다.
+
+        Args:
+            language: 프로그래밍 언어
+
+        Returns:
+            List[str]: 파일 경로 목록
+        """
+        return self.scan().files_by_language.get(language, [])
+
+    def get_structure(self) -> Dict:
+        """
+        저장소 구조 요약 정보를 반환합니다.
+
+        Returns:
+            Dict: 디렉토리 목록, 확장자 목록, 파일 수
+        """
+        self.scan()
+        return {
+            "directories": list(self.directories),
+            "languages": sorted(self.extensions),
+            "file_count": self.file_count
+        }
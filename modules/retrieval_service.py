@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import threading
+import logging
+import sys
+
+from langchain_core.documents import Document
+
+from modules.hybrid_search import HybridSearcher
+from modules.index_state import IndexStateStore
+from modules.query_cache import QueryResultCache
+from modules.rag import DocumentEmbedder
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class RetrievalService:
+    def __init__(
+        self,
+        embedder: Optional[DocumentEmbedder] = None,
+        result_cache: Optional[QueryResultCache] = None
+    ):
+        """
+        임베딩/벡터 저장소/BM25 색인/검색기/인덱싱 상태를 한 곳에서 소유하는 검색 서비스를 초기화합니다.
+        서버의 도구와 저장소 인덱싱이 같은 객체를 공유하여 같은 저장 디렉토리에 클라이언트가 하나만 생기도록 합니다.
+
+        Args:
+            embedder: 사용할 DocumentEmbedder (None인 경우 환경 변수 설정으로 생성)
+            result_cache: 검색 결과 캐시 (None인 경우 QUERY_CACHE_* 환경 변수 설정으로 생성)
+        """
+        self.embedder = embedder or DocumentEmbedder()
+        self.vectorstore = self.embedder.get_vectorstore()
+        self.lexical_index = self.embedder.get_lexical_index()
+        # 같은 질의 반복 시 임베딩/검색을 생략하는 결과 캐시 (저장소 인덱싱 시 자동 무효화)
+        self.result_cache = result_cache or QueryResultCache(
+            max_entries=int(os.getenv("QUERY_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("QUERY_CACHE_TTL", "600")),
+            cache_path=os.getenv("QUERY_CACHE_PATH") or None
+        )
+        self.searcher = HybridSearcher(self.embedder, result_cache=self.result_cache)
+        # 저장소 URL별 마지막 인덱싱 커밋 (벡터 저장소 옆에 보관)
+        self.index_state = IndexStateStore(os.path.join(self.embedder.persist_directory, "index_state.json"))
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        lexical_weight: float = 0.5,
+        dense_weight: float = 0.5,
+        repository_url: Optional[str] = None,
+        languages: Optional[List[str]] = None
+    ) -> List[Tuple[Document, float]]:
+        """하이브리드 검색을 수행합니다. (HybridSearcher.search 참고)"""
+        return self.searcher.search(
+            query,
+            top_k=top_k,
+            lexical_weight=lexical_weight,
+            dense_weight=dense_weight,
+            repository_url=repository_url,
+            languages=languages
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """컬렉션 통계와 검색 결과 캐시 통계를 반환합니다."""
+        stats = self.embedder.get_collection_stats()
+        stats["query_cache"] = self.result_cache.get_stats()
+        return stats
+
+
+_service: Optional[RetrievalService] = None
+_service_lock = threading.Lock()
+
+
+def get_retrieval_service() -> RetrievalService:
+    """
+    프로세스에서 공유하는 RetrievalService를 반환합니다. 처음 호출될 때 한 번만 생성합니다.
+
+    Returns:
+        RetrievalService: 공유 검색 서비스
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RetrievalService()
+    return _service
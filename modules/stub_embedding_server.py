@@ -0,0 +1,180 @@
+"""
+OpenAI 호환 임베딩 API(/v1/embeddings)를 흉내 내는 로컬 스텁 서버입니다.
+임베딩 스케줄러의 배치/동시성/429 재시도 동작을 실제 API 비용 없이 확인할 때 사용합니다.
+
+사용 예:
+    python modules/stub_embedding_server.py --port 8089 --rate-limit-every 10
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python ...
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+import argparse
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def stub_embedding(value, dimensions: int) -> List[float]:
+    """입력 값(문자열 또는 토큰 ID 목록)으로 결정적인 단위 벡터를 생성합니다."""
+    seed = hashlib.sha256(json.dumps(value, ensure_ascii=False).encode('utf-8')).digest()
+    vector = []
+    counter = 0
+    while len(vector) < dimensions:
+        block = hashlib.sha256(seed + counter.to_bytes(4, 'little')).digest()
+        for (number,) in struct.iter_unpack('<i', block):
+            vector.append(number / 2 ** 31)
+        counter += 1
+    vector = vector[:dimensions]
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class StubEmbeddingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        dimensions: int = 1536,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.1
+    ):
+        """
+        스텁 임베딩 서버를 초기화합니다.
+
+        Args:
+            address: (호스트, 포트)
+            dimensions: 요청에 dimensions가 없을 때 사용할 기본 차원 수
+            latency: 요청마다 추가할 지연 시간 (초)
+            rate_limit_every: N번째 요청마다 429를 반환 (0이면 사용 안함)
+            retry_after: 429 응답의 Retry-After 값 (초)
+        """
+        super().__init__(address, _StubEmbeddingHandler)
+        self.dimensions = dimensions
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.embedded_inputs = 0
+        self._lock = threading.Lock()
+
+
+class _StubEmbeddingHandler(BaseHTTPRequestHandler):
+    server: StubEmbeddingServer
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/embeddings'):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+
+        with self.server._lock:
+            self.server.request_count += 1
+            rate_limited = (
+                self.server.rate_limit_every > 0
+                and self.server.request_count % self.server.rate_limit_every == 0
+            )
+            if rate_limited:
+                self.server.rate_limited_count += 1
+
+        if rate_limited:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_exceeded"}},
+                {"Retry-After": str(self.server.retry_after)}
+            )
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        inputs = request.get('input', [])
+        # 문자열 하나, 토큰 ID 목록 하나, 또는 그 목록을 모두 허용
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = request.get('dimensions') or self.server.dimensions
+
+        with self.server._lock:
+            self.server.embedded_inputs += len(inputs)
+
+        self._send_json(200, {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": stub_embedding(value, dimensions)}
+                for i, value in enumerate(inputs)
+            ],
+            "model": request.get('model', 'stub'),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+        })
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, **options) -> StubEmbeddingServer:
+    """
+    스텁 서버를 백그라운드 스레드에서 시작합니다.
+
+    Args:
+        host: 바인딩할 호스트
+        port: 바인딩할 포트 (0이면 임의의 빈 포트)
+        options: StubEmbeddingServer 옵션
+
+    Returns:
+        StubEmbeddingServer: 실행 중인 서버 (server.server_address로 포트 확인)
+    """
+    server = StubEmbeddingServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="stub-embedding-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 스텁 임베딩 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--dimensions', type=int, default=1536)
+    parser.add_argument('--latency', type=float, default=0.0, help="요청마다 추가할 지연 시간 (초)")
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="N번째 요청마다 429 반환")
+    parser.add_argument('--retry-after', type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = StubEmbeddingServer(
+        (args.host, args.port),
+        dimensions=args.dimensions,
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after
+    )
+    logger.info(f"스텁 임베딩 서버 시작: http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
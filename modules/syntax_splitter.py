@@ -0,0 +1,292 @@
+from langchain_core.documents import Document
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 로더 언어 키 → tree-sitter 문법 이름
+SYNTAX_LANGUAGES = {
+    'PYTHON': 'python',
+    'JS': 'javascript',
+    'TS': 'typescript',
+    'JAVA': 'java',
+    'CPP': 'cpp',
+    'C': 'c',
+    'GO': 'go',
+    'RUBY': 'ruby',
+    'RUST': 'rust',
+    'PHP': 'php',
+    'CSHARP': 'c_sharp',
+    'SCALA': 'scala',
+    'LUA': 'lua'
+}
+
+# 청크 하나로 만들 정의 노드 (함수/클래스/메서드 등)
+DEFINITION_TYPES = {
+    'python': {'function_definition', 'class_definition', 'decorated_definition'},
+    'javascript': {
+        'function_declaration', 'generator_function_declaration', 'class_declaration', 'method_definition'
+    },
+    'typescript': {
+        'function_declaration', 'generator_function_declaration', 'class_declaration',
+        'abstract_class_declaration', 'method_definition', 'interface_declaration', 'enum_declaration'
+    },
+    'java': {
+        'class_declaration', 'interface_declaration', 'enum_declaration', 'record_declaration',
+        'method_declaration', 'constructor_declaration'
+    },
+    'cpp': {'function_definition', 'class_specifier', 'struct_specifier', 'namespace_definition'},
+    'c': {'function_definition', 'struct_specifier'},
+    'go': {'function_declaration', 'method_declaration', 'type_declaration'},
+    'ruby': {'method', 'singleton_method', 'class', 'module'},
+    'rust': {'function_item', 'impl_item', 'trait_item', 'struct_item', 'enum_item', 'mod_item'},
+    'php': {
+        'function_definition', 'class_declaration', 'interface_declaration', 'trait_declaration',
+        'method_declaration'
+    },
+    'c_sharp': {
+        'namespace_declaration', 'class_declaration', 'interface_declaration', 'struct_declaration',
+        'enum_declaration', 'method_declaration', 'constructor_declaration'
+    },
+    'scala': {'class_definition', 'object_definition', 'trait_definition', 'function_definition'},
+    'lua': {'function_declaration'}
+}
+
+# 내부 정의를 각각 청크로 나눌 수 있는 컨테이너 노드 (클래스/네임스페이스 등)
+CONTAINER_TYPES = {
+    'class_definition', 'class_declaration', 'abstract_class_declaration',
+    'interface_declaration', 'enum_declaration', 'record_declaration', 'class_specifier', 'struct_specifier',
+    'namespace_definition', 'namespace_declaration', 'struct_declaration', 'trait_declaration',
+    'class', 'module', 'impl_item', 'trait_item', 'mod_item', 'object_definition', 'trait_definition'
+}
+
+# 이름을 찾을 때 확인할 식별자 노드
+_NAME_TYPES = {
+    'identifier', 'type_identifier', 'field_identifier', 'property_identifier', 'constant',
+    'name', 'namespace_identifier', 'qualified_identifier', 'scoped_identifier'
+}
+
+# (시작 바이트, 끝 바이트, 시작 줄, 끝 줄, 정규화된 이름, 노드 종류)
+Segment = Tuple[int, int, int, int, str, str]
+
+
+class SyntaxAwareSplitter:
+    def __init__(
+        self,
+        max_chunk_size: int = 1500,
+        min_chunk_size: Optional[int] = None,
+        length_function: Optional[Callable[[str], int]] = None
+    ):
+        """
+        tree-sitter 구문 트리로 함수/클래스/메서드 단위 청크를 만드는 분할기를 초기화합니다.
+        정의 사이의 import/전역 코드는 인접한 것끼리 묶고, 크기를 넘는 정의는 문장 경계에서 나눕니다.
+
+        Args:
+            max_chunk_size: 청크 하나의 최대 크기 (length_function 단위)
+            min_chunk_size: 이보다 작은 인접 구간은 최대 크기 안에서 하나의 청크로 합침
+                            (None인 경우 max_chunk_size의 1/4, 0이면 합치지 않음)
+            length_function: 텍스트 크기 측정 함수 (예: 토큰 수). None인 경우 UTF-8 바이트 수
+        """
+        self.max_chunk_size = max_chunk_size
+        self.length_function = length_function
+        self.min_chunk_size = max_chunk_size // 4 if min_chunk_size is None else min_chunk_size
+        self.logger = logger
+        # 언어별 tree-sitter 파서 캐시 (지원하지 않는 언어는 None)
+        self._parsers: Dict[str, Optional[object]] = {}
+
+    def supports(self, language: str) -> bool:
+        """해당 언어를 구문 단위로 분할할 수 있는지 반환합니다."""
+        return self._get_parser(language) is not None
+
+    def _get_parser(self, language: str):
+        if language not in self._parsers:
+            parser = None
+            grammar = SYNTAX_LANGUAGES.get(language)
+            if grammar:
+                try:
+                    from tree_sitter_languages import get_parser
+                    parser = get_parser(grammar)
+                except Exception as e:
+                    self.logger.warning(f"{language} 구문 파서를 불러올 수 없어 문자 단위 분할을 사용합니다: {str(e)}")
+            self._parsers[language] = parser
+        return self._parsers[language]
+
+    def split_document(self, language: str, document: Document) -> List[Document]:
+        """
+        파일 전체 문서를 구문 단위 청크로 분할합니다.
+        각 청크에는 qualified_name, node_type, start_line, end_line 메타데이터가 추가됩니다.
+
+        Args:
+            language: 로더 언어 키 (예: 'PYTHON')
+            document: 파일 전체 내용을 담은 문서
+
+        Returns:
+            List[Document]: 분할된 청크 목록 (지원하지 않는 언어는 빈 목록)
+        """
+        parser = self._get_parser(language)
+        if parser is None:
+            return []
+        source = document.page_content.encode('utf-8')
+        tree = parser.parse(source)
+        definitions = DEFINITION_TYPES[SYNTAX_LANGUAGES[language]]
+
+        if self.length_function is None:
+            size = lambda start, end: end - start
+        else:
+            size = lambda start, end: self.length_function(source[start:end].decode('utf-8', errors='ignore'))
+
+        segments = self._split_scope(tree.root_node, tree.root_node.named_children, "", definitions, size)
+        chunks = []
+        for start, end, start_line, end_line, qualified_name, node_type in self._merge_small(segments, size):
+            content = source[start:end].decode('utf-8', errors='ignore')
+            if not content.strip():
+                continue
+            metadata = dict(document.metadata)
+            metadata.update({
+                "qualified_name": qualified_name,
+                "node_type": node_type,
+                "start_line": start_line,
+                "end_line": end_line
+            })
+            chunks.append(Document(page_content=content, metadata=metadata))
+        return chunks
+
+    def _merge_small(self, segments: Iterator[Segment], size: Callable[[int, int], int]) -> Iterator[Segment]:
+        """
+        작은 구간(짧은 메서드, getter 등)이 각각 청크가 되지 않도록 인접한 작은 구간을 합칩니다.
+        합친 청크의 이름/종류는 ', '로 연결합니다.
+        """
+        group: List[Segment] = []
+
+        def _flush() -> Iterator[Segment]:
+            if group:
+                names = list(dict.fromkeys(segment[4] for segment in group))
+                node_types = list(dict.fromkeys(segment[5] for segment in group))
+                yield (group[0][0], group[-1][1], group[0][2], group[-1][3], ", ".join(names), ", ".join(node_types))
+                group.clear()
+
+        for segment in segments:
+            small = size(segment[0], segment[1]) < self.min_chunk_size
+            if group and (not small or size(group[0][0], segment[1]) > self.max_chunk_size):
+                yield from _flush()
+            if small:
+                group.append(segment)
+            else:
+                yield segment
+        yield from _flush()
+
+    def _split_scope(self, scope, members, prefix: str, definitions, size) -> Iterator[Segment]:
+        """
+        모듈 또는 컨테이너 본문의 멤버를 순서대로 청크 구간으로 변환합니다.
+        정의가 아닌 멤버는 크기 한도 안에서 인접한 것끼리 묶습니다.
+        """
+        scope_name = prefix or "<module>"
+        # 컨테이너의 선언부(클래스 시그니처, 독스트링 등)는 첫 번째 비정의 묶음에 포함
+        pending = None if scope.parent is None else [scope.start_byte, scope.start_point[0]]
+        pending_end = None
+
+        for member in members:
+            if member.type in definitions:
+                if pending is not None and pending_end is not None:
+                    yield (pending[0], pending_end[0], pending[1] + 1, pending_end[1] + 1, scope_name, scope.type)
+                elif pending is not None:
+                    # 본문 첫 멤버가 정의인 경우 선언부만 별도 청크로 보관
+                    yield (pending[0], member.start_byte, pending[1] + 1, member.start_point[0] + 1, scope_name, scope.type)
+                pending, pending_end = None, None
+                yield from self._split_definition(member, prefix, definitions, size)
+                continue
+
+            if pending is not None and pending_end is not None and size(pending[0], member.end_byte) > self.max_chunk_size:
+                yield (pending[0], pending_end[0], pending[1] + 1, pending_end[1] + 1, scope_name, scope.type)
+                pending = None
+            if pending is None:
+                pending = [member.start_byte, member.start_point[0]]
+            pending_end = (member.end_byte, member.end_point[0])
+
+        if pending is not None:
+            end = pending_end or (scope.end_byte, scope.end_point[0])
+            yield (pending[0], end[0], pending[1] + 1, end[1] + 1, scope_name, scope.type)
+
+    def _split_definition(self, node, prefix: str, definitions, size) -> Iterator[Segment]:
+        """정의 노드 하나를 청크 구간으로 변환합니다. 크면 내부 정의 또는 문장 경계로 나눕니다."""
+        node_type = _definition_node(node).type
+        name = _node_name(node) or node_type
+        qualified_name = f"{prefix}.{name}" if prefix else name
+        start_line, end_line = node.start_point[0] + 1, node.end_point[0] + 1
+
+        if size(node.start_byte, node.end_byte) <= self.max_chunk_size:
+            yield (node.start_byte, node.end_byte, start_line, end_line, qualified_name, node_type)
+            return
+
+        body = _body_of(node)
+        members = body.named_children if body is not None else node.named_children
+
+        if node_type in CONTAINER_TYPES and any(member.type in definitions for member in members):
+            yield from self._split_scope(node, members, qualified_name, definitions, size)
+            return
+
+        # 함수 본문을 문장 경계에서 나눔 (첫 조각에는 시그니처 포함)
+        start, start_row = node.start_byte, node.start_point[0]
+        end, end_row = start, start_row
+        for statement in members:
+            if end > start and size(start, statement.end_byte) > self.max_chunk_size:
+                yield (start, end, start_row + 1, end_row + 1, qualified_name, node_type)
+                start, start_row = statement.start_byte, statement.start_point[0]
+            end, end_row = statement.end_byte, statement.end_point[0]
+        yield (start, node.end_byte, start_row + 1, end_line, qualified_name, node_type)
+
+
+def _definition_node(node):
+    """데코레이터가 붙은 정의(decorated_definition)는 내부 정의 노드를 반환합니다."""
+    if node.type == 'decorated_definition':
+        inner = node.child_by_field_name('definition')
+        if inner is not None:
+            return inner
+    return node
+
+
+def _body_of(node):
+    """정의 노드의 본문 노드를 반환합니다."""
+    node = _definition_node(node)
+    body = node.child_by_field_name('body')
+    if body is None and node.type == 'type_declaration':
+        # Go: type Foo struct { ... }
+        for child in node.named_children:
+            body = child.child_by_field_name('type')
+            if body is not None:
+                break
+    return body
+
+
+def _node_name(node) -> Optional[str]:
+    """정의 노드의 이름을 찾습니다. C/C++ 함수는 선언자를 따라 내려가 식별자를 찾습니다."""
+    node = _definition_node(node)
+    name = node.child_by_field_name('name')
+    if name is not None:
+        return name.text.decode('utf-8', errors='ignore')
+
+    declarator = node.child_by_field_name('declarator')
+    while declarator is not None:
+        inner = declarator.child_by_field_name('declarator')
+        if inner is None:
+            return declarator.text.decode('utf-8', errors='ignore')
+        declarator = inner
+
+    # Go type_declaration(type_spec), Rust impl_item(type) 등
+    child = node.child_by_field_name('type')
+    if child is not None:
+        return child.text.decode('utf-8', errors='ignore')
+    for child in node.named_children:
+        if child.type in _NAME_TYPES:
+            return child.text.decode('utf-8', errors='ignore')
+        grandchild = child.child_by_field_name('name')
+        if grandchild is not None:
+            return grandchild.text.decode('utf-8', errors='ignore')
+    return None
@@ -0,0 +1,151 @@
+from typing import Iterable, List, Optional
+import os
+import re
+import threading
+import logging
+import sys
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stderr,  # ✅ MCP 안전하게 처리
+    format='%(asctime)s [%(levelname)s] %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# tiktoken 인코딩을 사용할 수 없을 때의 근사 토큰화
+# (BPE 사전 토큰화처럼 앞의 공백 하나는 뒤따르는 단어/숫자/기호 묶음에 붙임)
+_APPROX_PIECE_PATTERN = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\W\d_A-Za-z]+| ?_+| ?[^\w\s]+|\s+")
+
+
+def _approx_piece_tokens(piece: str) -> int:
+    """근사 토큰화 조각 하나의 토큰 수를 추정합니다. (BPE 기준 영문/코드 약 4자당 1토큰)"""
+    if piece.isspace():
+        return 1
+    piece = piece.lstrip(' ')
+    if piece[0].isascii() and (piece[0].isalnum() or piece[0] == '_'):
+        return (len(piece) + 3) // 4
+    if piece[0].isascii():
+        # 기호 묶음 ('()', '->', '});' 등)은 대부분 1~2자 단위로 토큰화됨
+        return (len(piece) + 1) // 2
+    # 한글 등 비ASCII 문자는 문자당 1토큰 내외
+    return len(piece)
+
+
+class TokenCounter:
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        """
+        임베딩 모델과 같은 BPE 인코딩으로 토큰 수를 계산하는 카운터를 초기화합니다.
+        tiktoken 인코딩을 불러올 수 없는 경우(미설치, 오프라인 환경에서 인코딩 파일 다운로드 실패 등)
+        정규식 기반 근사치로 대체합니다.
+
+        Args:
+            encoding_name: tiktoken 인코딩 이름 (OpenAI text-embedding-3 계열: cl100k_base)
+        """
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self.backend = "regex"
+        try:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(encoding_name)
+            self.backend = "tiktoken"
+        except Exception as e:
+            logger.warning(f"tiktoken {encoding_name} 인코딩을 불러올 수 없어 근사 토큰 수를 사용합니다: {str(e)}")
+
+    def count(self, text: str) -> int:
+        """
+        텍스트 하나의 토큰 수를 반환합니다.
+
+        Args:
+            text: 토큰 수를 계산할 텍스트
+
+        Returns:
+            int: 토큰 수
+        """
+        if self._encoding is not None:
+            return len(self._encoding.encode_ordinary(text))
+        return sum(_approx_piece_tokens(piece) for piece in _APPROX_PIECE_PATTERN.findall(text))
+
+    def count_batch(self, texts: Iterable[str]) -> List[int]:
+        """
+        여러 텍스트의 토큰 수를 한 번에 계산합니다. (tiktoken은 여러 스레드로 병렬 인코딩)
+
+        Args:
+            texts: 토큰 수를 계산할 텍스트 목록
+
+        Returns:
+            List[int]: 입력 순서와 같은 토큰 수 목록
+        """
+        texts = list(texts)
+        if self._encoding is not None and len(texts) > 1:
+            return [len(tokens) for tokens in self._encoding.encode_ordinary_batch(texts)]
+        return [self.count(text) for text in texts]
+
+    def _is_continuation(self, token: int) -> bool:
+        """토큰이 UTF-8 연속 바이트(0b10xxxxxx)로 시작하는지, 즉 앞 토큰과 같은 문자에 속하는지 확인합니다."""
+        return (self._encoding.decode_single_token_bytes(token)[0] & 0xC0) == 0x80
+
+    def split_text(self, text: str, max_tokens: int) -> List[str]:
+        """
+        텍스트를 토큰 수가 max_tokens 이하인 조각으로 나눕니다.
+        (구분자가 없는 minified 코드 등 문자 기준 분할 후에도 모델 한도를 넘는 청크에 사용)
+
+        Args:
+            text: 나눌 텍스트
+            max_tokens: 조각 하나의 최대 토큰 수
+
+        Returns:
+            List[str]: 나눈 텍스트 조각 목록
+        """
+        if self._encoding is not None:
+            tokens = self._encoding.encode_ordinary(text)
+            pieces, start = [], 0
+            while start < len(tokens):
+                end = min(start + max_tokens, len(tokens))
+                # 한글/이모지 등 여러 토큰에 걸친 UTF-8 문자 중간에서 자르지 않도록 문자 경계까지 앞으로 이동
+                while start + 1 < end < len(tokens) and self._is_continuation(tokens[end]):
+                    end -= 1
+                # 한도 안에 문자 경계가 없는 경우 (max_tokens가 문자 하나의 토큰 수보다 작음) 다음 경계까지 포함
+                while end < len(tokens) and self._is_continuation(tokens[end]):
+                    end += 1
+                pieces.append(self._encoding.decode_bytes(tokens[start:end]).decode('utf-8', errors='replace'))
+                start = end
+            return pieces
+
+        pieces, current, current_tokens = [], [], 0
+        for piece in _APPROX_PIECE_PATTERN.findall(text):
+            piece_tokens = _approx_piece_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                pieces.append("".join(current))
+                current, current_tokens = [], 0
+            # 한 조각이 한도보다 긴 경우 (매우 긴 식별자/문자열) 문자 단위로 자름
+            while piece_tokens > max_tokens:
+                size = max(1, len(piece) * max_tokens // piece_tokens)
+                pieces.append(piece[:size])
+                piece = piece[size:]
+                piece_tokens = _approx_piece_tokens(piece) if piece else 0
+            if piece:
+                current.append(piece)
+                current_tokens += piece_tokens
+        if current:
+            pieces.append("".join(current))
+        return pieces
+
+
+_counter: Optional[TokenCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    프로세스에서 공유하는 TokenCounter를 반환합니다. (TOKEN_ENCODING 환경 변수, 기본값: cl100k_base)
+
+    Returns:
+        TokenCounter: 공유 토큰 카운터
+    """
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = TokenCounter(os.getenv("TOKEN_ENCODING", "cl100k_base"))
+    return _counter
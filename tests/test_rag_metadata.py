@@ -0,0 +1,28 @@
+from langchain_core.documents import Document
+
+from modules.rag import DocumentEmbedder
+
+
+def _chunk(**metadata) -> Document:
+    return Document(
+        page_content="def a():\n    return 1\n",
+        metadata={"repository_url": "file:///repo", "path": "pkg/a.py", "language": "python", **metadata}
+    )
+
+
+def test_refresh_metadata_clears_removed_alias_paths(tmp_path):
+    embedder = DocumentEmbedder(persist_directory=str(tmp_path), embedding_backend="hashing")
+    refresh_metadata = embedder._refresh_metadata
+    refreshed = []
+    embedder._refresh_metadata = lambda *args: refreshed.append(refresh_metadata(*args)) or refreshed[-1]
+
+    [chunk_id] = embedder.add_documents([_chunk(commit="c1", alias_paths="pkg/copy_a.py")])
+    # 같은 내용의 청크를 다시 추가 (중복 파일이 더 이상 같지 않아 alias_paths가 없음)
+    embedder.add_documents([_chunk(commit="c2")])
+
+    stored = embedder.vectorstore.get(ids=[chunk_id], include=["metadatas"])["metadatas"][0]
+    assert stored["commit"] == "c2"
+    assert "alias_paths" not in stored
+    # 저장된 메타데이터가 새 메타데이터와 같아져 다음 인덱싱에서는 갱신하지 않음
+    embedder.add_documents([_chunk(commit="c2")])
+    assert refreshed == [0, 1, 0]
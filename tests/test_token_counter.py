@@ -0,0 +1,42 @@
+import tiktoken
+
+from modules.token_counter import TokenCounter
+
+
+def _byte_level_counter() -> TokenCounter:
+    """바이트 단위 토큰 인코딩을 사용하는 카운터 (다운로드 없이 한글 한 글자가 3개 토큰으로 나뉨)"""
+    counter = TokenCounter.__new__(TokenCounter)
+    counter.encoding_name = "byte_level"
+    counter.backend = "tiktoken"
+    counter._encoding = tiktoken.Encoding(
+        name="byte_level",
+        pat_str=r"[\s\S]",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={}
+    )
+    return counter
+
+
+def test_split_text_keeps_multibyte_characters_intact():
+    counter = _byte_level_counter()
+    text = "# 사용자 토큰을 갱신합니다 🚀\ndef refresh(): return '완료'\n" * 5
+
+    for max_tokens in (2, 4, 7, 16, 50):
+        pieces = counter.split_text(text, max_tokens)
+        assert "".join(pieces) == text
+        assert all("�" not in piece for piece in pieces)
+        # 문자 하나의 토큰 수(이모지 4)보다 작은 한도를 제외하면 한도를 넘지 않음
+        if max_tokens >= 4:
+            assert all(counter.count(piece) <= max_tokens for piece in pieces)
+
+
+def test_split_text_regex_fallback_roundtrip():
+    counter = TokenCounter.__new__(TokenCounter)
+    counter.encoding_name = "regex"
+    counter.backend = "regex"
+    counter._encoding = None
+    text = "한글 주석과 emoji 🚀 를 포함한 코드 " * 20
+
+    pieces = counter.split_text(text, 8)
+    assert "".join(pieces) == text
+    assert all(counter.count(piece) <= 8 for piece in pieces)